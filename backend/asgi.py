@@ -0,0 +1,310 @@
+"""ASGI entry point: the hot read endpoints run on asyncio, everything else on Flask.
+
+    cd backend && python serve.py --mode asgi
+
+/questions, /topics/<id>, /subjects/<class> and /performance/summary are
+served natively with an aiomysql pool, so a request waiting on MySQL holds
+no thread. Whatever they can answer from the in-process caches (quiz packs,
+student models, the catalog cache) needs no query at all. Filling a cold
+quiz pack or student model is a bulk read plus CPU work, so it runs the
+existing loader on a small thread pool instead of stalling the loop.
+
+Every other route goes to the Flask app from create_app() through a WSGI
+bridge with its own bounded thread pool. Needs the optional `aiomysql` and
+`a2wsgi` packages, and an ASGI server such as uvicorn.
+"""
+import asyncio
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from flask import current_app, g
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags
+from app import create_app, CORS_ORIGINS, CORS_EXPOSE_HEADERS
+from db.async_pool import AsyncDatabase
+from db.pool import PoolTimeout
+from instrumentation import RequestStats, record_request, record_serialization
+from routes.performance import summary_query, summary_page
+from routes.questions import QUIZ_SIZE
+from services.adaptive_quiz import QUIZ_MODES, adaptive_selector, student_models
+from services.identity import MISSING, USER_BY_ID_SQL, user_cache, user_from_row
+from services.question_store import join_json_rows
+from services.quiz_packs import quiz_packs
+from services.response_cache import catalog_cache, role_scope
+from services.tokens import revocation_list, verify_access_token
+from services.topic_catalog import LIST_TOPICS_SQL, RESOLVE_TOPIC_SQL
+
+
+class NativeRequest:
+    """The parts of an ASGI GET request the native handlers read"""
+
+    __slots__ = ('path', 'args', 'headers')
+
+    def __init__(self, scope):
+        self.path = scope['path']
+        self.args = MultiDict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+
+
+def json_response(payload, status=200, headers=None):
+    """(status, body, headers) with the body encoded exactly like jsonify()"""
+    started = time.perf_counter()
+    body = current_app.json.dumps(payload, separators=(',', ':'))
+    record_serialization(time.perf_counter() - started)
+    return status, body, headers or {}
+
+
+# ============================ Blocking Loaders ============================
+# Run on the loader thread pool inside an app context, with a connection
+# from the threaded pool that the context's teardown returns
+
+def fill_quiz_pack(filters):
+    cursor = current_app.mysql.connection.cursor()
+    try:
+        return quiz_packs.get(cursor, filters)
+    finally:
+        cursor.close()
+
+
+def load_student_model(student_id):
+    cursor = current_app.mysql.connection.cursor()
+    try:
+        return student_models.snapshot(cursor, student_id)
+    finally:
+        cursor.close()
+
+
+# ============================ ASGI App ============================
+
+class AsyncApp:
+    """Routes the hot GET endpoints to native coroutines and the rest to Flask"""
+
+    def __init__(self, flask_app, wsgi_app):
+        self.flask_app = flask_app
+        self.wsgi_app = wsgi_app
+        self.db = AsyncDatabase(flask_app.config)
+        # Lets /metrics report this pool next to the threaded one
+        flask_app.extensions['async_database'] = self.db
+        self.loaders = ThreadPoolExecutor(
+            max_workers=int(flask_app.config.get('ASGI_LOADER_THREADS', 4)), thread_name_prefix="asgi-loader"
+        )
+        # (pattern, endpoint label as in the Flask url_map, handler)
+        self.routes = [
+            (re.compile(r'^/questions$'), '/questions', self.get_questions),
+            (re.compile(r'^/topics/(\d+)$'), '/topics/<int:subject_id>', self.get_topics),
+            (re.compile(r'^/subjects/([^/]+)$'), '/subjects/<string:class_id>', self.get_subjects),
+            (re.compile(r'^/performance/summary$'), '/performance/summary', self.get_performance_summary)
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, endpoint, handler in self.routes:
+                match = pattern.match(scope['path'])
+                if match:
+                    return await self.serve_native(scope, send, endpoint, handler, match.groups())
+        return await self.wsgi_app(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.db.close()
+                self.loaders.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def serve_native(self, scope, send, endpoint, handler, params):
+        request = NativeRequest(scope)
+        with self.flask_app.app_context():
+            g._request_stats = stats = RequestStats()
+            try:
+                user = await self.resolve_user(request)
+                if user is None and request.headers.get('authorization'):
+                    status, body, headers = json_response({'error': 'Invalid or expired token'}, 401)
+                else:
+                    status, body, headers = await handler(request, user, *params)
+            except PoolTimeout:
+                status, body, headers = json_response({'error': 'Server busy, please try again'}, 503)
+            except Exception as e:
+                print(f"Error in {endpoint} (asgi):", e)
+                status, body, headers = json_response({"error": str(e)}, 500)
+
+            body = body.encode('utf-8') if isinstance(body, str) else body
+            headers = dict(headers)
+            if status != 304:
+                headers['Content-Type'] = 'application/json'
+            headers['Content-Length'] = str(len(body))
+            headers.update(self.cors_headers(request))
+            headers.update(record_request(endpoint, 'GET', status, stats, time.perf_counter() - stats.started, len(body)))
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), str(value).encode('latin-1')) for name, value in headers.items()]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    def cors_headers(request):
+        """What flask-cors adds to a simple GET from an allowed origin"""
+        origin = request.headers.get('origin')
+        if origin not in CORS_ORIGINS:
+            return {}
+        return {
+            'Access-Control-Allow-Origin': origin,
+            'Access-Control-Expose-Headers': ", ".join(CORS_EXPOSE_HEADERS),
+            'Vary': 'Origin'
+        }
+
+    async def in_thread(self, fn, *args):
+        """Run a blocking loader on the loader pool, inside its own app context"""
+        def call():
+            with self.flask_app.app_context():
+                return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.loaders, call)
+
+    async def cache_call(self, fn, *args):
+        """Catalog cache calls run inline for the in-process LRU, on a thread for Redis"""
+        if catalog_cache.in_process:
+            return fn(*args)
+        return await self.in_thread(fn, *args)
+
+    def cached(self, entry, request):
+        return catalog_cache.render(entry, parse_etags(request.headers.get('if-none-match')))
+
+    async def resolve_user(self, request):
+        """get_user_from_request() for the native routes, without blocking the loop"""
+        auth_header = request.headers.get('authorization', '')
+        if auth_header:
+            if not auth_header.startswith('Bearer '):
+                return None
+            if revocation_list.needs_sync():
+                await self.in_thread(revocation_list.sync)
+            return verify_access_token(auth_header[len('Bearer '):].strip())
+
+        if not current_app.config.get('ALLOW_LEGACY_USER_HEADER', False):
+            return None
+        try:
+            user_id = int(request.headers.get('x-user-id', ''))
+        except ValueError:
+            return None
+        user = user_cache.get(user_id)
+        if user is MISSING:
+            user = user_from_row(await self.db.fetchone(USER_BY_ID_SQL, (user_id,)))
+            user_cache.set(user_id, user)
+        return user
+
+    # ============================ Native Routes ============================
+    # Same behaviour and bodies as the Flask views of the same path
+
+    async def get_questions(self, request, user):
+        args = request.args
+        class_name = args.get('class')
+        subject_id = args.get('subject_id')
+        topic_id = args.get('topic_id')
+        mode = args.get('mode') or 'uniform'
+
+        if class_name and user and user['role'] == 'student' and user['student_class'] != class_name:
+            return json_response({"error": "Access denied: You can only access content for your enrolled class"}, 403)
+        if not class_name:
+            return json_response({"message": "Class is required"}, 400)
+        if mode not in QUIZ_MODES:
+            return json_response({"message": f"mode must be one of: {', '.join(QUIZ_MODES)}"}, 400)
+
+        filters = {
+            'class_name': class_name,
+            'type': args.get('type')
+        }
+        if subject_id:
+            subject_result = await self.db.fetchone("SELECT name FROM subjects WHERE id = %s", (subject_id,))
+            if subject_result:
+                filters['subject'] = subject_result[0]
+        if topic_id:
+            catalog_topic = await self.db.fetchone(RESOLVE_TOPIC_SQL, (topic_id,))
+            if catalog_topic is None or catalog_topic[0] != class_name:
+                return json_response({"questions": [], "seed": None, "mode": mode})
+            filters['subject'] = catalog_topic[1]
+            filters['topic'] = catalog_topic[2]
+
+        seed = args.get('seed', type=int)
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+
+        selector = None
+        if mode == 'adaptive':
+            if user and user['role'] == 'student':
+                snapshot = student_models.peek(user['id']) or await self.in_thread(load_student_model, user['id'])
+                selector = adaptive_selector(*snapshot)
+            else:
+                mode = 'uniform'
+        pack = quiz_packs.peek(filters) or await self.in_thread(fill_quiz_pack, filters)
+        documents = quiz_packs.draw_from(pack, QUIZ_SIZE, seed=seed, selector=selector)
+
+        return 200, f'{{"questions":{join_json_rows(documents)},"seed":{seed},"mode":"{mode}"}}', {}
+
+    async def get_topics(self, request, user, subject_id):
+        subject_id = int(subject_id)
+        cache_key = f"topics:{subject_id}:{role_scope(user)}"
+        entry = await self.cache_call(catalog_cache.lookup, cache_key)
+        if entry is not None:
+            if user and user['role'] == 'student' and user['student_class'] != entry['scope']:
+                return json_response({"error": "Access denied: You can only access topics for your enrolled class"}, 403)
+            return self.cached(entry, request)
+
+        subject_result = await self.db.fetchone("SELECT name, class_name FROM subjects WHERE id = %s", (subject_id,))
+        if not subject_result:
+            return json_response({"error": "Subject not found"}, 404)
+        subject_name, class_name = subject_result
+        if user and user['role'] == 'student' and user['student_class'] != class_name:
+            return json_response({"error": "Access denied: You can only access topics for your enrolled class"}, 403)
+
+        version = await self.cache_call(catalog_cache.version, class_name)
+        topics = await self.db.fetchall(LIST_TOPICS_SQL, (class_name, subject_name))
+        result = [
+            {"id": topic_id, "name": topic_name, "subject_id": subject_id, "question_count": question_count}
+            for topic_id, topic_name, question_count in topics
+        ]
+        entry = await self.cache_call(catalog_cache.store, cache_key, class_name, version, result)
+        return self.cached(entry, request)
+
+    async def get_subjects(self, request, user, class_id):
+        if user and user['role'] == 'student' and user['student_class'] != class_id:
+            return json_response({'error': 'Access denied: You can only access subjects for your enrolled class'}, 403)
+
+        cache_key = f"subjects:{class_id}:{role_scope(user)}"
+        entry = await self.cache_call(catalog_cache.lookup, cache_key)
+        if entry is not None:
+            return self.cached(entry, request)
+        version = await self.cache_call(catalog_cache.version, class_id)
+
+        results = await self.db.fetchall("SELECT id, name, class_name FROM subjects WHERE class_name = %s", (class_id,))
+        subjects = [{'id': row[0], 'name': row[1], 'class_name': row[2]} for row in results]
+        entry = await self.cache_call(catalog_cache.store, cache_key, class_id, version, subjects)
+        return self.cached(entry, request)
+
+    async def get_performance_summary(self, request, user):
+        query, params, page_size = summary_query(user, request.args)
+        performance = await self.db.fetchall(query, params)
+        result, next_cursor = summary_page(performance, page_size)
+        headers = {'X-Next-Cursor': str(next_cursor)} if next_cursor is not None else {}
+        return json_response(result, headers=headers)
+
+
+def create_asgi_app(config=None):
+    """Wrap create_app() for an ASGI server; opens no connections until the first request"""
+    try:
+        from a2wsgi import WSGIMiddleware
+    except ImportError:
+        raise RuntimeError("The ASGI server needs the 'a2wsgi' package")
+    flask_app = create_app(config)
+    wsgi_app = WSGIMiddleware(flask_app, workers=int(flask_app.config.get('ASGI_WSGI_THREADS', 16)))
+    return AsyncApp(flask_app, wsgi_app)
+
+
+app = create_asgi_app()
@@ -0,0 +1,58 @@
+"""Compare two benchmarks/load.py result files and flag regressions.
+
+    python benchmarks/compare.py benchmarks/results/base.json benchmarks/results/head.json --threshold 10
+
+Exits with status 1 when any scenario's p95 latency or throughput got worse
+by more than the threshold (in percent), so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def change(before, after):
+    if before in (None, 0) or after is None:
+        return None
+    return 100.0 * (after - before) / before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"📊 {baseline.get('commit')} -> {candidate.get('commit')}")
+    print(f"{'scenario':<22}{'p95 ms':>18}{'Δ':>9}{'req/s':>18}{'Δ':>9}{'queries':>14}")
+
+    regressions = []
+    for name, before in baseline['scenarios'].items():
+        after = candidate['scenarios'].get(name)
+        if after is None:
+            continue
+        p95_change = change(before['p95_ms'], after['p95_ms'])
+        rps_change = change(before['throughput_rps'], after['throughput_rps'])
+        print(f"{name:<22}{before['p95_ms']:>8.2f} → {after['p95_ms']:>7.2f}{p95_change or 0:>+8.1f}%"
+              f"{before['throughput_rps']:>8.1f} → {after['throughput_rps']:>7.1f}{rps_change or 0:>+8.1f}%"
+              f"{str(before.get('db_queries_per_request')):>7} → {str(after.get('db_queries_per_request'))}")
+        if p95_change is not None and p95_change > args.threshold:
+            regressions.append(f"{name}: p95 {p95_change:+.1f}%")
+        if rps_change is not None and rps_change < -args.threshold:
+            regressions.append(f"{name}: throughput {rps_change:+.1f}%")
+
+    if regressions:
+        print("❌ Regressions beyond {:.0f}%:".format(args.threshold))
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print("✅ No regressions beyond {:.0f}%".format(args.threshold))
+
+
+if __name__ == "__main__":
+    main()
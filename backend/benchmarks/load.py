@@ -0,0 +1,227 @@
+"""Drive the hot API endpoints at a fixed concurrency and report latency percentiles.
+
+Runs in-process against create_app() through the WSGI test client by
+default (no HTTP server needed), or against a running server with
+--base-url (start it with K12_DB_QUERY_COUNT_HEADER=1 to get query counts).
+Needs the data and manifest written by benchmarks/seed.py.
+
+    cd backend && python benchmarks/load.py --concurrency 16 --requests 2000 \\
+        --output benchmarks/results/$(git rev-parse --short HEAD).json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_MANIFEST = os.path.join(BACKEND_DIR, 'benchmarks', 'results', 'seed-manifest.json')
+SCENARIOS = ('login', 'questions', 'topics', 'subjects', 'questions_all', 'performance_summary')
+
+
+# ============================ Clients ============================
+
+class WSGIClient:
+    """Calls the app in-process; one Flask test client per thread"""
+
+    def __init__(self):
+        from app import create_app
+        self.app = create_app({'DB_QUERY_COUNT_HEADER': True})
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers or {})
+        return response.status_code, dict(response.headers), response.get_data()
+
+
+class HTTPClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=dict(headers or {}))
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+
+# ============================ Scenarios ============================
+
+def login(client, email, password):
+    status, _, body = client.request('POST', '/login', {'email': email, 'password': password})
+    if status != 200:
+        raise RuntimeError(f"Login as {email} failed with {status}: {body[:200]!r}")
+    return {'Authorization': 'Bearer ' + json.loads(body)['access_token']}
+
+
+def build_scenarios(client, manifest):
+    """Map scenario name -> callable(rng) returning (method, path, body, headers)"""
+    password = manifest['password']
+    students_by_class = {}
+    for student in manifest['student_emails']:
+        students_by_class.setdefault(student['class'], student['email'])
+
+    # Log in once per role/class up front; the timed runs reuse the tokens
+    student_auth = {c: login(client, email, password) for c, email in students_by_class.items()}
+    teacher_auth = login(client, manifest['teacher_emails'][0], password)
+    admin_auth = login(client, manifest['admin_email'], password)
+
+    topics = [t for t in manifest['topics'] if t['class'] in student_auth]
+    subjects = [s for s in manifest['subjects'] if s['class'] in student_auth]
+
+    def login_request(rng):
+        student = rng.choice(manifest['student_emails'])
+        return 'POST', '/login', {'email': student['email'], 'password': password}, {}
+
+    def questions_request(rng):
+        topic = rng.choice(topics)
+        return 'GET', f"/questions?class={topic['class']}&topic_id={topic['id']}", None, student_auth[topic['class']]
+
+    def topics_request(rng):
+        subject = rng.choice(subjects)
+        return 'GET', f"/topics/{subject['id']}", None, student_auth[subject['class']]
+
+    def subjects_request(rng):
+        student_class = rng.choice(sorted(student_auth))
+        return 'GET', f"/subjects/{student_class}", None, student_auth[student_class]
+
+    def questions_all_request(rng):
+        return 'GET', '/questions/all?limit=100', None, admin_auth
+
+    def performance_summary_request(rng):
+        return 'GET', f"/performance/summary?class={rng.choice(manifest['classes'])}", None, teacher_auth
+
+    return {
+        'login': login_request,
+        'questions': questions_request,
+        'topics': topics_request,
+        'subjects': subjects_request,
+        'questions_all': questions_all_request,
+        'performance_summary': performance_summary_request
+    }
+
+
+# ============================ Runner ============================
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(client, make_request, total, concurrency, warmup, seed):
+    rng = random.Random(seed)
+    requests = [make_request(rng) for _ in range(total + warmup)]
+    for method, path, body, headers in requests[:warmup]:
+        client.request(method, path, body, headers)
+
+    latencies = []
+    queries = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(spec):
+        nonlocal errors
+        method, path, body, headers = spec
+        started = time.perf_counter()
+        status, response_headers, _ = client.request(method, path, body, headers)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if status >= 400:
+                errors += 1
+            count = response_headers.get('X-DB-Queries')
+            if count is not None:
+                queries.append(int(count))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, requests[warmup:]))
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "throughput_rps": round(total / wall, 1),
+        "db_queries_per_request": round(statistics.mean(queries), 2) if queries else None
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests per scenario")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for request selection")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    client = HTTPClient(args.base_url) if args.base_url else WSGIClient()
+    scenarios = build_scenarios(client, manifest)
+    selected = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+
+    results = {}
+    print(f"🏁 {len(selected)} scenarios, {args.requests} requests each at concurrency {args.concurrency}")
+    print(f"{'scenario':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>10}{'queries':>9}{'errors':>8}")
+    for name in selected:
+        stats = run_scenario(client, scenarios[name], args.requests, args.concurrency, args.warmup, args.seed)
+        results[name] = stats
+        queries = stats['db_queries_per_request']
+        print(f"{name:<22}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+              f"{stats['throughput_rps']:>10.1f}{queries if queries is not None else '-':>9}{stats['errors']:>8}")
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "mode": "http" if args.base_url else "wsgi",
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "volumes": manifest.get('volumes'),
+            "scenarios": results
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Seed a MySQL database with benchmark data at configurable volumes.
+
+Everything lives under dedicated classes (B1, B2, ...) and bench-* emails,
+so --reset can remove a previous run without touching real data. Writes a
+manifest that benchmarks/load.py reads to build its requests.
+
+    cd backend && flask --app app init-db
+    python benchmarks/seed.py --users 100000 --questions 1000000 --reset
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app import create_app  # noqa: E402
+from db.migrate import run_migrations  # noqa: E402
+from services.passwords import password_hasher  # noqa: E402
+
+DEFAULT_MANIFEST = os.path.join(BACKEND_DIR, 'benchmarks', 'results', 'seed-manifest.json')
+BENCH_PASSWORD = 'benchmark'
+INSERT_BATCH_SIZE = 5000
+QUESTION_TYPES = ('mcq', 'true-false', 'short')
+OPTIONS_JSON = json.dumps([f"Option {o}" for o in range(4)])
+
+
+def insert_batches(connection, sql, rows):
+    cursor = connection.cursor()
+    try:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            cursor.executemany(sql, rows[start:start + INSERT_BATCH_SIZE])
+            connection.commit()
+    finally:
+        cursor.close()
+
+
+def reset(connection, classes):
+    placeholders = ", ".join(["%s"] * len(classes))
+    cursor = connection.cursor()
+    for table, column in (('questions', 'class_name'), ('topics', 'class_name'),
+                          ('subjects', 'class_name'), ('performance_summary', 'class_name')):
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", tuple(classes))
+    cursor.execute("DELETE FROM users WHERE email LIKE 'bench-%'")
+    connection.commit()
+    cursor.close()
+
+
+def seed(connection, args):
+    rng = random.Random(args.seed)
+    classes = [f"B{i + 1}" for i in range(args.classes)]
+    if args.reset:
+        print("🧹 Removing previous benchmark data...")
+        reset(connection, classes)
+
+    # ---- users: one hash for everyone, bcrypt per row would dominate seeding
+    started = time.perf_counter()
+    hashed = password_hasher.hash_password(BENCH_PASSWORD)
+    teachers = max(1, args.users // 50)
+    users = [('Bench Admin', 'bench-admin@example.com', hashed, 'admin', None)]
+    users += [(f'Bench Teacher {i}', f'bench-teacher-{i}@example.com', hashed, 'teacher', None) for i in range(teachers)]
+    users += [
+        (f'Bench Student {i}', f'bench-student-{i}@example.com', hashed, 'student', classes[i % len(classes)])
+        for i in range(args.users - teachers - 1)
+    ]
+    insert_batches(connection, """
+        INSERT INTO users (name, email, password, role, student_class) VALUES (%s, %s, %s, %s, %s)
+    """, users)
+    print(f"👥 {len(users)} users in {time.perf_counter() - started:.1f}s")
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT id, role, student_class FROM users WHERE email LIKE 'bench-%' ORDER BY id")
+    user_rows = cursor.fetchall()
+    cursor.close()
+    teacher_ids = [r[0] for r in user_rows if r[1] == 'teacher']
+    students = [(r[0], r[2]) for r in user_rows if r[1] == 'student']
+
+    # ---- subjects and the topic catalog
+    subjects = [(f"Subject {s}", c) for c in classes for s in range(args.subjects)]
+    insert_batches(connection, "INSERT INTO subjects (name, class_name) VALUES (%s, %s)", subjects)
+    topic_names = [f"Topic {t}" for t in range(args.topics)]
+
+    # ---- questions, spread evenly over every (class, subject, topic)
+    started = time.perf_counter()
+    counts = {}
+    batch = []
+    cursor = connection.cursor()
+    for i in range(args.questions):
+        subject, class_name = subjects[i % len(subjects)]
+        topic = topic_names[(i // len(subjects)) % len(topic_names)]
+        batch.append((
+            class_name, subject, topic, QUESTION_TYPES[i % len(QUESTION_TYPES)],
+            f"[bench] Question {i}?", OPTIONS_JSON,
+            f"Option {rng.randrange(4)}", rng.choice(teacher_ids)
+        ))
+        counts[(class_name, subject, topic)] = counts.get((class_name, subject, topic), 0) + 1
+        if len(batch) == INSERT_BATCH_SIZE:
+            cursor.executemany("""
+                INSERT INTO questions (class_name, subject, topic, type, question, options, correct_answer, uploaded_by)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, batch)
+            connection.commit()
+            batch = []
+    if batch:
+        cursor.executemany("""
+            INSERT INTO questions (class_name, subject, topic, type, question, options, correct_answer, uploaded_by)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, batch)
+        connection.commit()
+    cursor.close()
+    print(f"❓ {args.questions} questions in {time.perf_counter() - started:.1f}s")
+
+    insert_batches(connection, """
+        INSERT INTO topics (class_name, subject, name, question_count) VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE question_count = question_count + VALUES(question_count)
+    """, [(c, s, t, n) for (c, s, t), n in counts.items()])
+
+    # ---- pre-aggregated performance rows
+    started = time.perf_counter()
+    performance = []
+    for student_id, class_name in students:
+        for _ in range(args.performance_rows):
+            attempts = rng.randint(1, 40)
+            correct = rng.randint(0, attempts)
+            performance.append((
+                student_id, class_name, f"Subject {rng.randrange(args.subjects)}", rng.choice(topic_names),
+                attempts, correct, attempts * rng.randint(5, 60), round(100 * correct / attempts, 2)
+            ))
+    insert_batches(connection, """
+        INSERT IGNORE INTO performance_summary
+            (student_id, class_name, subject_name, topic_name, attempts, correct_count, time_spent_seconds, accuracy)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """, performance)
+    print(f"📈 {len(performance)} performance rows in {time.perf_counter() - started:.1f}s")
+
+    # ---- manifest for the load driver
+    cursor = connection.cursor()
+    placeholders = ", ".join(["%s"] * len(classes))
+    cursor.execute(f"SELECT id, class_name FROM subjects WHERE class_name IN ({placeholders})", tuple(classes))
+    subject_ids = [{"id": r[0], "class": r[1]} for r in cursor.fetchall()]
+    cursor.execute(f"SELECT id, class_name FROM topics WHERE class_name IN ({placeholders})", tuple(classes))
+    topic_ids = [{"id": r[0], "class": r[1]} for r in cursor.fetchall()]
+    cursor.close()
+
+    return {
+        "password": BENCH_PASSWORD,
+        "classes": classes,
+        "admin_email": "bench-admin@example.com",
+        "teacher_emails": [f"bench-teacher-{i}@example.com" for i in range(min(teachers, 100))],
+        "student_emails": [
+            {"email": f"bench-student-{i}@example.com", "class": classes[i % len(classes)]}
+            for i in range(min(len(students), 1000))
+        ],
+        "subjects": subject_ids,
+        "topics": topic_ids,
+        "volumes": {
+            "users": len(users),
+            "questions": args.questions,
+            "performance_rows": len(performance)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--subjects", type=int, default=5, help="subjects per class")
+    parser.add_argument("--topics", type=int, default=10, help="topics per subject")
+    parser.add_argument("--performance-rows", type=int, default=5, help="performance rows per student")
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for reproducible data")
+    parser.add_argument("--reset", action="store_true", help="delete earlier benchmark data first")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        with app.mysql.pool.connection() as connection:
+            run_migrations(connection)
+            manifest = seed(connection, args)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.manifest)), exist_ok=True)
+    with open(args.manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Seed manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Benchmark the threaded and ASGI serving modes against each other at high client counts.
+
+Starts each mode with serve.py on a local port and drives the hot read
+endpoints (/questions, /topics/<id>, /subjects/<class>, /performance/summary)
+from an asyncio client that keeps `--concurrency` keep-alive connections
+busy at once, so thousands of simulated quiz-takers need no threads here
+either. Needs the data and manifest written by benchmarks/seed.py.
+
+    cd backend && python benchmarks/serving.py --workers 4 --concurrency 100,1000,2000 \\
+        --output-dir benchmarks/results/serving
+
+Each (mode, concurrency) run is written in the load.py format, so
+`compare.py threaded-c1000.json asgi-c1000.json` shows the difference.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from load import DEFAULT_MANIFEST, HTTPClient, build_scenarios, git_commit, percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVE_SCRIPT = os.path.join(BACKEND_DIR, 'serve.py')
+MODES = ('threaded', 'asgi')
+HOT_SCENARIOS = ('questions', 'topics', 'subjects', 'performance_summary')
+
+
+# ============================ Async Client ============================
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; reconnects after an error or Connection: close"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(data)}"]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + data)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in response_headers:
+            await self.reader.readexactly(int(response_headers['content-length']))
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                # Chunk data plus its CRLF; the last, empty chunk is just the CRLF
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def drive(host, port, requests, concurrency, timeout):
+    """Send every request spec through `concurrency` connections at once and time each one"""
+    pending = iter(requests)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        connection = Connection(host, port)
+        for method, path, body, headers in pending:
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(connection.request(method, path, body, headers), timeout)
+                if status >= 400:
+                    errors += 1
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                errors += 1
+                connection.close()
+            latencies.append((time.perf_counter() - started) * 1000)
+        connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "db_queries_per_request": None
+    }
+
+
+# ============================ Servers ============================
+
+def start_server(mode, port, workers, threads, log):
+    process = subprocess.Popen(
+        [sys.executable, SERVE_SCRIPT, "--mode", mode, "--workers", str(workers),
+         "--threads", str(threads), "--bind", f"127.0.0.1:{port}"],
+        cwd=BACKEND_DIR, stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with status {process.returncode}; see {log.name}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics/db-pool", timeout=2).read()
+            return process
+        except urllib.error.HTTPError:
+            return process
+        except OSError:
+            time.sleep(0.5)
+    stop_server(process)
+    raise RuntimeError(f"{mode} server did not start within 60s; see {log.name}")
+
+
+def stop_server(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def raise_open_file_limit(wanted):
+    """Every simulated client holds a socket, on both ends when the server runs here too"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+# ============================ Runner ============================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated subset of " + ", ".join(MODES))
+    parser.add_argument("--scenarios", default=",".join(HOT_SCENARIOS),
+                        help="comma-separated subset of " + ", ".join(HOT_SCENARIOS))
+    parser.add_argument("--concurrency", default="100,1000", help="comma-separated client counts to test")
+    parser.add_argument("--requests", type=int, default=5000, help="timed requests per scenario and client count")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed requests per scenario")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="server worker processes, same for both modes")
+    parser.add_argument("--threads", type=int, default=16, help="threads per worker in threaded mode")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a request counts as failed")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for request selection")
+    parser.add_argument("--output-dir", help="write <mode>-c<concurrency>.json result files here")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    limit = raise_open_file_limit(2 * max(levels) + 256)
+    if limit < 2 * max(levels) + 256:
+        print(f"⚠️ Open file limit is {limit}; the highest client counts may see connection errors")
+
+    results = {}
+    for mode in modes:
+        log_path = os.path.join(BACKEND_DIR, 'benchmarks', 'results', f"serving-{mode}.log")
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, 'w') as log:
+            print(f"🚀 Starting {mode} server ({args.workers} workers)")
+            process = start_server(mode, args.port, args.workers, args.threads, log)
+            try:
+                scenarios = build_scenarios(HTTPClient(f"http://127.0.0.1:{args.port}"), manifest)
+                results[mode] = {}
+                for concurrency in levels:
+                    print(f"🏁 {mode}, {concurrency} clients")
+                    print(f"{'scenario':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>10}{'errors':>8}")
+                    stats_by_scenario = {}
+                    for name in selected:
+                        rng = random.Random(args.seed)
+                        warmup = [scenarios[name](rng) for _ in range(args.warmup)]
+                        timed = [scenarios[name](rng) for _ in range(args.requests)]
+                        asyncio.run(drive('127.0.0.1', args.port, warmup, 1, args.timeout))
+                        stats = asyncio.run(drive('127.0.0.1', args.port, timed, concurrency, args.timeout))
+                        stats_by_scenario[name] = stats
+                        print(f"{name:<22}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                              f"{stats['throughput_rps']:>10.1f}{stats['errors']:>8}")
+                    results[mode][concurrency] = stats_by_scenario
+            finally:
+                stop_server(process)
+
+    if len(results) == 2:
+        print("📊 ASGI vs threaded throughput")
+        for concurrency in levels:
+            for name in selected:
+                threaded = results['threaded'][concurrency][name]['throughput_rps']
+                asgi = results['asgi'][concurrency][name]['throughput_rps']
+                ratio = f"{asgi / threaded:.2f}x" if threaded else "-"
+                print(f"  {concurrency:>6} clients  {name:<22}{threaded:>10.1f} -> {asgi:>10.1f} req/s  ({ratio})")
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for mode, by_level in results.items():
+            for concurrency, stats_by_scenario in by_level.items():
+                path = os.path.join(args.output_dir, f"{mode}-c{concurrency}.json")
+                with open(path, 'w') as f:
+                    json.dump({
+                        "commit": git_commit(),
+                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                        "mode": mode,
+                        "workers": args.workers,
+                        "threads": args.threads if mode == 'threaded' else None,
+                        "concurrency": concurrency,
+                        "requests_per_scenario": args.requests,
+                        "volumes": manifest.get('volumes'),
+                        "scenarios": stats_by_scenario
+                    }, f, indent=2)
+        print(f"✅ Results written to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure worker cold start: a fresh interpreter importing the app and calling create_app().
+
+Each run happens in its own subprocess so module import cost is included,
+the same as a new gunicorn worker. The child also reports whether any
+database connection was opened, which should never happen before the
+first request.
+
+    cd backend && python benchmarks/startup.py --runs 20 [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app()
+created = time.perf_counter()
+pool = app.mysql._pool
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "total_ms": (created - started) * 1000,
+    "db_connections": pool.created if pool is not None else 0
+}))
+"""
+
+
+def run_once():
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, key):
+    values = [s[key] for s in samples]
+    return {
+        "median": round(statistics.median(values), 2),
+        "p95": round(percentile(values, 95), 2),
+        "min": round(min(values), 2),
+        "max": round(max(values), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    result = {
+        "runs": args.runs,
+        "import_ms": summarize(samples, "import_ms"),
+        "create_app_ms": summarize(samples, "create_app_ms"),
+        "total_ms": summarize(samples, "total_ms"),
+        "db_connections": max(s["db_connections"] for s in samples)
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"🚀 Cold start over {args.runs} runs")
+    for key in ("import_ms", "create_app_ms", "total_ms"):
+        stats = result[key]
+        print(f"   {key:<14} median {stats['median']:8.2f}  p95 {stats['p95']:8.2f}  max {stats['max']:8.2f}")
+    status = "✅" if result["db_connections"] == 0 else "❌"
+    print(f"{status} Database connections opened during startup: {result['db_connections']}")
+
+
+if __name__ == "__main__":
+    main()
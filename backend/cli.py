@@ -0,0 +1,123 @@
+from flask import current_app
+import click
+import csv
+import os
+import sys
+from db.migrate import create_database, run_migrations
+from services.performance_aggregator import rebuild_performance_summary
+from services.performance_rollups import rollup_cache
+from services.question_dedup import cluster_duplicates
+from services.question_export import EXPORT_FORMATS, export_questions
+from services.progress_store import get_progress_cache, import_progress_entries
+from services.roster import import_roster
+
+
+def register_commands(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(rebuild_performance_command)
+    app.cli.add_command(import_progress_command)
+    app.cli.add_command(export_questions_command)
+    app.cli.add_command(import_roster_command)
+    app.cli.add_command(find_duplicates_command)
+
+
+# ============================ Schema Bootstrap ============================
+
+@click.command('init-db')
+@click.option('--skip-create', is_flag=True, help='Assume the database exists; only run migrations.')
+def init_db_command(skip_create):
+    """Create the database and apply pending migrations (run once per deploy)."""
+    if not skip_create:
+        create_database(current_app.config)
+    # Migrations live in db/migrations and are recorded in schema_version,
+    # so re-running against an up-to-date database skips all DDL
+    with current_app.mysql.pool.connection() as connection:
+        run_migrations(connection)
+
+
+# ============================ Performance Aggregation ============================
+
+@click.command('rebuild-performance')
+def rebuild_performance_command():
+    """Regenerate performance_summary aggregates from quiz_responses."""
+    with current_app.mysql.pool.connection() as connection:
+        rows = rebuild_performance_summary(connection)
+    rollup_cache.invalidate()
+    print(f"✅ Rebuilt performance aggregates ({rows} student topics)")
+
+
+@click.command('import-progress')
+@click.option('--path', default=None, help='Progress file to import (defaults to PROGRESS_FILE).')
+@click.option('--keep-file', is_flag=True, help='Leave the file in place instead of renaming it.')
+def import_progress_command(path, keep_file):
+    """Import the legacy progress.txt into performance_summary."""
+    path = path or current_app.config['PROGRESS_FILE']
+    if not os.path.exists(path):
+        print(f"❌ {path} not found")
+        return
+    entries = get_progress_cache(path).all_entries()
+    with current_app.mysql.pool.connection() as connection:
+        rows = import_progress_entries(connection, entries)
+    rollup_cache.invalidate()
+    print(f"✅ Imported {rows} of {len(entries)} progress entries")
+    if not keep_file:
+        # Once renamed, /performance/all-progress reads from performance_summary
+        os.rename(path, path + '.imported')
+        print(f"📦 Moved {path} to {path}.imported")
+
+
+# ============================ Question Export ============================
+
+@click.command('export-questions')
+@click.option('--format', 'fmt', type=click.Choice(list(EXPORT_FORMATS)), default='csv', show_default=True)
+@click.option('--output', '-o', default='-', help='File to write; - for stdout.')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip the output.')
+@click.option('--class', 'class_name', default=None, help='Only this class.')
+@click.option('--subject', default=None, help='Only this subject.')
+@click.option('--topic', default=None, help='Only this topic.')
+@click.option('--uploaded-by', default=None, help='Only questions uploaded by this user id.')
+def export_questions_command(fmt, output, compress, class_name, subject, topic, uploaded_by):
+    """Stream the question bank to a file, e.g. for nightly backups."""
+    filters = {'class': class_name, 'subject': subject, 'topic': topic, 'uploaded_by': uploaded_by}
+    written = 0
+    with current_app.mysql.pool.connection() as connection:
+        target = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        try:
+            for piece in export_questions(connection, fmt, filters, compress=compress):
+                target.write(piece)
+                written += len(piece)
+        finally:
+            if target is not sys.stdout.buffer:
+                target.close()
+    if output != '-':
+        print(f"✅ Exported questions to {output} ({written} bytes)")
+
+
+# ============================ Roster Import ============================
+
+@click.command('import-roster')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--class', 'class_name', default=None, help='Class for rows that do not name one.')
+@click.option('--default-password', default=None, help='Initial password for rows without one.')
+def import_roster_command(path, class_name, default_password):
+    """Create accounts from a roster CSV (name, email, password, role, class)."""
+    with open(path, encoding='utf-8-sig', newline='') as f, current_app.mysql.pool.connection() as connection:
+        report = import_roster(connection, csv.DictReader(f), default_password=default_password, default_class=class_name)
+    print(f"✅ Roster imported: {report.inserted} created, {report.skipped} already registered, {report.failed} failed")
+    for error in report.errors[:20]:
+        print(f"   row {error['row']}: {error['error']}")
+
+
+# ============================ Near-Duplicate Detection ============================
+
+@click.command('find-duplicates')
+@click.option('--reindex', is_flag=True, help='Recompute every signature, not only missing ones.')
+@click.option('--threshold', type=float, default=None, help='Similarity cut-off (defaults to DUPLICATE_THRESHOLD).')
+def find_duplicates_command(reindex, threshold):
+    """Index the question bank and cluster near-duplicates for /questions/duplicates."""
+    threshold = threshold or current_app.config['DUPLICATE_THRESHOLD']
+    pool = current_app.mysql.pool
+    with pool.connection() as read_connection, pool.connection() as write_connection:
+        result = cluster_duplicates(read_connection, write_connection, threshold=threshold, reindex=reindex)
+    print(f"✅ Indexed {result['indexed']} questions; {result['clusters']} duplicate clusters "
+          f"covering {result['questions_in_clusters']} questions")
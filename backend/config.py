@@ -0,0 +1,96 @@
+import os
+
+
+def load_config():
+    """Read settings from the environment at app creation time, not at import"""
+    env = os.environ
+    return {
+        # ============================ MySQL ============================
+        'MYSQL_HOST': env.get('MYSQL_HOST', 'localhost'),
+        'MYSQL_PORT': int(env.get('MYSQL_PORT', '3306')),
+        'MYSQL_USER': env.get('MYSQL_USER', 'root'),
+        'MYSQL_PASSWORD': env.get('MYSQL_PASSWORD', 'anshu906'),
+        'MYSQL_DB': env.get('MYSQL_DB', 'k12_reviser'),
+
+        # Connection pool shared by every blueprint (see db/pool.py)
+        'DB_POOL_SIZE': int(env.get('DB_POOL_SIZE', '10')),
+        'DB_POOL_MAX_OVERFLOW': int(env.get('DB_POOL_MAX_OVERFLOW', '10')),
+        'DB_POOL_TIMEOUT': float(env.get('DB_POOL_TIMEOUT', '10')),
+        'DB_POOL_RECYCLE': int(env.get('DB_POOL_RECYCLE', '1800')),
+        'DB_POOL_PRE_PING': env.get('DB_POOL_PRE_PING', '1') == '1',
+
+        # ============================ ASGI Serving ============================
+        # Used by asgi.py only (see serve.py): the async pool for the native
+        # routes, the threads bridging to Flask routes, and the threads
+        # filling cold quiz packs / student models. All per worker process.
+        'ASYNC_DB_POOL_SIZE': int(env.get('K12_ASYNC_DB_POOL_SIZE', '20')),
+        'ASGI_WSGI_THREADS': int(env.get('K12_ASGI_WSGI_THREADS', '16')),
+        'ASGI_LOADER_THREADS': int(env.get('K12_ASGI_LOADER_THREADS', '4')),
+
+        # ============================ Instrumentation ============================
+        # Report round trips per request in an X-DB-Queries header (used by benchmarks/)
+        'DB_QUERY_COUNT_HEADER': env.get('K12_DB_QUERY_COUNT_HEADER', '0') == '1',
+        # Server-Timing header with db / serialize / app durations on every response
+        'SERVER_TIMING': env.get('K12_SERVER_TIMING', '1') == '1',
+        'TIMING_ALLOW_ORIGIN': env.get('K12_TIMING_ALLOW_ORIGIN', 'http://localhost:5173'),
+        # Queries at least this slow are logged; 0 disables the slow-query log
+        'SLOW_QUERY_MS': float(env.get('K12_SLOW_QUERY_MS', '200')),
+        # Fraction of requests run under cProfile (0 = off), dumped to PROFILE_DIR
+        'PROFILE_SAMPLE_RATE': float(env.get('K12_PROFILE_SAMPLE_RATE', '0')),
+        'PROFILE_DIR': env.get('K12_PROFILE_DIR', 'profiles'),
+
+        # ============================ Auth ============================
+        # 'development' on a laptop; anything else is treated as a shared deployment
+        'ENV': env.get('K12_ENV', 'production'),
+        # Signs access/refresh tokens; every worker must share the same value
+        'SECRET_KEY': env.get('K12_SECRET_KEY', 'k12-dev-secret-change-me'),
+        # Temporary migration flag: trust a bare X-User-ID header from clients that send no
+        # Authorization header at all. Off by default; remove once no such clients remain
+        'ALLOW_LEGACY_USER_HEADER': env.get('K12_ALLOW_LEGACY_USER_HEADER', '0') == '1',
+
+        # ============================ Password Hashing ============================
+        # bcrypt work factor for new hashes; 12 is the flask-bcrypt default
+        'BCRYPT_LOG_ROUNDS': int(env.get('K12_BCRYPT_ROUNDS', '12')),
+        # Worker processes dedicated to hashing; 0 means one per core
+        'HASH_WORKERS': int(env.get('K12_HASH_WORKERS', '0')),
+        # Hash jobs allowed in flight (running + queued) before callers are turned away; 0 means 8 per worker
+        'HASH_MAX_PENDING': int(env.get('K12_HASH_MAX_PENDING', '0')),
+        # How long a request waits for a free slot before giving up
+        'HASH_QUEUE_TIMEOUT': float(env.get('K12_HASH_QUEUE_TIMEOUT', '5')),
+
+        # ============================ Catalog Cache ============================
+        # Empty: per-process LRU. redis://host:port/db: shared Redis (needs the redis package)
+        'RESPONSE_CACHE_URL': env.get('K12_RESPONSE_CACHE_URL', ''),
+        'RESPONSE_CACHE_SIZE': int(env.get('K12_RESPONSE_CACHE_SIZE', '2048')),
+        'RESPONSE_CACHE_TTL': int(env.get('K12_RESPONSE_CACHE_TTL', '300')),
+        # Seconds browsers may reuse catalog responses without revalidating; 0 always revalidates
+        'CATALOG_MAX_AGE': int(env.get('K12_CATALOG_MAX_AGE', '0')),
+
+        # ============================ Quiz Packs ============================
+        # Precomputed quiz payloads per (class, subject, topic, type), bounded by pack and question count
+        'QUIZ_PACK_MAX_PACKS': int(env.get('K12_QUIZ_PACK_MAX_PACKS', '512')),
+        'QUIZ_PACK_MAX_QUESTIONS': int(env.get('K12_QUIZ_PACK_MAX_QUESTIONS', '200000')),
+        # Largest single pack; broader filters (e.g. class only) keep a random sample of this many
+        'QUIZ_PACK_MAX_PACK_QUESTIONS': int(env.get('K12_QUIZ_PACK_MAX_PACK_QUESTIONS', '5000')),
+        # Seconds before a pack is rebuilt, so writes from other workers show up
+        'QUIZ_PACK_TTL': int(env.get('K12_QUIZ_PACK_TTL', '300')),
+
+        # ============================ Adaptive Quizzes ============================
+        # Per-student answer histories kept in memory for ?mode=adaptive quizzes
+        'ADAPTIVE_MAX_STUDENTS': int(env.get('K12_ADAPTIVE_MAX_STUDENTS', '5000')),
+        # Seconds before a history is reloaded, so answers stored by other workers show up
+        'ADAPTIVE_TTL': int(env.get('K12_ADAPTIVE_TTL', '600')),
+
+        # ============================ Near-Duplicates ============================
+        # Estimated text similarity (0-1) at which an upload is rejected as a duplicate
+        'DUPLICATE_THRESHOLD': float(env.get('K12_DUPLICATE_THRESHOLD', '0.8')),
+
+        # ============================ Roster Import ============================
+        # Rows POST /users/import accepts; every new account is a bcrypt hash, so larger
+        # rosters go through `flask import-roster`, which has no worker timeout
+        'ROSTER_HTTP_MAX_ROWS': int(env.get('K12_ROSTER_HTTP_MAX_ROWS', '500')),
+
+        # ============================ Legacy Data ============================
+        # Legacy student progress export, served from cache until imported (see import-progress)
+        'PROGRESS_FILE': env.get('K12_PROGRESS_FILE', 'progress.txt'),
+    }
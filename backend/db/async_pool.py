@@ -0,0 +1,110 @@
+import asyncio
+import time
+from db.pool import PoolTimeout
+from instrumentation import record_query
+
+
+class AsyncDatabase:
+    """asyncio counterpart of Database, for the native routes in asgi.py.
+
+    Needs the optional `aiomysql` package. Each worker process gets its own
+    pool, created on first use inside the running event loop, holding up to
+    ASYNC_DB_POOL_SIZE connections. Waiting longer than DB_POOL_TIMEOUT for
+    one raises PoolTimeout, the same as the threaded pool.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.timeout = float(config.get('DB_POOL_TIMEOUT', 10))
+        self._pool = None
+        self._pool_lock = None
+
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    async def pool(self):
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    try:
+                        import aiomysql
+                    except ImportError:
+                        raise RuntimeError("The ASGI server needs the 'aiomysql' package")
+                    config = self.config
+                    self._pool = await aiomysql.create_pool(
+                        host=config.get('MYSQL_HOST', 'localhost'),
+                        port=int(config.get('MYSQL_PORT', 3306)),
+                        user=config.get('MYSQL_USER', 'root'),
+                        password=config.get('MYSQL_PASSWORD', ''),
+                        db=config.get('MYSQL_DB'),
+                        charset=config.get('MYSQL_CHARSET', 'utf8mb4'),
+                        connect_timeout=int(config.get('MYSQL_CONNECT_TIMEOUT', 10)),
+                        minsize=int(config.get('ASYNC_DB_POOL_MIN_SIZE', 1)),
+                        maxsize=int(config.get('ASYNC_DB_POOL_SIZE', 20)),
+                        pool_recycle=int(config.get('DB_POOL_RECYCLE', 1800)),
+                        # Reads only: no transaction is ever left open on a pooled connection
+                        autocommit=True
+                    )
+        return self._pool
+
+    async def _acquire(self):
+        pool = await self.pool()
+        started = time.monotonic()
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolTimeout(f"No database connection available after {self.timeout}s")
+        self.checkouts += 1
+        if time.monotonic() - started > 0.001:
+            self.waits += 1
+        return pool, conn
+
+    async def execute(self, query, params=(), fetch='all'):
+        """Run one statement on a pooled connection and return fetchall()/fetchone()"""
+        pool, conn = await self._acquire()
+        broken = False
+        try:
+            cursor = await conn.cursor()
+            try:
+                started = time.perf_counter()
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall() if fetch == 'all' else await cursor.fetchone()
+                record_query(cursor.mogrify(query, params), time.perf_counter() - started, max(cursor.rowcount, 0))
+                return rows
+            finally:
+                await cursor.close()
+        except Exception:
+            # Don't hand a connection in an unknown state to the next request
+            broken = True
+            raise
+        finally:
+            if broken:
+                conn.close()
+            pool.release(conn)
+
+    async def fetchall(self, query, params=()):
+        return await self.execute(query, params, 'all')
+
+    async def fetchone(self, query, params=()):
+        return await self.execute(query, params, 'one')
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    def stats(self):
+        pool = self._pool
+        return {
+            "size": int(self.config.get('ASYNC_DB_POOL_SIZE', 20)),
+            "open": pool.size if pool is not None else 0,
+            "idle": pool.freesize if pool is not None else 0,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "timeouts": self.timeouts
+        }
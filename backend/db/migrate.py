@@ -0,0 +1,178 @@
+import os
+import re
+import MySQLdb
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+MIGRATION_FILE_RE = re.compile(r'^(\d+)_([\w-]+)\.sql$')
+
+# "-- @if-column table.column" before a statement runs it only while that
+# column exists, for data moves whose source column a later statement drops
+GUARD_RE = re.compile(r'^--\s*@if-column\s+(\w+)\.(\w+)\s*$')
+
+# MySQL error codes meaning "this change is already in place", so re-running
+# a migration against a database that was set up by hand is harmless
+ALREADY_APPLIED_ERRORS = {
+    1050,  # Table already exists
+    1060,  # Duplicate column name
+    1061,  # Duplicate key name
+    1091,  # Can't DROP; index or column doesn't exist (already dropped)
+    1826,  # Duplicate foreign key constraint name
+}
+
+
+# ============================ Migration Files ============================
+
+def list_migrations():
+    """Return (version, name, path) for every migration file, oldest first"""
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return sorted(migrations)
+
+
+def parse_statements(sql):
+    """Split a SQL script on semicolons that are not inside quotes or comments.
+
+    Returns (guard, statement) pairs, where guard is the (table, column) of an
+    @if-column comment inside the statement, or None.
+    """
+    statements = []
+    current = []
+    guard = None
+    quote = None
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if quote:
+            current.append(char)
+            if char == '\\':
+                current.append(sql[i + 1:i + 2])
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in ("'", '"', '`'):
+            quote = char
+            current.append(char)
+        elif sql.startswith('--', i):
+            end = sql.find('\n', i)
+            match = GUARD_RE.match(sql[i:len(sql) if end == -1 else end].strip())
+            if match:
+                guard = (match.group(1), match.group(2))
+            i = len(sql) if end == -1 else end
+            continue
+        elif char == ';':
+            statements.append((guard, ''.join(current).strip()))
+            current = []
+            guard = None
+        else:
+            current.append(char)
+        i += 1
+
+    statements.append((guard, ''.join(current).strip()))
+    return [(g, s) for g, s in statements if s]
+
+
+def split_statements(sql):
+    """Split a SQL script on semicolons that are not inside quotes or comments"""
+    return [statement for _, statement in parse_statements(sql)]
+
+
+# ============================ Schema Version ============================
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_version")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def apply_migration(connection, version, name, path):
+    with open(path, 'r', encoding='utf-8') as file:
+        statements = parse_statements(file.read())
+
+    cursor = connection.cursor()
+    try:
+        for guard, statement in statements:
+            if guard and not column_exists(cursor, *guard):
+                print(f"   ↪ skipped, {guard[0]}.{guard[1]} is already gone")
+                continue
+            try:
+                cursor.execute(statement)
+            except Exception as e:
+                if e.args and e.args[0] in ALREADY_APPLIED_ERRORS:
+                    print(f"   ↪ skipped, already present: {e.args[1] if len(e.args) > 1 else e}")
+                    continue
+                raise
+        cursor.execute("INSERT INTO schema_version (version, name) VALUES (%s, %s)", (version, name))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def run_migrations(connection):
+    """Apply every migration newer than the recorded schema version.
+
+    Returns the number of migrations applied; when the database is already
+    current only the schema_version table is read.
+    """
+    cursor = connection.cursor()
+    ensure_version_table(cursor)
+    applied = get_applied_versions(cursor)
+    cursor.close()
+
+    pending = [m for m in list_migrations() if m[0] not in applied]
+    if not pending:
+        print(f"✅ Database schema is up to date (version {max(applied) if applied else 0})")
+        return 0
+
+    for version, name, path in pending:
+        print(f"📋 Applying migration {version:03d}_{name}...")
+        apply_migration(connection, version, name, path)
+
+    print(f"✅ Applied {len(pending)} migration(s), schema is now at version {pending[-1][0]}")
+    return len(pending)
+
+
+def create_database(config):
+    """Create the configured database if it doesn't exist yet (run before migrating)"""
+    db_name = config['MYSQL_DB']
+    try:
+        # Connect to MySQL without specifying database
+        connection = MySQLdb.connect(
+            host=config['MYSQL_HOST'],
+            port=int(config['MYSQL_PORT']),
+            user=config['MYSQL_USER'],
+            passwd=config['MYSQL_PASSWORD']
+        )
+        cursor = connection.cursor()
+
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{db_name}` CHARACTER SET utf8mb4")
+        print(f"✅ Database '{db_name}' created or already exists")
+
+        cursor.close()
+        connection.close()
+    except Exception as e:
+        print(f"❌ Error creating database: {e}")
+        print("Please make sure MySQL server is running and credentials are correct")
+        raise e
@@ -0,0 +1,19 @@
+-- ========================== QUESTIONS INDEXES ==========================
+
+-- Quiz draws and topic lists filter on class, subject, topic and type
+CREATE INDEX idx_questions_filters ON questions (class_name, subject, topic, type);
+
+-- Teacher dashboard lists a teacher's own uploads, newest first
+CREATE INDEX idx_questions_uploaded_by ON questions (uploaded_by, created_at);
+
+-- Admin listing pages through the bank ordered by creation time
+CREATE INDEX idx_questions_created_at ON questions (created_at, id);
+
+-- ========================== SUBJECTS INDEXES ==========================
+
+-- Covers SELECT id, name, class_name FROM subjects WHERE class_name = ?
+CREATE INDEX idx_subjects_class_name ON subjects (class_name, name);
+
+-- ========================== PERFORMANCE SUMMARY INDEXES ==========================
+
+CREATE INDEX idx_performance_student ON performance_summary (student_id, subject_name, topic_name);
@@ -0,0 +1,8 @@
+-- ========================== REVOKED TOKENS ==========================
+-- Token ids revoked before their natural expiry (logout, refresh rotation).
+-- Workers cache this list in memory and reload it periodically.
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti CHAR(32) PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    INDEX idx_revoked_tokens_expires_at (expires_at)
+);
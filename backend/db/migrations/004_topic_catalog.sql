@@ -0,0 +1,19 @@
+-- ========================== TOPIC CATALOG ==========================
+-- One row per (class, subject, topic) with a stable id and a maintained
+-- question count, so topic lists never aggregate over questions.
+CREATE TABLE IF NOT EXISTS topics (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    class_name VARCHAR(20) NOT NULL,
+    subject VARCHAR(100) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    question_count INT NOT NULL DEFAULT 0,
+    UNIQUE KEY uq_topics_class_subject_name (class_name, subject, name)
+);
+
+-- Backfill from the questions already in the bank
+INSERT INTO topics (class_name, subject, name, question_count)
+SELECT class_name, subject, topic, COUNT(*)
+FROM questions
+WHERE class_name IS NOT NULL AND subject IS NOT NULL AND topic IS NOT NULL
+GROUP BY class_name, subject, topic
+ON DUPLICATE KEY UPDATE question_count = VALUES(question_count);
@@ -0,0 +1,15 @@
+-- ========================== QUIZ RESPONSES ==========================
+-- Append-only log of every answer a student submits. Rows arrive in batches
+-- from the background response writer; score is 1/0 against the question's
+-- correct answer at the time of writing.
+CREATE TABLE IF NOT EXISTS quiz_responses (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    student_id INT NOT NULL,
+    question_id INT NOT NULL,
+    topic_id INT,
+    answer TEXT,
+    score DECIMAL(4,3),
+    time_spent INT,
+    answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_quiz_responses_student_topic (student_id, topic_id, answered_at)
+);
@@ -0,0 +1,28 @@
+-- ========================== PERFORMANCE AGGREGATES ==========================
+-- performance_summary becomes a running aggregate per (student, subject, topic),
+-- folded forward from quiz_responses by the response writer.
+ALTER TABLE performance_summary
+    ADD COLUMN class_name VARCHAR(20) NULL AFTER student_id,
+    ADD COLUMN attempts INT NOT NULL DEFAULT 0,
+    ADD COLUMN correct_count DECIMAL(12,3) NOT NULL DEFAULT 0,
+    ADD COLUMN time_spent_seconds INT NOT NULL DEFAULT 0,
+    ADD COLUMN last_attempt_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP;
+
+-- Carry over numeric values from the old VARCHAR column
+UPDATE performance_summary
+SET time_spent_seconds = CAST(time_spent AS UNSIGNED)
+WHERE time_spent REGEXP '^[0-9]+$';
+
+-- Keep only the newest row per (student, subject, topic) so the key below can be unique
+DELETE p1 FROM performance_summary p1
+JOIN performance_summary p2
+  ON p1.student_id = p2.student_id
+ AND p1.subject_name = p2.subject_name
+ AND p1.topic_name = p2.topic_name
+ AND p1.id < p2.id;
+
+ALTER TABLE performance_summary
+    ADD UNIQUE KEY uq_performance_student_topic (student_id, subject_name, topic_name);
+
+-- Superseded by the unique key above
+DROP INDEX idx_performance_student ON performance_summary;
@@ -0,0 +1,10 @@
+-- ========================== PERFORMANCE ROLLUP INDEXES ==========================
+
+-- Rows written before aggregation existed have no class; take it from the student
+UPDATE performance_summary ps
+JOIN users u ON u.id = ps.student_id
+SET ps.class_name = u.student_class
+WHERE ps.class_name IS NULL;
+
+-- Teacher views filter and roll up by class, then subject and topic
+CREATE INDEX idx_performance_class_scope ON performance_summary (class_name, subject_name, topic_name, accuracy);
@@ -0,0 +1,63 @@
+-- ========================== UNIFIED QUESTION OPTIONS ==========================
+-- Options used to live in option1..option4 (V2 and bulk uploads), as a JSON
+-- string in options (routes/upload.py) or as comma-separated text in options
+-- (V1 uploads), and answers in either correct_answer or correct_ans.
+-- Every question now keeps one JSON array of options and one correct_answer.
+-- The @if-column guards let a re-run pick up after the last step that
+-- completed: the data moves only run while the old columns are still there.
+-- @if-column questions.option1
+ALTER TABLE questions ADD COLUMN choices JSON NULL AFTER question;
+
+-- option1..option4, skipping empty slots (removed from the end so positions stay valid)
+-- @if-column questions.option1
+UPDATE questions
+SET choices = JSON_ARRAY(NULLIF(TRIM(option1), ''), NULLIF(TRIM(option2), ''), NULLIF(TRIM(option3), ''), NULLIF(TRIM(option4), ''))
+WHERE COALESCE(NULLIF(TRIM(option1), ''), NULLIF(TRIM(option2), ''), NULLIF(TRIM(option3), ''), NULLIF(TRIM(option4), '')) IS NOT NULL;
+
+-- @if-column questions.option1
+UPDATE questions SET choices = JSON_REMOVE(choices, '$[3]') WHERE JSON_TYPE(JSON_EXTRACT(choices, '$[3]')) = 'NULL';
+-- @if-column questions.option1
+UPDATE questions SET choices = JSON_REMOVE(choices, '$[2]') WHERE JSON_TYPE(JSON_EXTRACT(choices, '$[2]')) = 'NULL';
+-- @if-column questions.option1
+UPDATE questions SET choices = JSON_REMOVE(choices, '$[1]') WHERE JSON_TYPE(JSON_EXTRACT(choices, '$[1]')) = 'NULL';
+-- @if-column questions.option1
+UPDATE questions SET choices = JSON_REMOVE(choices, '$[0]') WHERE JSON_TYPE(JSON_EXTRACT(choices, '$[0]')) = 'NULL';
+
+-- JSON array strings in options
+-- @if-column questions.option1
+UPDATE questions
+SET choices = CAST(options AS JSON)
+WHERE choices IS NULL
+  AND JSON_TYPE(IF(JSON_VALID(options), options, NULL)) = 'ARRAY';
+
+-- Comma-separated text in options
+-- @if-column questions.option1
+UPDATE questions
+SET choices = CAST(CONCAT('["', REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(TRIM(options), '\\', '\\\\'), '"', '\\"'), ' ,', ','), ', ', ','), ',', '","'), '"]') AS JSON)
+WHERE choices IS NULL
+  AND TRIM(options) <> ''
+  AND JSON_VALID(CONCAT('["', REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(TRIM(options), '\\', '\\\\'), '"', '\\"'), ' ,', ','), ', ', ','), ',', '","'), '"]'));
+
+-- True/false questions stored without choices, then everything else
+-- @if-column questions.option1
+UPDATE questions SET choices = JSON_ARRAY('True', 'False') WHERE choices IS NULL AND type = 'true-false';
+-- @if-column questions.option1
+UPDATE questions SET choices = JSON_ARRAY() WHERE choices IS NULL;
+
+-- One answer column
+-- @if-column questions.option1
+UPDATE questions
+SET correct_answer = correct_ans
+WHERE (correct_answer IS NULL OR correct_answer = '') AND correct_ans IS NOT NULL;
+
+-- @if-column questions.option1
+ALTER TABLE questions
+    DROP COLUMN option1,
+    DROP COLUMN option2,
+    DROP COLUMN option3,
+    DROP COLUMN option4,
+    DROP COLUMN options,
+    DROP COLUMN correct_ans;
+
+-- @if-column questions.choices
+ALTER TABLE questions CHANGE COLUMN choices options JSON NOT NULL;
@@ -0,0 +1,4 @@
+-- ========================== USERS DIRECTORY INDEXES ==========================
+
+-- /users pages by id within a role and class (e.g. all students of one class)
+CREATE INDEX idx_users_role_class ON users (role, student_class, id);
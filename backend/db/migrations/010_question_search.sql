@@ -0,0 +1,7 @@
+-- ========================== QUESTION SEARCH INDEX ==========================
+
+-- Full-text index for /questions/search. The ngram parser splits text into
+-- 2-character tokens (ngram_token_size), so Hindi and other scripts are
+-- indexed as well as English. InnoDB keeps it up to date on every write.
+-- Building it on an existing bank rebuilds the table once.
+ALTER TABLE questions ADD FULLTEXT INDEX ft_questions_question (question) WITH PARSER ngram;
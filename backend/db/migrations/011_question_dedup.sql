@@ -0,0 +1,28 @@
+-- ========================== NEAR-DUPLICATE INDEX ==========================
+
+-- MinHash signature (64 x uint32) of each question's text
+CREATE TABLE IF NOT EXISTS question_signatures (
+    question_id INT PRIMARY KEY,
+    signature VARBINARY(256) NOT NULL,
+    FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+);
+
+-- LSH buckets: questions sharing a (band, bucket) are duplicate candidates.
+-- Uploads look their buckets up by primary key instead of scanning the bank.
+CREATE TABLE IF NOT EXISTS question_lsh_buckets (
+    band TINYINT UNSIGNED NOT NULL,
+    bucket BIGINT NOT NULL,
+    question_id INT NOT NULL,
+    PRIMARY KEY (band, bucket, question_id),
+    INDEX idx_lsh_buckets_question (question_id),
+    FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+);
+
+-- Output of `flask find-duplicates`: clusters named after their oldest question
+CREATE TABLE IF NOT EXISTS question_duplicates (
+    question_id INT PRIMARY KEY,
+    cluster_id INT NOT NULL,
+    similarity DECIMAL(4,3) NOT NULL,
+    INDEX idx_question_duplicates_cluster (cluster_id),
+    FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+);
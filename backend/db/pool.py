@@ -0,0 +1,263 @@
+from flask import g
+from contextlib import contextmanager
+import queue
+import threading
+import time
+import MySQLdb
+import MySQLdb.cursors
+from instrumentation import record_query
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection became free within the pool timeout"""
+
+
+class PooledConnection:
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class InstrumentedCursorMixin:
+    """Times every server round trip and reports it to instrumentation.record_query"""
+
+    def _query(self, q):
+        started = time.perf_counter()
+        try:
+            return super()._query(q)
+        finally:
+            rows = self.rowcount if self.description is not None and self.rowcount > 0 else 0
+            record_query(q, time.perf_counter() - started, rows)
+
+
+class InstrumentedCursor(InstrumentedCursorMixin, MySQLdb.cursors.Cursor):
+    """Default cursor class for pooled connections"""
+
+
+class InstrumentedSSCursor(InstrumentedCursorMixin, MySQLdb.cursors.SSCursor):
+    """Server-side (streaming) cursor; rows are counted only when known up front"""
+
+
+# ============================ Connection Pool ============================
+
+class ConnectionPool:
+    """Thread-safe pool of MySQLdb connections.
+
+    Holds up to `size` idle connections and opens up to `max_overflow` extra
+    ones under load. Connections older than `recycle` seconds are replaced,
+    and connections idle longer than `ping_after` seconds are pinged before
+    being handed out (pre-ping), so a MySQL restart or wait_timeout never
+    surfaces as a failed request.
+    """
+
+    def __init__(self, connect_kwargs, size=10, max_overflow=10, timeout=10.0,
+                 recycle=1800, pre_ping=True, ping_after=10.0):
+        self.connect_kwargs = connect_kwargs
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.ping_after = ping_after
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.recycled = 0
+        self.ping_failures = 0
+
+    def _connect(self):
+        conn = PooledConnection(MySQLdb.connect(**self.connect_kwargs))
+        with self._lock:
+            self.created += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._open -= 1
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._open < self.size + self.max_overflow:
+                self._open += 1
+                return True
+            return False
+
+    def acquire(self):
+        started = time.monotonic()
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve_slot():
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s")
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self.checkouts += 1
+            if waited > 0.001:
+                self.waits += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+        return self._check_health(conn)
+
+    def _check_health(self, conn):
+        now = time.monotonic()
+        if self.recycle and now - conn.created_at > self.recycle:
+            with self._lock:
+                self.recycled += 1
+            return self._replace(conn)
+
+        if self.pre_ping and now - conn.last_used > self.ping_after:
+            try:
+                conn.raw.ping()
+            except Exception:
+                with self._lock:
+                    self.ping_failures += 1
+                return self._replace(conn)
+        return conn
+
+    def _replace(self, conn):
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+
+    def release(self, conn, broken=False):
+        if not broken:
+            try:
+                # End any open transaction so the next borrower gets a fresh snapshot
+                conn.raw.rollback()
+            except Exception:
+                broken = True
+
+        if broken or self._idle.qsize() >= self.size:
+            self._discard(conn)
+            return
+
+        conn.last_used = time.monotonic()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection outside of a request (CLI commands, background jobs)"""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn.raw
+        except MySQLdb.OperationalError:
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": self._idle.qsize(),
+                "in_use": self._open - self._idle.qsize(),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "recycled": self.recycled,
+                "ping_failures": self.ping_failures
+            }
+
+
+# ============================ Flask Integration ============================
+
+class Database:
+    """Flask extension handing each request one pooled connection.
+
+    Keeps the flask_mysqldb interface (`db.connection.cursor()`), so routes
+    and blueprints use `current_app.mysql.connection` as before. The pool
+    is created on first use, not at import or app setup.
+    """
+
+    def __init__(self, app=None):
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._config = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._config = app.config
+        app.extensions['database'] = self
+        app.teardown_appcontext(self.teardown)
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    config = self._config
+                    self._pool = ConnectionPool(
+                        {
+                            'host': config.get('MYSQL_HOST', 'localhost'),
+                            'port': int(config.get('MYSQL_PORT', 3306)),
+                            'user': config.get('MYSQL_USER', 'root'),
+                            'passwd': config.get('MYSQL_PASSWORD', ''),
+                            'db': config.get('MYSQL_DB'),
+                            'charset': config.get('MYSQL_CHARSET', 'utf8mb4'),
+                            'connect_timeout': int(config.get('MYSQL_CONNECT_TIMEOUT', 10)),
+                            'cursorclass': InstrumentedCursor
+                        },
+                        size=int(config.get('DB_POOL_SIZE', 10)),
+                        max_overflow=int(config.get('DB_POOL_MAX_OVERFLOW', 10)),
+                        timeout=float(config.get('DB_POOL_TIMEOUT', 10)),
+                        recycle=int(config.get('DB_POOL_RECYCLE', 1800)),
+                        pre_ping=bool(config.get('DB_POOL_PRE_PING', True)),
+                        ping_after=float(config.get('DB_POOL_PING_AFTER', 10))
+                    )
+        return self._pool
+
+    @property
+    def connection(self):
+        conn = g.get('_db_connection')
+        if conn is None:
+            conn = self.pool.acquire()
+            g._db_connection = conn
+        return conn.raw
+
+    def teardown(self, exception):
+        conn = g.pop('_db_connection', None)
+        if conn is not None:
+            self.pool.release(conn, broken=isinstance(exception, MySQLdb.OperationalError))
@@ -0,0 +1,274 @@
+from flask import g, request, current_app, has_app_context, has_request_context
+from flask.json.provider import DefaultJSONProvider
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+
+# Request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Distinct normalized statements tracked before the rest are lumped together
+MAX_TRACKED_STATEMENTS = 500
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST_RE = re.compile(r"(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement):
+    """SQL with literals replaced by ?, so the same query with different values aggregates together"""
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+    # Bulk INSERTs can be megabytes long; the head is enough to identify them
+    statement = statement[:4000]
+    statement = _STRING_LITERAL_RE.sub('?', statement)
+    statement = _NUMBER_RE.sub('?', statement)
+    statement = _IN_LIST_RE.sub('(...)', statement)
+    statement = _VALUES_LIST_RE.sub(r'\1, ...', statement)
+    return _WHITESPACE_RE.sub(' ', statement).strip()[:300]
+
+
+class RequestStats:
+    __slots__ = ('started', 'queries', 'query_time', 'rows', 'serialize_time')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.rows = 0
+        self.serialize_time = 0.0
+
+
+# ============================ Metrics Registry ============================
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+class MetricsRegistry:
+    """Minimal Prometheus-style counters and histograms, rendered in the text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._types = {}
+        self._counters = {}
+        self._histograms = {}
+
+    def describe(self, name, kind, help_text):
+        self._types[name] = kind
+        self._help[name] = help_text
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self, gauges=()):
+        """Text exposition of everything recorded, plus (name, help, value) gauges"""
+        lines = []
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: (list(v[0]), v[1], v[2]) for k, v in self._histograms.items()}
+
+        by_name = {}
+        for (name, labels), value in sorted(counters.items()):
+            by_name.setdefault(name, []).append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+            samples = by_name.setdefault(name, [])
+            for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                samples.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {bucket_count}")
+            samples.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+            samples.append(f"{name}_sum{_labels(labels)} {total}")
+            samples.append(f"{name}_count{_labels(labels)} {count}")
+
+        for name in sorted(by_name):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {self._types[name]}")
+            lines.extend(by_name[name])
+
+        for name, help_text, value in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+metrics.describe('k12_http_requests_total', 'counter', 'Requests handled, by endpoint, method and status.')
+metrics.describe('k12_http_request_duration_seconds', 'histogram', 'Wall time per request, by endpoint.')
+metrics.describe('k12_http_response_bytes_total', 'counter', 'Response body bytes sent (non-streamed), by endpoint.')
+metrics.describe('k12_http_serialization_seconds_total', 'counter', 'Time spent serializing JSON responses, by endpoint.')
+metrics.describe('k12_db_queries_total', 'counter', 'SQL round trips, by endpoint.')
+metrics.describe('k12_db_query_seconds_total', 'counter', 'Time spent in SQL round trips, by endpoint.')
+metrics.describe('k12_db_rows_fetched_total', 'counter', 'Rows returned by SELECTs, by endpoint.')
+metrics.describe('k12_db_statement_calls_total', 'counter', 'Executions per normalized statement.')
+metrics.describe('k12_db_statement_seconds_total', 'counter', 'Time per normalized statement.')
+metrics.describe('k12_db_slow_queries_total', 'counter', 'Queries slower than SLOW_QUERY_MS.')
+
+_tracked_statements = set()
+_tracked_lock = threading.Lock()
+
+
+# ============================ Query Recording ============================
+
+def record_query(statement, duration, rows):
+    """Called by the instrumented cursors after every round trip"""
+    stats = g.get('_request_stats') if has_app_context() else None
+    if stats is not None:
+        stats.queries += 1
+        stats.query_time += duration
+        stats.rows += rows
+
+    normalized = normalize_statement(statement)
+    with _tracked_lock:
+        if normalized not in _tracked_statements:
+            if len(_tracked_statements) >= MAX_TRACKED_STATEMENTS:
+                normalized = 'other'
+            else:
+                _tracked_statements.add(normalized)
+    metrics.inc('k12_db_statement_calls_total', statement=normalized)
+    metrics.inc('k12_db_statement_seconds_total', duration, statement=normalized)
+
+    threshold_ms = current_app.config.get('SLOW_QUERY_MS', 200) if has_app_context() else 200
+    if threshold_ms and duration * 1000 >= threshold_ms:
+        metrics.inc('k12_db_slow_queries_total')
+        endpoint = request.path if has_request_context() else 'background'
+        print(f"🐢 Slow query ({duration * 1000:.1f} ms, {rows} rows) on {endpoint}: {normalized}")
+
+
+def query_count():
+    """Round trips made so far in this request (or CLI/app context)"""
+    stats = g.get('_request_stats') if has_app_context() else None
+    return stats.queries if stats is not None else 0
+
+
+def record_serialization(duration):
+    """Book time spent encoding a response body to the current request"""
+    stats = g.get('_request_stats') if has_app_context() else None
+    if stats is not None:
+        stats.serialize_time += duration
+
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """jsonify() that books its serialization time to the current request"""
+
+    def response(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().response(*args, **kwargs)
+        record_serialization(time.perf_counter() - started)
+        return response
+
+
+# ============================ Sampling Profiler ============================
+
+_profile_hooks = []
+
+
+def register_profile_hook(hook):
+    """hook(endpoint, profile, elapsed) replaces the default .prof dump for sampled requests"""
+    _profile_hooks.append(hook)
+
+
+def _dump_profile(endpoint, profile, elapsed):
+    directory = current_app.config.get('PROFILE_DIR', 'profiles')
+    os.makedirs(directory, exist_ok=True)
+    name = re.sub(r'[^\w.-]+', '_', endpoint).strip('_') or 'root'
+    path = os.path.join(directory, f"{int(time.time() * 1000)}-{name}-{elapsed * 1000:.0f}ms.prof")
+    profile.dump_stats(path)
+    print(f"🔬 Profiled {endpoint} ({elapsed * 1000:.1f} ms) -> {path}")
+
+
+# ============================ Request Hooks ============================
+
+def start_request():
+    g._request_stats = RequestStats()
+    rate = current_app.config.get('PROFILE_SAMPLE_RATE', 0)
+    if rate and random.random() < rate:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            g._profiler = profile
+        except ValueError:
+            # Another profiler is already active on this thread
+            pass
+
+
+def finish_request(response):
+    stats = g.get('_request_stats')
+    if stats is None:
+        return response
+    elapsed = time.perf_counter() - stats.started
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+
+    profile = g.pop('_profiler', None)
+    if profile is not None:
+        profile.disable()
+        for hook in _profile_hooks or [_dump_profile]:
+            try:
+                hook(endpoint, profile, elapsed)
+            except Exception as e:
+                print(f"❌ Profile hook failed: {e}")
+
+    size = None if response.is_streamed else response.calculate_content_length()
+    response.headers.update(record_request(endpoint, request.method, response.status_code, stats, elapsed, size))
+    return response
+
+
+def record_request(endpoint, method, status, stats, elapsed, size):
+    """Book a finished request to the metrics; returns the timing headers to add to it.
+
+    Shared by the Flask hooks above and the native routes in asgi.py.
+    """
+    metrics.inc('k12_http_requests_total', endpoint=endpoint, method=method, status=status)
+    metrics.observe('k12_http_request_duration_seconds', elapsed, endpoint=endpoint)
+    metrics.inc('k12_db_queries_total', stats.queries, endpoint=endpoint)
+    metrics.inc('k12_db_query_seconds_total', stats.query_time, endpoint=endpoint)
+    metrics.inc('k12_db_rows_fetched_total', stats.rows, endpoint=endpoint)
+    metrics.inc('k12_http_serialization_seconds_total', stats.serialize_time, endpoint=endpoint)
+    if size:
+        metrics.inc('k12_http_response_bytes_total', size, endpoint=endpoint)
+
+    headers = {}
+    config = current_app.config
+    if config.get('SERVER_TIMING', True):
+        headers['Server-Timing'] = ", ".join([
+            f'db;dur={stats.query_time * 1000:.2f};desc="{stats.queries} queries, {stats.rows} rows"',
+            f'serialize;dur={stats.serialize_time * 1000:.2f}',
+            f'app;dur={elapsed * 1000:.2f}' + (f';desc="{size} bytes"' if size is not None else '')
+        ])
+        # Lets the frontend's devtools show the breakdown for cross-origin calls
+        headers['Timing-Allow-Origin'] = config.get('TIMING_ALLOW_ORIGIN', 'http://localhost:5173')
+    if config.get('DB_QUERY_COUNT_HEADER'):
+        headers['X-DB-Queries'] = str(stats.queries)
+    return headers
+
+
+def init_instrumentation(app):
+    """Register the request hooks; call before other before_request hooks so every request is timed"""
+    app.json = InstrumentedJSONProvider(app)
+    app.before_request(start_request)
+    app.after_request(finish_request)
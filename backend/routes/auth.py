@@ -0,0 +1,134 @@
+from flask import Blueprint, request, jsonify, current_app
+from services.identity import invalidate_user, load_user
+from services.tokens import issue_tokens, verify_refresh_token, revoke_token
+from services.passwords import password_hasher, HashingBusy
+
+auth_bp = Blueprint('auth', __name__)
+
+# ============================ Signup Endpoint ============================
+
+@auth_bp.route('/signup', methods=['POST'])
+def signup():
+    data = request.get_json()
+
+    name = data.get('name')
+    email = data.get('email')
+    password = data.get('password')
+    role = data.get('role')
+    student_class = data.get('student_class') if role == 'student' else None
+
+    if not all([name, email, password, role]):
+        return jsonify({"message": "Missing required fields"}), 400
+
+    cursor = current_app.mysql.connection.cursor()
+    cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
+    if cursor.fetchone() is not None:
+        cursor.close()
+        return jsonify({"message": "Email already registered"}), 409
+
+    # Hash only once we know the email is free; the work runs in the hashing pool
+    try:
+        hashed_password = password_hasher.hash_password(password)
+    except HashingBusy:
+        cursor.close()
+        return jsonify({"message": "Server busy, please try again"}), 503
+
+    cursor.execute("""
+        INSERT INTO users (name, email, password, role, student_class)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (name, email, hashed_password, role, student_class))
+    current_app.mysql.connection.commit()
+    user_id = cursor.lastrowid
+    cursor.close()
+    # Drop any negative cache entry left by requests that used this id earlier
+    invalidate_user(user_id)
+
+    return jsonify({"message": "User registered successfully", "user_id": user_id}), 201
+
+# ============================ Login Endpoint ============================
+
+def rehash_password(user_id, password):
+    try:
+        new_hash = password_hasher.hash_password(password)
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute("UPDATE users SET password = %s WHERE id = %s", (new_hash, user_id))
+        current_app.mysql.connection.commit()
+        cursor.close()
+        print(f"🔐 Rehashed password for user {user_id} at cost {password_hasher.rounds}")
+    except Exception as e:
+        # The login itself already succeeded; try again next time
+        print(f"Rehash failed for user {user_id}: {e}")
+
+@auth_bp.route('/login', methods=['POST'])
+def login():
+    try:
+        data = request.get_json()
+        email = data.get('email')
+        password = data.get('password')
+
+        print(f"Login attempt for email: {email}")
+
+        if not email or not password:
+            return jsonify({'message': 'Email and password required'}), 400
+
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute("SELECT id, name, email, password, role, student_class FROM users WHERE email = %s", (email,))
+        user = cursor.fetchone()
+        cursor.close()
+
+        if user:
+            user_id, name, email, hashed_password, role, student_class = user
+            print(f"User found: {name}, role: {role}, class: {student_class}")
+            if password_hasher.check_password(hashed_password, password):
+                # Upgrade hashes made with an older work factor while we have the plain password
+                if password_hasher.needs_rehash(hashed_password):
+                    rehash_password(user_id, password)
+                user_data = {
+                    "id": user_id,
+                    "name": name,
+                    "email": email,
+                    "role": role,
+                    "student_class": student_class
+                }
+                response_data = {**issue_tokens(user_data), "user": user_data}
+                print(f"Login successful for {email}")
+                return jsonify(response_data), 200
+            else:
+                print(f"Invalid password for {email}")
+                return jsonify({'message': 'Invalid credentials'}), 401
+        else:
+            print(f"User not found: {email}")
+            return jsonify({'message': 'User not found'}), 404
+    except HashingBusy:
+        return jsonify({'message': 'Server busy, please try again'}), 503
+    except Exception as e:
+        print(f"Login error: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# ============================ Token Refresh / Logout ============================
+
+@auth_bp.route('/token/refresh', methods=['POST'])
+def refresh_token():
+    data = request.get_json(silent=True) or {}
+    claims = verify_refresh_token(data.get('refresh_token', ''))
+    if claims is None:
+        return jsonify({'message': 'Invalid or expired refresh token'}), 401
+
+    # Re-read the user so a changed role or class shows up in the new token
+    user = load_user(claims['id'])
+    if user is None:
+        return jsonify({'message': 'User not found'}), 401
+
+    # Refresh tokens are single use: rotate and revoke the old one
+    revoke_token(data['refresh_token'], 'refresh')
+    return jsonify({**issue_tokens(user), "user": user}), 200
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout():
+    data = request.get_json(silent=True) or {}
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        revoke_token(auth_header[len('Bearer '):].strip(), 'access')
+    if data.get('refresh_token'):
+        revoke_token(data['refresh_token'], 'refresh')
+    return jsonify({'message': 'Logged out'}), 200
@@ -0,0 +1,286 @@
+from flask import Blueprint, request, jsonify, current_app
+import csv
+import io
+import json
+import logging
+from collections import Counter
+from services.identity import get_user_from_request
+from services.question_dedup import DEFAULT_THRESHOLD, dedup_item, find_duplicates, find_duplicates_within, index_questions
+from services.question_store import MAX_OPTIONS, parse_options, options_json
+from services.quiz_packs import quiz_packs
+from services.response_cache import catalog_cache
+from services.topic_catalog import adjust_topic_counts, resolve_topic, topic_key
+
+bulk_upload_bp = Blueprint('bulk_upload', __name__)
+logger = logging.getLogger(__name__)
+
+# Rows are written in chunks of this size, one transaction per chunk
+BATCH_SIZE = 500
+# Cap the per-row error report so a completely broken file can't blow up the response
+MAX_REPORTED_ERRORS = 1000
+
+INSERT_QUESTION_SQL = """
+    INSERT INTO questions (class_name, subject, topic, type, question, options, correct_answer, topic_id, uploaded_by)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+QUESTION_ROW_SQL = "(%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+
+def insert_questions(cursor, rows):
+    """Insert rows as one multi-row INSERT statement and return their ids.
+
+    InnoDB hands a single multi-row INSERT consecutive ids starting at
+    lastrowid, so this needs no MAX(id) read that a concurrent upload could
+    race. The statement is built here rather than by executemany, which may
+    split a long batch into several INSERTs.
+    """
+    cursor.execute(
+        INSERT_QUESTION_SQL.rsplit("VALUES", 1)[0] + "VALUES " + ", ".join([QUESTION_ROW_SQL] * len(rows)),
+        tuple(value for params in rows for value in params)
+    )
+    if cursor.rowcount != len(rows):
+        raise RuntimeError(f"Inserted {cursor.rowcount} of {len(rows)} rows")
+    first_id = cursor.lastrowid
+    return list(range(first_id, first_id + len(rows)))
+
+
+# ============================ Row Sources ============================
+
+def iter_csv_rows(stream):
+    """Yield dict rows from a CSV byte stream without reading it fully"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    for row in csv.DictReader(text):
+        yield row
+
+
+def iter_ndjson_rows(stream):
+    """Yield dict rows from an NDJSON byte stream, one JSON object per line"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+def get_row_source():
+    """Pick a row iterator based on how the client sent the file"""
+    content_type = (request.mimetype or '').lower()
+
+    if content_type == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            return None
+        if (upload.filename or '').lower().endswith(('.ndjson', '.jsonl')):
+            return iter_ndjson_rows(upload.stream)
+        return iter_csv_rows(upload.stream)
+
+    if content_type in ('text/csv', 'application/csv'):
+        return iter_csv_rows(request.stream)
+
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        return iter_ndjson_rows(request.stream)
+
+    if content_type == 'application/json':
+        # Legacy clients post the already-parsed CSV as a JSON array
+        data = request.get_json(silent=True)
+        if isinstance(data, list):
+            return iter(data)
+
+    return None
+
+
+# ============================ Row Validation ============================
+
+def first_value(row, *keys):
+    for key in keys:
+        value = row.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def validate_row(row, default_uploader):
+    """Turn one incoming row into INSERT parameters, or raise ValueError"""
+    if isinstance(row, Exception):
+        raise ValueError(str(row))
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+
+    class_name = first_value(row, 'className', 'class_name', 'class')
+    subject = first_value(row, 'subject')
+    topic = first_value(row, 'topic')
+    topic_id = first_value(row, 'topic_id')
+    q_type = first_value(row, 'type')
+    question = first_value(row, 'question')
+    correct_answer = first_value(row, 'correctAnswer', 'correct_answer', 'correct_ans')
+    uploaded_by = first_value(row, 'uploaded_by') or default_uploader
+
+    missing = [name for name, value in (('question', question), ('type', q_type), ('correct_answer', correct_answer))
+               if value is None]
+    if topic_id is None and not all([class_name, subject, topic]):
+        missing.append('className/subject/topic or topic_id')
+    if missing:
+        raise ValueError("Missing required fields: " + ", ".join(missing))
+
+    if topic_id is not None:
+        try:
+            topic_id = int(topic_id)
+        except (TypeError, ValueError):
+            raise ValueError("topic_id must be an integer")
+
+    options = parse_options(row.get('options'))
+    if len(options) > MAX_OPTIONS:
+        raise ValueError(f"At most {MAX_OPTIONS} options are supported")
+
+    return (
+        class_name, subject, topic, q_type, question,
+        options_json(options, q_type),
+        correct_answer, topic_id, uploaded_by
+    )
+
+
+# ============================ Batched Writes ============================
+
+def resolve_catalog_topics(cursor, batch, report, topic_cache):
+    """File rows given only a topic_id under that catalog topic's class/subject/topic"""
+    resolved = []
+    for row_number, params in batch:
+        topic_id = params[7]
+        if params[0] is None and topic_id is not None:
+            if topic_id not in topic_cache:
+                topic_cache[topic_id] = resolve_topic(cursor, topic_id)
+            catalog_topic = topic_cache[topic_id]
+            if catalog_topic is None:
+                report.add_error(row_number, f"Unknown topic_id {topic_id}")
+                continue
+            params = tuple(catalog_topic) + params[3:]
+        resolved.append((row_number, params))
+    return resolved
+
+
+def drop_near_duplicates(cursor, batch, report):
+    """Report and drop rows repeating a question already in the bank, or an earlier row of the file"""
+    threshold = current_app.config.get('DUPLICATE_THRESHOLD', DEFAULT_THRESHOLD)
+    items = [dedup_item(row_number, params[0], params[4]) for row_number, params in batch]
+    existing = find_duplicates(cursor, items, threshold)
+    repeats = find_duplicates_within(items, threshold)
+
+    kept = []
+    for row_number, params in batch:
+        if row_number in existing:
+            report.add_error(row_number, f"Near-duplicate of question {existing[row_number][0][0]}")
+        elif row_number in repeats:
+            report.add_error(row_number, f"Near-duplicate of row {repeats[row_number]}")
+        else:
+            kept.append((row_number, params))
+    return kept
+
+
+def flush_batch(connection, batch, report, topic_cache, allow_duplicates=False):
+    """Insert one chunk as a multi-row INSERT inside a single transaction"""
+    cursor = connection.cursor()
+    try:
+        batch = resolve_catalog_topics(cursor, batch, report, topic_cache)
+        if not allow_duplicates:
+            batch = drop_near_duplicates(cursor, batch, report)
+        if not batch:
+            return
+        try:
+            question_ids = insert_questions(cursor, [params for _, params in batch])
+            adjust_topic_counts(cursor, Counter(topic_key(*params[:3]) for _, params in batch))
+            index_questions(cursor, [(question_id, params[0], params[4])
+                                     for question_id, (_, params) in zip(question_ids, batch)])
+            connection.commit()
+            report.inserted += len(batch)
+        except Exception:
+            connection.rollback()
+            # Retry row by row so the report points at the offending rows only
+            for row_number, params in batch:
+                try:
+                    cursor.execute(INSERT_QUESTION_SQL, params)
+                    question_id = cursor.lastrowid
+                    adjust_topic_counts(cursor, {topic_key(*params[:3]): 1})
+                    index_questions(cursor, [(question_id, params[0], params[4])])
+                    connection.commit()
+                    report.inserted += 1
+                except Exception as e:
+                    connection.rollback()
+                    report.add_error(row_number, f"Database error: {e}")
+    finally:
+        cursor.close()
+
+    # One invalidation per distinct (class, subject, topic, type) in the chunk
+    for class_name, subject, topic, q_type in {p[:4] for _, p in batch}:
+        quiz_packs.invalidate(class_name=class_name, subject=subject, topic=topic, type=q_type)
+    # Topic question counts changed for these classes
+    for class_name in {p[0] for _, p in batch}:
+        catalog_cache.bump(class_name)
+
+
+class UploadReport:
+    def __init__(self):
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    def to_dict(self):
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+# ============================ Bulk Upload Endpoint ============================
+
+@bulk_upload_bp.route('/bulk-upload', methods=['POST'])
+def bulk_upload():
+    user = get_user_from_request()
+    if not user or user['role'] not in ('teacher', 'admin'):
+        return jsonify({"error": "Only teachers and admins can bulk upload questions"}), 403
+
+    rows = get_row_source()
+    if rows is None:
+        return jsonify({"error": "Send questions as text/csv, application/x-ndjson, a JSON array or a multipart 'file'"}), 415
+
+    default_uploader = request.args.get('uploaded_by') or user['id']
+    allow_duplicates = request.args.get('allow_duplicates') in ('1', 'true')
+    connection = current_app.mysql.connection
+    report = UploadReport()
+    topic_cache = {}
+    batch = []
+
+    try:
+        for row_number, row in enumerate(rows, 1):
+            try:
+                batch.append((row_number, validate_row(row, default_uploader)))
+            except ValueError as e:
+                report.add_error(row_number, str(e))
+                continue
+
+            if len(batch) >= BATCH_SIZE:
+                flush_batch(connection, batch, report, topic_cache, allow_duplicates)
+                batch = []
+    except UnicodeDecodeError as e:
+        report.add_error(None, f"File is not valid UTF-8: {e}")
+    except csv.Error as e:
+        report.add_error(None, f"Malformed CSV: {e}")
+
+    if batch:
+        flush_batch(connection, batch, report, topic_cache, allow_duplicates)
+
+    logger.info("Bulk upload finished: %d inserted, %d failed", report.inserted, report.failed)
+    status = 201 if report.inserted else 400
+    return jsonify({"message": "Bulk upload processed", **report.to_dict()}), status
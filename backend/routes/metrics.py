@@ -0,0 +1,60 @@
+from flask import Blueprint, jsonify, current_app, Response
+from instrumentation import metrics
+from services.adaptive_quiz import student_models
+from services.passwords import password_hasher
+from services.quiz_packs import quiz_packs
+from services.response_cache import catalog_cache
+from services.response_writer import response_writer
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# ============================ Hashing / Pool Metrics ============================
+
+@metrics_bp.route('/metrics/hashing', methods=['GET'])
+def hashing_metrics():
+    return jsonify(password_hasher.stats()), 200
+
+@metrics_bp.route('/metrics/db-pool', methods=['GET'])
+def db_pool_metrics():
+    return jsonify(current_app.mysql.pool.stats()), 200
+
+@metrics_bp.route('/metrics/catalog-cache', methods=['GET'])
+def catalog_cache_metrics():
+    return jsonify(catalog_cache.stats()), 200
+
+@metrics_bp.route('/metrics/quiz-packs', methods=['GET'])
+def quiz_pack_metrics():
+    return jsonify(quiz_packs.stats()), 200
+
+@metrics_bp.route('/metrics/student-models', methods=['GET'])
+def student_model_metrics():
+    return jsonify(student_models.stats()), 200
+
+# ============================ Prometheus Exposition ============================
+
+def component_gauges():
+    """The JSON /metrics/* stats above, flattened into k12_<component>_<stat> gauges"""
+    components = {
+        'db_pool': ('Connection pool', current_app.mysql.pool.stats()),
+        'hashing': ('Password hashing pool', password_hasher.stats()),
+        'response_writer': ('Quiz response writer', response_writer.stats()),
+        'catalog_cache': ('Catalog response cache', catalog_cache.stats()),
+        'quiz_packs': ('Quiz pack cache', quiz_packs.stats()),
+        'student_models': ('Adaptive quiz student models', student_models.stats())
+    }
+    # Only present when served through asgi.py
+    async_database = current_app.extensions.get('async_database')
+    if async_database is not None:
+        components['async_db_pool'] = ('Async connection pool', async_database.stats())
+    gauges = []
+    for component, (description, stats) in components.items():
+        for key, value in sorted(stats.items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            gauges.append((f"k12_{component}_{key}", f"{description}: {key.replace('_', ' ')}.", value))
+    return gauges
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    body = metrics.render(component_gauges())
+    return Response(body, mimetype='text/plain; version=0.0.4')
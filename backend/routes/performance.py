@@ -1,18 +1,205 @@
-from flask import Blueprint, jsonify
-import json
-import os
+from flask import Blueprint, jsonify, request, current_app
+from services.identity import get_user_from_request
+from services.performance_rollups import get_rollups
+from services.progress_store import get_progress_cache
 
 performance_bp = Blueprint('performance', __name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# progress.txt entries are small, so its pages can be larger
+PROGRESS_PAGE_SIZE = 500
+MAX_PROGRESS_PAGE_SIZE = 5000
+
+
+def progress_filters():
+    return {
+        'student_id': request.args.get('student_id') or None,
+        'class_name': request.args.get('class') or None,
+        'subject': request.args.get('subject') or None,
+        'topic': request.args.get('topic') or None
+    }
+
+
+def query_progress_table(filters, after, limit):
+    """Same entries as progress.txt, read from performance_summary once it has been imported"""
+    conditions = []
+    params = []
+    for column, key in (('ps.student_id', 'student_id'), ('ps.class_name', 'class_name'),
+                        ('ps.subject_name', 'subject'), ('ps.topic_name', 'topic')):
+        if filters[key] is not None:
+            conditions.append(f"{column} = %s")
+            params.append(filters[key])
+    if after is not None:
+        conditions.append("ps.id > %s")
+        params.append(after)
+
+    query = """
+        SELECT ps.id, ps.student_id, u.name, ps.class_name, ps.subject_name, ps.topic_name,
+               ps.accuracy, ps.time_spent_seconds
+        FROM performance_summary ps
+        LEFT JOIN users u ON u.id = ps.student_id
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY ps.id LIMIT %s"
+    params.append(limit + 1)
+
+    cursor = current_app.mysql.connection.cursor()
+    cursor.execute(query, tuple(params))
+    rows = cursor.fetchall()
+    cursor.close()
+
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    entries = [
+        {
+            "student_id": r[1],
+            "student_name": r[2],
+            "class": r[3],
+            "subject": r[4],
+            "topic": r[5],
+            "accuracy": float(r[6]) if r[6] is not None else 0.0,
+            "time_spent": r[7]
+        }
+        for r in rows[:limit]
+    ]
+    return entries, next_cursor
+
+
 @performance_bp.route('/all-progress', methods=['GET'])
 def all_student_progress():
+    """Student progress entries, filterable by ?student_id=&class=&subject=&topic=.
+
+    Served from the cached progress.txt while it exists, otherwise from
+    performance_summary (see `flask import-progress`). The cursor for the
+    next page comes back in the X-Next-Cursor header.
+    """
+    try:
+        filters = progress_filters()
+        after = request.args.get('cursor', type=int)
+        limit = min(max(request.args.get('limit', PROGRESS_PAGE_SIZE, type=int), 1), MAX_PROGRESS_PAGE_SIZE)
+
+        cache = get_progress_cache(current_app.config.get('PROGRESS_FILE', 'progress.txt'))
+        if cache.exists():
+            entries, next_cursor = cache.query(after=after, limit=limit, **filters)
+        else:
+            entries, next_cursor = query_progress_table(filters, after, limit)
+
+        response = jsonify(entries)
+        if next_cursor is not None:
+            response.headers['X-Next-Cursor'] = str(next_cursor)
+        return response
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Get Student Performance ============================
+
+# Query parameters teachers can filter the summary by, and the columns they map to
+PERFORMANCE_FILTERS = {
+    'class': 'class_name',
+    'subject': 'subject_name',
+    'topic': 'topic_name',
+    'student_id': 'student_id'
+}
+
+def summary_query(user, args):
+    """(query, params, page_size) for one page of /performance/summary; also used by asgi.py"""
+    conditions = []
+    params = []
+    # If student, only show their own performance
+    if user and user['role'] == 'student':
+        conditions.append("student_id = %s")
+        params.append(user['id'])
+    else:
+        for arg, column in PERFORMANCE_FILTERS.items():
+            value = args.get(arg)
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+
+    after = args.get('cursor', type=int)
+    if after is not None:
+        conditions.append("id > %s")
+        params.append(after)
+
+    page_size = min(max(args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+
+    query = """
+        SELECT id, student_id, class_name, subject_name, topic_name, accuracy, time_spent_seconds, attempts
+        FROM performance_summary
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY id LIMIT %s"
+    params.append(page_size + 1)
+    return query, tuple(params), page_size
+
+
+def summary_page(performance, page_size):
+    """(entries, next cursor or None) from the rows fetched with summary_query()"""
+    has_more = len(performance) > page_size
+    performance = performance[:page_size]
+
+    result = []
+    for p in performance:
+        result.append({
+            "student_id": p[1],
+            "class_name": p[2],
+            "subject_name": p[3],
+            "topic_name": p[4],
+            "accuracy": float(p[5]) if p[5] is not None else 0.0,
+            "time_spent": p[6],
+            "attempts": p[7]
+        })
+    return result, (performance[-1][0] if has_more else None)
+
+
+@performance_bp.route('/summary', methods=['GET'])
+def get_performance_summary():
+    """Per-student topic aggregates, one keyset page at a time.
+
+    Teachers and admins can narrow by ?class=&subject=&topic=&student_id=;
+    students only ever see their own rows. Pages are ordered by id, and the
+    cursor for the next page comes back in the X-Next-Cursor header.
+    """
+    try:
+        # Get user from request
+        user = get_user_from_request()
+        query, params, page_size = summary_query(user, request.args)
+
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(query, params)
+        performance = cursor.fetchall()
+        cursor.close()
+
+        result, next_cursor = summary_page(performance, page_size)
+
+        response = jsonify(result)
+        if next_cursor is not None:
+            response.headers['X-Next-Cursor'] = str(next_cursor)
+        return response, 200
+    except Exception as e:
+        print("Error in get_performance_summary():", e)
+        return jsonify({"error": str(e)}), 500
+
+@performance_bp.route('/rollups', methods=['GET'])
+def get_performance_rollups():
+    """Class averages, accuracy percentiles and weakest topics for ?class=&subject=&topic="""
     try:
-        file_path = 'progress.txt'  # Make sure this file exists in your backend root directory
-        if not os.path.exists(file_path):
-            return jsonify([])
+        user = get_user_from_request()
+        if not user or user['role'] not in ('teacher', 'admin'):
+            return jsonify({"error": "Only teachers and admins can view class rollups"}), 403
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        return jsonify(data)
+        cursor = current_app.mysql.connection.cursor()
+        rollups = get_rollups(
+            cursor,
+            class_name=request.args.get('class') or None,
+            subject=request.args.get('subject') or None,
+            topic=request.args.get('topic') or None
+        )
+        cursor.close()
+        return jsonify(rollups), 200
     except Exception as e:
+        print("Error in get_performance_rollups():", e)
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,602 @@
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+import base64
+import json
+import random
+from datetime import datetime
+from db.pool import InstrumentedSSCursor
+from services.adaptive_quiz import QUIZ_MODES, adaptive_selector, student_models
+from services.identity import get_user_from_request, require_student_class_access
+from services.question_dedup import index_questions, near_duplicate_response
+from services.question_export import EXPORT_FORMATS, export_questions, export_filename
+from services.question_search import MAX_SEARCH_RESULTS, build_match_query, search_questions, search_facets
+from services.question_store import QUESTION_FILTERS, MAX_OPTIONS, parse_options, options_json, question_json_sql, join_json_rows, json_rows_response, json_text
+from services.quiz_packs import quiz_packs
+from services.response_cache import catalog_cache, role_scope
+from services.topic_catalog import adjust_topic_counts, resolve_topic, list_topics, topic_key
+
+questions_bp = Blueprint('questions', __name__)
+
+# ============================ Upload Question V1 ============================
+
+@questions_bp.route('/questions/upload', methods=['POST'])
+def upload_question():
+    data = request.get_json()
+
+    question = data.get('question')
+    q_type = data.get('type')
+    options = data.get('options', '')
+    correct_ans = data.get('correct_ans')
+    topic_id = data.get('topic_id')
+    uploaded_by = data.get('uploaded_by')
+
+    if not all([question, q_type, correct_ans, topic_id, uploaded_by]):
+        return jsonify({"message": "Missing required fields"}), 400
+
+    try:
+        cursor = current_app.mysql.connection.cursor()
+
+        # topic_id refers to the topic catalog; file the question under that topic
+        catalog_topic = resolve_topic(cursor, topic_id)
+        if catalog_topic is None:
+            cursor.close()
+            return jsonify({"message": "Unknown topic_id"}), 400
+        class_name, subject, topic = catalog_topic
+
+        duplicate = near_duplicate_response(cursor, class_name, question, data.get('allow_duplicate'))
+        if duplicate is not None:
+            cursor.close()
+            return duplicate
+
+        query = """
+            INSERT INTO questions (class_name, subject, topic, question, type, options, correct_answer, topic_id, uploaded_by)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        cursor.execute(query, (class_name, subject, topic, question, q_type, options_json(options, q_type),
+                               correct_ans, topic_id, uploaded_by))
+        new_id = cursor.lastrowid
+        adjust_topic_counts(cursor, {(class_name, subject, topic): 1})
+        index_questions(cursor, [(new_id, class_name, question)])
+        current_app.mysql.connection.commit()
+        cursor.close()
+    except Exception as e:
+        current_app.mysql.connection.rollback()
+        print("Error in upload_question():", e)
+        return jsonify({"error": str(e)}), 500
+
+    quiz_packs.invalidate(new_id, class_name=class_name, subject=subject, topic=topic, type=q_type)
+    catalog_cache.bump(class_name)
+
+    return jsonify({"message": "Question uploaded successfully", "question_id": new_id}), 201
+
+# ============================ Upload Question V2 ============================
+
+@questions_bp.route('/api/questions/upload', methods=['POST'])
+def upload_question_v2():
+    data = request.get_json()
+
+    class_name = data.get('className')
+    subject = data.get('subject')
+    topic = data.get('topic')
+    q_type = data.get('type')
+    question = data.get('question')
+    options = data.get('options', [])
+    correct_answer = data.get('correctAnswer')
+    uploaded_by = data.get('uploaded_by')
+
+    if not all([class_name, subject, topic, q_type, question, correct_answer]):
+        return jsonify({"message": "Missing required fields"}), 400
+
+    try:
+        cursor = current_app.mysql.connection.cursor()
+        duplicate = near_duplicate_response(cursor, class_name, question, data.get('allow_duplicate'))
+        if duplicate is not None:
+            cursor.close()
+            return duplicate
+
+        query = """
+            INSERT INTO questions (class_name, subject, topic, type, question, options, correct_answer, uploaded_by)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        cursor.execute(query, (
+            class_name, subject, topic, q_type, question,
+            options_json(options, q_type), correct_answer,
+            uploaded_by
+        ))
+        question_id = cursor.lastrowid
+        adjust_topic_counts(cursor, {topic_key(class_name, subject, topic): 1})
+        index_questions(cursor, [(question_id, class_name, question)])
+        current_app.mysql.connection.commit()
+        cursor.close()
+    except Exception as e:
+        current_app.mysql.connection.rollback()
+        print("Error in upload_question_v2():", e)
+        return jsonify({"error": str(e)}), 500
+
+    quiz_packs.invalidate(question_id, class_name=class_name, subject=subject, topic=topic, type=q_type)
+    catalog_cache.bump(class_name)
+
+    return jsonify({"message": "Question uploaded successfully", "question_id": question_id}), 201
+
+# ============================ Get Topics for Subject ============================
+
+@questions_bp.route('/topics/<int:subject_id>', methods=['GET'])
+def get_topics_for_subject(subject_id):
+    try:
+        # Check if student is trying to access their own class only
+        user = get_user_from_request()
+
+        # Cached entries remember their class, so the access check needs no query
+        cache_key = f"topics:{subject_id}:{role_scope(user)}"
+        entry = catalog_cache.lookup(cache_key)
+        if entry is not None:
+            if user and user['role'] == 'student' and user['student_class'] != entry['scope']:
+                return jsonify({"error": "Access denied: You can only access topics for your enrolled class"}), 403
+            return catalog_cache.respond(entry)
+
+        cursor = current_app.mysql.connection.cursor()
+        
+        # Get subject details first
+        cursor.execute("SELECT name, class_name FROM subjects WHERE id = %s", (subject_id,))
+        subject_result = cursor.fetchone()
+        
+        if not subject_result:
+            return jsonify({"error": "Subject not found"}), 404
+            
+        subject_name, class_name = subject_result
+        
+        # For students, check if they're trying to access their own class
+        if user and user['role'] == 'student':
+            if user['student_class'] != class_name:
+                return jsonify({"error": "Access denied: You can only access topics for your enrolled class"}), 403
+        
+        # Topics and their question counts come straight from the maintained catalog
+        version = catalog_cache.version(class_name)
+        topics = list_topics(cursor, class_name, subject_name)
+        cursor.close()
+
+        result = []
+        for topic_id, topic_name, question_count in topics:
+            result.append({
+                "id": topic_id,
+                "name": topic_name,
+                "subject_id": subject_id,
+                "question_count": question_count
+            })
+
+        return catalog_cache.respond(catalog_cache.store(cache_key, class_name, version, result))
+        
+    except Exception as e:
+        print("Error in get_topics_for_subject():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Get Questions for Students (Class-wise filtered) ============================
+
+QUIZ_SIZE = 20
+
+@questions_bp.route('/questions', methods=['GET'])
+@require_student_class_access
+def get_questions_for_students():
+    try:
+        # Get query parameters
+        class_name = request.args.get('class')
+        subject_id = request.args.get('subject_id')
+        topic_id = request.args.get('topic_id')
+        question_type = request.args.get('type')
+        mode = request.args.get('mode') or 'uniform'
+        
+        # Validate required parameters
+        if not class_name:
+            return jsonify({"message": "Class is required"}), 400
+        if mode not in QUIZ_MODES:
+            return jsonify({"message": f"mode must be one of: {', '.join(QUIZ_MODES)}"}), 400
+
+        cursor = current_app.mysql.connection.cursor()
+
+        filters = {
+            'class_name': class_name,
+            'type': question_type
+        }
+
+        # Add additional filters if provided
+        if subject_id:
+            # Get subject name from subject ID for filtering
+            cursor.execute("SELECT name FROM subjects WHERE id = %s", (subject_id,))
+            subject_result = cursor.fetchone()
+            if subject_result:
+                filters['subject'] = subject_result[0]
+
+        if topic_id:
+            # Topic ids come from the catalog served by /topics/<subject_id>
+            catalog_topic = resolve_topic(cursor, topic_id)
+            if catalog_topic is None or catalog_topic[0] != class_name:
+                cursor.close()
+                return jsonify({"questions": [], "seed": None, "mode": mode}), 200
+            filters['subject'] = catalog_topic[1]
+            filters['topic'] = catalog_topic[2]
+
+        # Draw from the precomputed pack for these filters; answers stay server-side.
+        # Returning the seed lets a retake request the exact same quiz again.
+        seed = request.args.get('seed', type=int)
+        if seed is None:
+            seed = random.randrange(2 ** 31)
+        selector = None
+        if mode == 'adaptive':
+            # Weighted by the student's own answers; anyone else gets a uniform quiz
+            user = get_user_from_request()
+            if user and user['role'] == 'student':
+                selector = adaptive_selector(*student_models.snapshot(cursor, user['id']))
+            else:
+                mode = 'uniform'
+        documents = quiz_packs.draw(cursor, filters, QUIZ_SIZE, seed=seed, selector=selector)
+        cursor.close()
+
+        body = f'{{"questions":{join_json_rows(documents)},"seed":{seed},"mode":"{mode}"}}'
+        return Response(body, status=200, mimetype='application/json')
+        
+    except Exception as e:
+        print("Error in get_questions_for_students():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Get All Questions (Admin only) ============================
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+
+def encode_page_cursor(created_at, question_id):
+    raw = f"{created_at}|{question_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_page_cursor(token):
+    """Return (created_at, id) from a cursor token, or raise ValueError"""
+    try:
+        created_at, question_id = base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(question_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+# One row of /questions/all, built by MySQL
+ADMIN_QUESTION_JSON = question_json_sql('id', 'class_name', 'subject', 'topic', 'type', 'question', 'options',
+                                        'correct_answer', 'uploaded_by', 'created_at')
+
+
+@questions_bp.route('/questions/all', methods=['GET'])
+def get_all_questions():
+    """List the question bank newest first.
+
+    JSON mode returns one keyset page (created_at, id) and puts the cursor for
+    the next page in the X-Next-Cursor header. ?format=ndjson streams every
+    matching row through a server-side cursor instead.
+    """
+    try:
+        conditions = []
+        params = []
+        for arg, column in QUESTION_FILTERS.items():
+            value = request.args.get(arg)
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+
+        cursor_token = request.args.get('cursor')
+        if cursor_token:
+            try:
+                last_created_at, last_id = decode_page_cursor(cursor_token)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+            params.extend([last_created_at, last_created_at, last_id])
+
+        query = f"""
+            SELECT id, created_at, {ADMIN_QUESTION_JSON}
+            FROM questions
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+
+        if request.args.get('format') == 'ndjson':
+            return Response(stream_with_context(stream_questions_ndjson(query, tuple(params))),
+                            mimetype='application/x-ndjson')
+
+        page_size = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(query + " LIMIT %s", tuple(params) + (page_size + 1,))
+        questions = cursor.fetchall()
+        cursor.close()
+
+        has_more = len(questions) > page_size
+        questions = questions[:page_size]
+        response = json_rows_response(q[2] for q in questions)
+        if has_more:
+            last = questions[-1]
+            response.headers['X-Next-Cursor'] = encode_page_cursor(last[1], last[0])
+        return response, 200
+
+    except Exception as e:
+        print("Error in get_all_questions():", e)
+        return jsonify({"error": str(e)}), 500
+
+
+def stream_questions_ndjson(query, params):
+    """Yield NDJSON lines in chunks from an unbuffered (server-side) cursor"""
+    cursor = current_app.mysql.connection.cursor(InstrumentedSSCursor)
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(STREAM_CHUNK_SIZE)
+            if not rows:
+                break
+            yield "".join(json_text(q[2]) + "\n" for q in rows)
+    finally:
+        cursor.close()
+
+# ============================ Export Question Bank ============================
+
+@questions_bp.route('/questions/export', methods=['GET'])
+def export_question_bank():
+    """Download the question bank as ?format=csv|ndjson|columnar, optionally ?gzip=1.
+
+    Accepts the /questions/all filters. Rows are streamed from a server-side
+    cursor in chunks, so memory stays flat however large the bank is.
+    """
+    user = get_user_from_request()
+    if not user or user['role'] not in ('teacher', 'admin'):
+        return jsonify({"error": "Only teachers and admins can export questions"}), 403
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    compress = request.args.get('gzip') in ('1', 'true')
+
+    try:
+        body = export_questions(current_app.mysql.connection, fmt, request.args, compress=compress)
+        mimetype = 'application/gzip' if compress else EXPORT_FORMATS[fmt][0]
+        return Response(stream_with_context(body), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{export_filename(fmt, compress)}"'
+        })
+    except Exception as e:
+        print("Error in export_question_bank():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Search Questions ============================
+
+@questions_bp.route('/questions/search', methods=['GET'])
+def search_question_bank():
+    """Full-text search over question text, best match first.
+
+    ?q= is required; the /questions/all filters narrow it. The first page
+    also returns the total and class/subject/topic facet counts. Pages
+    are offset-based (up to MAX_SEARCH_RESULTS), with the next offset in
+    the X-Next-Cursor header.
+    """
+    user = get_user_from_request()
+    if not user or user['role'] not in ('teacher', 'admin'):
+        return jsonify({"error": "Only teachers and admins can search questions"}), 403
+
+    match_query = build_match_query(request.args.get('q'))
+    if match_query is None:
+        return jsonify({"error": "q needs at least one word of two or more characters"}), 400
+
+    try:
+        page_size = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        offset = max(request.args.get('cursor', 0, type=int), 0)
+        page_size = min(page_size, MAX_SEARCH_RESULTS - offset)
+        if page_size <= 0:
+            return jsonify({"error": f"Only the first {MAX_SEARCH_RESULTS} results can be paged through; refine the search"}), 400
+
+        cursor = current_app.mysql.connection.cursor()
+        documents = search_questions(cursor, match_query, request.args, page_size + 1, offset)
+        total, facets = search_facets(cursor, match_query, request.args) if offset == 0 else (None, None)
+        cursor.close()
+
+        has_more = len(documents) > page_size
+        documents = documents[:page_size]
+        body = (f'{{"questions":{join_json_rows(documents)},'
+                f'"total":{json.dumps(total)},"facets":{json.dumps(facets)}}}')
+        response = Response(body, status=200, mimetype='application/json')
+        if has_more and offset + page_size < MAX_SEARCH_RESULTS:
+            response.headers['X-Next-Cursor'] = str(offset + page_size)
+        return response
+    except Exception as e:
+        print("Error in search_question_bank():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Near-Duplicate Report ============================
+
+DUPLICATE_CLUSTERS_PAGE_SIZE = 50
+DUPLICATE_QUESTION_JSON = question_json_sql('id', 'class_name', 'subject', 'topic', 'type', 'question',
+                                            'uploaded_by', 'created_at', alias='q')
+
+@questions_bp.route('/questions/duplicates', methods=['GET'])
+def get_duplicate_clusters():
+    """Clusters of near-duplicate questions found by `flask find-duplicates`.
+
+    Each cluster is named after its oldest question and lists every member
+    with its similarity to that question. ?class= narrows the report;
+    clusters are paged by id with the next cursor in X-Next-Cursor.
+    """
+    user = get_user_from_request()
+    if not user or user['role'] not in ('teacher', 'admin'):
+        return jsonify({"error": "Only teachers and admins can view duplicate reports"}), 403
+
+    try:
+        page_size = min(max(request.args.get('limit', DUPLICATE_CLUSTERS_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        conditions = ["d.question_id = d.cluster_id"]
+        params = []
+        if request.args.get('class'):
+            conditions.append("q.class_name = %s")
+            params.append(request.args['class'])
+        after = request.args.get('cursor', type=int)
+        if after is not None:
+            conditions.append("d.cluster_id > %s")
+            params.append(after)
+
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(f"""
+            SELECT d.cluster_id
+            FROM question_duplicates d
+            JOIN questions q ON q.id = d.question_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY d.cluster_id
+            LIMIT %s
+        """, tuple(params) + (page_size + 1,))
+        cluster_ids = [row[0] for row in cursor.fetchall()]
+        has_more = len(cluster_ids) > page_size
+        cluster_ids = cluster_ids[:page_size]
+
+        members = {}
+        if cluster_ids:
+            placeholders = ", ".join(["%s"] * len(cluster_ids))
+            cursor.execute(f"""
+                SELECT d.cluster_id, JSON_SET({DUPLICATE_QUESTION_JSON}, '$.similarity', d.similarity)
+                FROM question_duplicates d
+                JOIN questions q ON q.id = d.question_id
+                WHERE d.cluster_id IN ({placeholders})
+                ORDER BY d.cluster_id, d.question_id
+            """, tuple(cluster_ids))
+            for cluster_id, document in cursor.fetchall():
+                members.setdefault(cluster_id, []).append(document)
+        cursor.close()
+
+        body = "[" + ",".join(
+            f'{{"cluster_id":{cluster_id},"questions":{join_json_rows(members.get(cluster_id, []))}}}'
+            for cluster_id in cluster_ids
+        ) + "]"
+        response = Response(body, status=200, mimetype='application/json')
+        if has_more:
+            response.headers['X-Next-Cursor'] = str(cluster_ids[-1])
+        return response
+    except Exception as e:
+        print("Error in get_duplicate_clusters():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Get Questions Uploaded by Teacher ============================
+
+UPLOADED_QUESTION_JSON = question_json_sql('id', 'question', 'type', 'options', 'correct_answer', 'topic')
+
+@questions_bp.route('/questions/uploaded-by/<int:teacher_id>', methods=['GET'])
+def get_uploaded_questions(teacher_id):
+    try:
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(f"""
+            SELECT {UPLOADED_QUESTION_JSON}
+            FROM questions
+            WHERE uploaded_by = %s
+        """, (teacher_id,))
+        questions = cursor.fetchall()
+        cursor.close()
+
+        return json_rows_response(q[0] for q in questions)
+    except Exception as e:
+        print("Error in get_uploaded_questions():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Edit / Delete Question ============================
+
+@questions_bp.route('/questions/<int:question_id>', methods=['PUT'])
+def update_question(question_id):
+    user = get_user_from_request()
+    if user and user['role'] == 'student':
+        return jsonify({"error": "Only teachers and admins can edit questions"}), 403
+
+    data = request.get_json() or {}
+    try:
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(
+            "SELECT class_name, subject, topic, type FROM questions WHERE id = %s FOR UPDATE",
+            (question_id,)
+        )
+        existing = cursor.fetchone()
+        if not existing:
+            cursor.close()
+            return jsonify({"error": "Question not found"}), 404
+
+        old_class, old_subject, old_topic, old_type = existing
+        class_name = data.get('className', old_class)
+        subject = data.get('subject', old_subject)
+        topic = data.get('topic', old_topic)
+        if data.get('topic_id'):
+            catalog_topic = resolve_topic(cursor, data['topic_id'])
+            if catalog_topic is None:
+                cursor.close()
+                return jsonify({"error": "Unknown topic_id"}), 400
+            class_name, subject, topic = catalog_topic
+
+        updates = {'class_name': class_name, 'subject': subject, 'topic': topic}
+        if data.get('topic_id'):
+            updates['topic_id'] = data['topic_id']
+        if data.get('question'):
+            updates['question'] = data['question']
+        if data.get('type'):
+            updates['type'] = data['type']
+        correct_answer = data.get('correctAnswer') or data.get('correct_answer') or data.get('correct_ans')
+        if correct_answer:
+            updates['correct_answer'] = correct_answer
+        if 'options' in data:
+            updates['options'] = options_json(parse_options(data['options'])[:MAX_OPTIONS], updates.get('type', old_type))
+
+        assignments = ", ".join(f"{column} = %s" for column in updates)
+        cursor.execute(f"UPDATE questions SET {assignments} WHERE id = %s", tuple(updates.values()) + (question_id,))
+        if 'question' in updates or class_name != old_class:
+            # Keep the near-duplicate index in step with the new text/class
+            cursor.execute("SELECT question FROM questions WHERE id = %s", (question_id,))
+            index_questions(cursor, [(question_id, class_name, cursor.fetchone()[0])])
+
+        old_key = topic_key(old_class, old_subject, old_topic)
+        new_key = topic_key(class_name, subject, topic)
+        if old_key != new_key:
+            deltas = {}
+            if old_key:
+                deltas[old_key] = -1
+            if new_key:
+                deltas[new_key] = 1
+            adjust_topic_counts(cursor, deltas)
+
+        current_app.mysql.connection.commit()
+        cursor.close()
+
+        quiz_packs.invalidate(question_id, class_name=old_class, subject=old_subject, topic=old_topic, type=old_type)
+        quiz_packs.invalidate(question_id, class_name=class_name, subject=subject, topic=topic, type=updates.get('type', old_type))
+        if old_key != new_key:
+            catalog_cache.bump(old_class)
+            catalog_cache.bump(class_name)
+        return jsonify({"message": "Question updated successfully"}), 200
+    except Exception as e:
+        current_app.mysql.connection.rollback()
+        print("Error in update_question():", e)
+        return jsonify({"error": str(e)}), 500
+
+@questions_bp.route('/questions/<int:question_id>', methods=['DELETE'])
+def delete_question(question_id):
+    user = get_user_from_request()
+    if user and user['role'] == 'student':
+        return jsonify({"error": "Only teachers and admins can delete questions"}), 403
+
+    try:
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(
+            "SELECT class_name, subject, topic, type FROM questions WHERE id = %s FOR UPDATE",
+            (question_id,)
+        )
+        existing = cursor.fetchone()
+        if not existing:
+            cursor.close()
+            return jsonify({"error": "Question not found"}), 404
+
+        class_name, subject, topic, q_type = existing
+        cursor.execute("DELETE FROM questions WHERE id = %s", (question_id,))
+        key = topic_key(class_name, subject, topic)
+        if key:
+            adjust_topic_counts(cursor, {key: -1})
+        current_app.mysql.connection.commit()
+        cursor.close()
+
+        quiz_packs.invalidate(question_id, class_name=class_name, subject=subject, topic=topic, type=q_type)
+        catalog_cache.bump(class_name)
+        return jsonify({"message": "Question deleted successfully"}), 200
+    except Exception as e:
+        current_app.mysql.connection.rollback()
+        print("Error in delete_question():", e)
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,210 @@
+from flask import Blueprint, request, jsonify, current_app
+from services.identity import get_user_from_request
+from services.question_store import question_json_sql, json_rows_response
+from services.quiz_packs import quiz_packs
+from services.response_writer import response_writer, WriterBusy, score_answer
+
+responses_bp = Blueprint('responses', __name__)
+
+# Largest quiz a single submission may carry
+MAX_ANSWERS_PER_SUBMISSION = 200
+MAX_ANSWER_LENGTH = 1000
+# quiz_responses.time_spent is an INT of seconds; a day is more than any quiz takes
+MAX_TIME_SPENT = 86400
+
+
+class InvalidField(ValueError):
+    """A submitted field that is missing or of the wrong type; the message names it"""
+
+
+def parse_id(value, field, required=True):
+    """Positive integer id from JSON (int or digit string)"""
+    if value is None or value == '':
+        if required:
+            raise InvalidField(f"{field} is required")
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise InvalidField(f"{field} must be a positive integer")
+    try:
+        value = int(value)
+    except ValueError:
+        raise InvalidField(f"{field} must be a positive integer")
+    if value <= 0:
+        raise InvalidField(f"{field} must be a positive integer")
+    return value
+
+
+def parse_time_spent(value, field):
+    """Whole seconds, or None when the client didn't time the answer"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise InvalidField(f"{field} must be a number of seconds")
+    try:
+        value = float(value)
+    except ValueError:
+        raise InvalidField(f"{field} must be a number of seconds")
+    if not 0 <= value <= MAX_TIME_SPENT:
+        raise InvalidField(f"{field} must be between 0 and {MAX_TIME_SPENT} seconds")
+    return int(round(value))
+
+
+def parse_answer(value, field):
+    if value is None:
+        return ''
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise InvalidField(f"{field} must be a string")
+    value = str(value)
+    if len(value) > MAX_ANSWER_LENGTH:
+        raise InvalidField(f"{field} is longer than {MAX_ANSWER_LENGTH} characters")
+    return value
+
+
+def parse_submission(data, user):
+    """(student_id, records) from a POST /responses body; raises InvalidField"""
+    student_id = parse_id(data.get('student_id') or (user['id'] if user else None), 'student_id')
+    topic_id = parse_id(data.get('topic_id'), 'topic_id', required=False)
+    answers = data.get('responses')
+    if not isinstance(answers, list) or not answers:
+        raise InvalidField("responses must be a non-empty list")
+    if len(answers) > MAX_ANSWERS_PER_SUBMISSION:
+        raise InvalidField(f"responses: at most {MAX_ANSWERS_PER_SUBMISSION} answers per submission")
+
+    records = []
+    for i, item in enumerate(answers):
+        if not isinstance(item, dict):
+            raise InvalidField(f"responses[{i}] must be an object")
+        records.append({
+            'student_id': student_id,
+            'question_id': parse_id(item.get('question_id'), f"responses[{i}].question_id"),
+            'topic_id': topic_id,
+            'answer': parse_answer(item.get('answer'), f"responses[{i}].answer"),
+            'time_spent': parse_time_spent(item.get('time_spent'), f"responses[{i}].time_spent")
+        })
+    return student_id, records
+
+
+def can_access_student(user, student_id):
+    """Signed-in users only, and students may only read or write their own answers"""
+    if not user:
+        return False
+    return user['role'] != 'student' or user['id'] == student_id
+
+
+# ============================ Submit Answers ============================
+
+@responses_bp.route('/responses', methods=['POST'])
+def submit_responses():
+    data = request.get_json(silent=True)
+    user = get_user_from_request()
+    if not user:
+        return jsonify({"error": "Authentication required"}), 401
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object body"}), 400
+
+    try:
+        student_id, records = parse_submission(data, user)
+    except InvalidField as e:
+        return jsonify({"error": str(e)}), 400
+    if not can_access_student(user, student_id):
+        return jsonify({"error": "Access denied: You can only submit your own answers"}), 403
+
+    try:
+        accepted = response_writer.submit(current_app._get_current_object(), records)
+    except WriterBusy:
+        return jsonify({"error": "Too many submissions right now, please retry"}), 503, {'Retry-After': '2'}
+
+    # Score right away against the answers held in the quiz packs; the writer
+    # still stores the authoritative score, available from /responses once flushed
+    answers_by_id = quiz_packs.answers_for(r['question_id'] for r in records)
+    results = [
+        {
+            "question_id": r['question_id'],
+            "answer": r['answer'],
+            "score": score_answer(r['answer'], answers_by_id[r['question_id']]) if r['question_id'] in answers_by_id else None
+        }
+        for r in records
+    ]
+    return jsonify({"message": "Responses accepted", "accepted": accepted, "results": results}), 202
+
+
+# ============================ Read Back Answers ============================
+
+@responses_bp.route('/responses/<int:student_id>/<int:topic_id>', methods=['GET'])
+def get_responses(student_id, topic_id):
+    user = get_user_from_request()
+    if not user:
+        return jsonify({"error": "Authentication required"}), 401
+    if not can_access_student(user, student_id):
+        return jsonify({"error": "Access denied: You can only view your own answers"}), 403
+
+    # Read-your-writes: wait for this student's just-submitted quiz only,
+    # not for everything other students have queued
+    response_writer.wait_for_student(student_id, timeout=2.0)
+
+    try:
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute("""
+            SELECT question_id, answer, score
+            FROM quiz_responses
+            WHERE student_id = %s AND topic_id = %s
+            ORDER BY answered_at DESC, id DESC
+            LIMIT 1000
+        """, (student_id, topic_id))
+        rows = cursor.fetchall()
+        cursor.close()
+
+        # Keep only the latest answer per question
+        result = {}
+        for question_id, answer, score in rows:
+            if question_id not in result:
+                result[question_id] = {
+                    "question_id": question_id,
+                    "answer": answer,
+                    "score": float(score) if score is not None else 0.0
+                }
+        return jsonify(list(result.values())), 200
+    except Exception as e:
+        print("Error in get_responses():", e)
+        return jsonify({"error": str(e)}), 500
+
+
+REVIEW_QUESTION_JSON = question_json_sql('id', 'question', 'correct_answer', 'type', 'options', alias='q')
+
+
+@responses_bp.route('/quiz/<int:topic_id>', methods=['GET'])
+def get_quiz_review(topic_id):
+    """Questions a student answered on a topic, with answers, for the result page"""
+    user = get_user_from_request()
+    if not user:
+        return jsonify({"error": "Authentication required"}), 401
+    student_id = request.args.get('student_id', type=int) or user['id']
+    if not student_id:
+        return jsonify({"error": "student_id is required"}), 400
+    if not can_access_student(user, student_id):
+        return jsonify({"error": "Access denied: You can only view your own quizzes"}), 403
+
+    try:
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(f"""
+            SELECT {REVIEW_QUESTION_JSON}
+            FROM questions q
+            JOIN (
+                SELECT DISTINCT question_id
+                FROM quiz_responses
+                WHERE student_id = %s AND topic_id = %s
+            ) r ON r.question_id = q.id
+            ORDER BY q.id
+        """, (student_id, topic_id))
+        rows = cursor.fetchall()
+        cursor.close()
+
+        return json_rows_response(q[0] for q in rows)
+    except Exception as e:
+        print("Error in get_quiz_review():", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@responses_bp.route('/metrics/response-writer', methods=['GET'])
+def response_writer_metrics():
+    return jsonify(response_writer.stats()), 200
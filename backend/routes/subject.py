@@ -1,26 +1,9 @@
 from flask import Blueprint, request, jsonify, current_app
-from functools import wraps
+from services.identity import get_user_from_request
+from services.response_cache import catalog_cache, role_scope
 
 subject_bp = Blueprint('subject_bp', __name__)
 
-def get_user_from_request():
-    """Extract user info from request headers"""
-    user_id = request.headers.get('X-User-ID')
-    if user_id:
-        cursor = current_app.mysql.connection.cursor()
-        cursor.execute("SELECT id, name, email, role, student_class FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        cursor.close()
-        if user:
-            return {
-                'id': user[0],
-                'name': user[1], 
-                'email': user[2],
-                'role': user[3],
-                'student_class': user[4]
-            }
-    return None
-
 @subject_bp.route('/subjects', methods=['POST'])
 def add_subject():
     data = request.get_json()
@@ -36,6 +19,7 @@ def add_subject():
         cursor.execute(query, (name.strip(), class_name.strip()))
         current_app.mysql.connection.commit()
         cursor.close()
+        catalog_cache.bump(class_name.strip())
         return jsonify({'message': 'Subject added successfully'}), 201
 
     except Exception as e:
@@ -50,7 +34,14 @@ def get_subjects(class_id):
         if user and user['role'] == 'student':
             if user['student_class'] != class_id:
                 return jsonify({'error': 'Access denied: You can only access subjects for your enrolled class'}), 403
-        
+
+        # Repeat reads are served from the catalog cache, or answered 304
+        cache_key = f"subjects:{class_id}:{role_scope(user)}"
+        entry = catalog_cache.lookup(cache_key)
+        if entry is not None:
+            return catalog_cache.respond(entry)
+        version = catalog_cache.version(class_id)
+
         cursor = current_app.mysql.connection.cursor()
         query = "SELECT * FROM subjects WHERE class_name = %s"
         cursor.execute(query, (class_id,))
@@ -65,7 +56,7 @@ def get_subjects(class_id):
                 'class_name': row[2]
             })
 
-        return jsonify(subjects)
+        return catalog_cache.respond(catalog_cache.store(cache_key, class_id, version, subjects))
 
     except Exception as e:
         print("Error fetching subjects:", e)
@@ -1,17 +1,12 @@
-from flask import Blueprint, request, jsonify
-import mysql.connector
-import json
+from flask import Blueprint, request, jsonify, current_app
+from services.question_dedup import index_questions, near_duplicate_response
+from services.question_store import options_json
+from services.quiz_packs import quiz_packs
+from services.response_cache import catalog_cache
+from services.topic_catalog import adjust_topic_counts, topic_key
 
 upload_bp = Blueprint("upload", __name__)
 
-def get_db_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="test@123#@",
-        database="k12_reviser"
-    )
-
 @upload_bp.route("/upload", methods=["POST"])
 def upload_question():
     data = request.get_json()
@@ -21,8 +16,12 @@ def upload_question():
         return jsonify({"error": "Missing or empty required fields"}), 400
 
     try:
-        conn = get_db_connection()
+        conn = current_app.mysql.connection
         cursor = conn.cursor()
+        duplicate = near_duplicate_response(cursor, data["className"], data["question"], data.get("allow_duplicate"))
+        if duplicate is not None:
+            cursor.close()
+            return duplicate
 
         cursor.execute(
             """
@@ -35,14 +34,20 @@ def upload_question():
                 data["topic"],
                 data["type"],
                 data["question"],
-                json.dumps(data.get("options", [])),
+                options_json(data.get("options", []), data["type"]),
                 data["correctAnswer"],
                 data["uploaded_by"]
             )
         )
+        question_id = cursor.lastrowid
+        adjust_topic_counts(cursor, {topic_key(data["className"], data["subject"], data["topic"]): 1})
+        index_questions(cursor, [(question_id, data["className"], data["question"])])
         conn.commit()
         cursor.close()
-        conn.close()
+        quiz_packs.invalidate(
+            class_name=data["className"], subject=data["subject"], topic=data["topic"], type=data["type"]
+        )
+        catalog_cache.bump(data["className"])
 
         return jsonify({"message": "Question uploaded successfully!"}), 201
 
@@ -0,0 +1,135 @@
+import csv
+from itertools import islice
+from flask import Blueprint, request, jsonify, current_app
+from routes.bulk_upload import get_row_source
+from services.identity import get_user_from_request
+from services.passwords import HashingBusy
+from services.roster import import_roster
+
+users_bp = Blueprint('users', __name__)
+
+# ============================ User Directory ============================
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Optional ?param=value filters accepted by /users, mapped to their column
+USER_FILTERS = {
+    'role': 'role',
+    'class': 'student_class'
+}
+
+@users_bp.route('/users', methods=['GET'])
+def list_users():
+    """Registered users, one keyset page at a time.
+
+    Filter by ?role=&class= and search names/emails with ?q= (prefix
+    match); teachers only see students. Pages are ordered by id, and
+    the cursor for the next page comes back in the X-Next-Cursor header.
+    """
+    try:
+        user = get_user_from_request()
+        if not user or user['role'] not in ('teacher', 'admin'):
+            return jsonify({"error": "Only teachers and admins can list users"}), 403
+
+        conditions = []
+        params = []
+        for arg, column in USER_FILTERS.items():
+            value = request.args.get(arg)
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if user['role'] == 'teacher':
+            conditions.append("role = 'student'")
+
+        search = (request.args.get('q') or '').strip()
+        if search:
+            pattern = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            conditions.append("(email LIKE %s OR name LIKE %s)")
+            params.extend([pattern, pattern])
+
+        after = request.args.get('cursor', type=int)
+        if after is not None:
+            conditions.append("id > %s")
+            params.append(after)
+
+        page_size = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+
+        query = "SELECT id, name, email, role, student_class FROM users"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id LIMIT %s"
+        params.append(page_size + 1)
+
+        cursor = current_app.mysql.connection.cursor()
+        cursor.execute(query, tuple(params))
+        users = cursor.fetchall()
+        cursor.close()
+
+        has_more = len(users) > page_size
+        users = users[:page_size]
+
+        result = []
+        for u in users:
+            result.append({
+                "id": u[0],
+                "name": u[1],
+                "email": u[2],
+                "role": u[3],
+                "student_class": u[4]
+            })
+
+        response = jsonify(result)
+        if has_more:
+            response.headers['X-Next-Cursor'] = str(users[-1][0])
+        return response, 200
+    except Exception as e:
+        print("Error in list_users():", e)
+        return jsonify({"error": str(e)}), 500
+
+# ============================ Roster Import ============================
+
+@users_bp.route('/users/import', methods=['POST'])
+def import_users():
+    """Create accounts from a roster (CSV, NDJSON, JSON array or multipart 'file').
+
+    Columns: name, email, password, role (default student), class. ?class=
+    fills in a missing class; rows whose email is already registered are
+    skipped. Hashing runs inside the request, so rosters longer than
+    ROSTER_HTTP_MAX_ROWS are refused with 413; use `flask import-roster`.
+    """
+    user = get_user_from_request()
+    if not user or user['role'] != 'admin':
+        return jsonify({"error": "Only admins can import rosters"}), 403
+
+    rows = get_row_source()
+    if rows is None:
+        return jsonify({"error": "Send the roster as text/csv, application/x-ndjson, a JSON array or a multipart 'file'"}), 415
+
+    max_rows = current_app.config.get('ROSTER_HTTP_MAX_ROWS', 500)
+    try:
+        rows = list(islice(rows, max_rows + 1))
+    except (UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": f"Could not read the roster: {e}"}), 400
+    if len(rows) > max_rows:
+        return jsonify({
+            "error": f"Rosters over {max_rows} rows take too long to import over HTTP; "
+                     "run `flask --app app import-roster <file>` on the server instead"
+        }), 413
+
+    try:
+        report = import_roster(current_app.mysql.connection, rows, default_class=request.args.get('class'))
+    except HashingBusy:
+        # Rows already created are skipped on a retry
+        return jsonify({"error": "Server busy, please try again"}), 503, {'Retry-After': '5'}
+    except Exception as e:
+        print("Error in import_users():", e)
+        return jsonify({"error": str(e)}), 500
+
+    print(f"📥 Roster import finished: {report.inserted} created, {report.skipped} skipped, {report.failed} failed")
+    if report.inserted:
+        status = 201
+    else:
+        # Nothing new: fine for a re-run, an error when every row was rejected
+        status = 400 if report.failed else 200
+    return jsonify({"message": "Roster import processed", **report.to_dict()}), status
@@ -0,0 +1,85 @@
+"""Production launcher: gunicorn running the app with threaded (WSGI) or asyncio (ASGI) workers.
+
+    cd backend && python serve.py --mode asgi --workers 4
+    cd backend && python serve.py --mode threaded --workers 9 --threads 16
+
+threaded: gthread workers running create_app(); every in-flight request holds
+          one of the worker's --threads while it waits on MySQL.
+asgi:     uvicorn workers running asgi:app; /questions, /topics/<id>,
+          /subjects/<class> and /performance/summary wait on MySQL without
+          holding a thread, everything else runs on Flask as before.
+
+Defaults come from K12_SERVER_MODE, K12_WORKERS, K12_THREADS and K12_BIND.
+Arguments after -- are passed to gunicorn as they are.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules each mode needs on top of requirements.txt, and the packages providing them
+MODE_PACKAGES = {
+    'threaded': {'gunicorn': 'gunicorn'},
+    'asgi': {'gunicorn': 'gunicorn', 'uvicorn_worker': 'uvicorn-worker', 'aiomysql': 'aiomysql', 'a2wsgi': 'a2wsgi'}
+}
+
+
+def default_workers(mode):
+    cpus = os.cpu_count() or 1
+    # An event loop keeps a core busy on its own; threaded workers spend most of their time blocked
+    return cpus if mode == 'asgi' else 2 * cpus + 1
+
+
+def gunicorn_args(args):
+    command = [
+        sys.executable, "-m", "gunicorn",
+        "--bind", args.bind,
+        "--workers", str(args.workers or default_workers(args.mode)),
+        "--timeout", str(args.timeout),
+        "--graceful-timeout", "30",
+        "--keep-alive", "5",
+        # Room for many idle quiz-takers' connections while workers are busy
+        "--backlog", "2048"
+    ]
+    if args.access_log:
+        command += ["--access-logfile", "-"]
+    if args.mode == 'asgi':
+        command += ["--worker-class", "uvicorn_worker.UvicornWorker"]
+    else:
+        command += ["--worker-class", "gthread", "--threads", str(args.threads)]
+    return command + args.extra + ["asgi:app" if args.mode == 'asgi' else "app:create_app()"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=sorted(MODE_PACKAGES), default=os.environ.get('K12_SERVER_MODE', 'threaded'))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get('K12_WORKERS', '0')),
+                        help="worker processes (default: CPUs for asgi, 2 x CPUs + 1 for threaded)")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get('K12_THREADS', '16')),
+                        help="threads per worker in threaded mode")
+    parser.add_argument("--bind", default=os.environ.get('K12_BIND', '0.0.0.0:8000'))
+    parser.add_argument("--timeout", type=int, default=60, help="seconds before a stuck worker is restarted")
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument("--dry-run", action="store_true", help="print the gunicorn command instead of running it")
+    parser.add_argument("extra", nargs=argparse.REMAINDER, help="-- followed by extra gunicorn arguments")
+    args = parser.parse_args()
+    args.extra = args.extra[1:] if args.extra[:1] == ['--'] else args.extra
+
+    command = gunicorn_args(args)
+    if args.dry_run:
+        print(" ".join(command))
+        return
+
+    missing = [package for module, package in MODE_PACKAGES[args.mode].items() if importlib.util.find_spec(module) is None]
+    if missing:
+        sys.exit(f"❌ {args.mode} mode needs: pip install {' '.join(missing)}")
+
+    print(f"🚀 Serving in {args.mode} mode on {args.bind}")
+    os.chdir(BACKEND_DIR)
+    os.execv(sys.executable, command)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import bisect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+QUIZ_MODES = ('uniform', 'adaptive')
+
+# Answers scoring at least this count as correct (scores are 0 or 1 today)
+CORRECT_SCORE = 0.5
+# Seconds until a missed question is due again, and after a first correct
+# answer; every further correct answer doubles the latter, up to MAX_DOUBLINGS
+RETRY_INTERVAL = 600
+REVIEW_INTERVAL = 86400
+MAX_DOUBLINGS = 6
+# How far past due a question can get before its weight stops growing, and the
+# floor that keeps a just-answered question drawable in a small pack
+MAX_OVERDUE = 3.0
+MIN_DUE = 0.05
+# Draw attempts per requested question before topping the quiz up uniformly
+MAX_ATTEMPTS_PER_PICK = 20
+
+
+# ============================ Weights ============================
+
+def topic_factor(totals):
+    """1.5 for a topic never answered right, 0.5 for one always right, 1.0 if unseen"""
+    if not totals or not totals[0]:
+        return 1.0
+    return 1.5 - min(max(totals[1] / totals[0], 0.0), 1.0)
+
+
+def question_weight(stats, factor, now):
+    """Relative chance of repeating an answered question, in units of one unseen question.
+
+    A question is worth one unseen question when it falls due: RETRY_INTERVAL
+    after a miss, or a doubling review interval after a run of correct
+    answers. Questions missed more often weigh more.
+    """
+    attempts, misses, last_at, last_correct = stats
+    if last_correct:
+        interval = REVIEW_INTERVAL * 2 ** min(max(attempts - misses - 1, 0), MAX_DOUBLINGS)
+    else:
+        interval = RETRY_INTERVAL
+    due = min(max((now - last_at) / interval, MIN_DUE), MAX_OVERDUE)
+    return factor * due * (1 + misses / attempts)
+
+
+# ============================ Student Models ============================
+
+class StudentModel:
+    """What one student's answers say about each question and topic"""
+
+    __slots__ = ('questions', 'topics', 'loaded_at')
+
+    def __init__(self):
+        # question_id -> [attempts, misses, last answered (epoch seconds), last answer correct]
+        self.questions = {}
+        # (subject, topic) -> [attempts, summed score], as in performance_summary
+        self.topics = {}
+        self.loaded_at = time.monotonic()
+
+    def record(self, question_id, subject, topic, score, answered_at):
+        correct = score >= CORRECT_SCORE
+        stats = self.questions.get(question_id)
+        if stats is None:
+            stats = self.questions[question_id] = [0, 0, 0.0, True]
+        stats[0] += 1
+        if not correct:
+            stats[1] += 1
+        if answered_at >= stats[2]:
+            stats[2] = answered_at
+            stats[3] = correct
+        if subject and topic:
+            totals = self.topics.setdefault((subject, topic), [0, 0.0])
+            totals[0] += 1
+            totals[1] += score
+
+
+class StudentModelCache:
+    """Per-student answer history for adaptive quizzes, kept in memory.
+
+    A student's model is loaded with two grouped queries the first time they
+    ask for an adaptive quiz, then kept current by the response writer, which
+    calls record_responses() with every batch once it is committed. Models are reloaded
+    after `ttl` seconds so answers stored by other worker processes show up;
+    at most `max_students` are kept, least recently used first out.
+    """
+
+    def __init__(self, max_students=5000, ttl=600):
+        self.max_students = max_students
+        self.ttl = ttl
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.loads = 0
+        self.updates = 0
+
+    def configure(self, config):
+        self.max_students = int(config.get('ADAPTIVE_MAX_STUDENTS', 5000))
+        self.ttl = int(config.get('ADAPTIVE_TTL', 600))
+
+    @staticmethod
+    def _load(cursor, student_id):
+        model = StudentModel()
+        cursor.execute("""
+            SELECT question_id, COUNT(*), SUM(score < %s), UNIX_TIMESTAMP(MAX(answered_at)),
+                   SUBSTRING_INDEX(GROUP_CONCAT(score >= %s ORDER BY answered_at DESC, id DESC), ',', 1)
+            FROM quiz_responses
+            WHERE student_id = %s AND score IS NOT NULL
+            GROUP BY question_id
+        """, (CORRECT_SCORE, CORRECT_SCORE, student_id))
+        for question_id, attempts, misses, last_at, last_correct in cursor.fetchall():
+            model.questions[question_id] = [int(attempts), int(misses or 0), float(last_at or 0), last_correct == '1']
+
+        cursor.execute("""
+            SELECT subject_name, topic_name, attempts, correct_count
+            FROM performance_summary
+            WHERE student_id = %s
+        """, (student_id,))
+        for subject, topic, attempts, correct in cursor.fetchall():
+            model.topics[(subject, topic)] = [int(attempts or 0), float(correct or 0)]
+        return model
+
+    def peek(self, student_id):
+        """Like snapshot(), but None instead of querying when the model isn't in memory"""
+        with self._lock:
+            model = self._models.get(student_id)
+            if model is None or time.monotonic() - model.loaded_at >= self.ttl:
+                return None
+            self._models.move_to_end(student_id)
+            self.hits += 1
+            return self._copy(model)
+
+    def snapshot(self, cursor, student_id):
+        """(question stats, topic totals) copies for one student, loading the model if needed"""
+        cached = self.peek(student_id)
+        if cached is not None:
+            return cached
+
+        model = self._load(cursor, student_id)
+        self.loads += 1
+        with self._lock:
+            self._models[student_id] = model
+            self._models.move_to_end(student_id)
+            while len(self._models) > self.max_students:
+                self._models.popitem(last=False)
+            return self._copy(model)
+
+    @staticmethod
+    def _copy(model):
+        return [(question_id, tuple(stats)) for question_id, stats in model.questions.items()], dict(model.topics)
+
+    def record_responses(self, responses, now=None, committed_at=None):
+        """Fold committed answers into the models already in memory; others load fresh later.
+
+        Models loaded after `committed_at` (time.monotonic() of the commit,
+        default now) already read these answers from the table and are skipped.
+        """
+        now = time.time() if now is None else now
+        committed_at = time.monotonic() if committed_at is None else committed_at
+        with self._lock:
+            for r in responses:
+                model = self._models.get(r['student_id'])
+                if model is None or r['score'] is None or model.loaded_at >= committed_at:
+                    continue
+                model.record(r['question_id'], r['subject'], r['topic'], r['score'], now)
+                self.updates += 1
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        with self._lock:
+            students = len(self._models)
+        return {
+            "students": students,
+            "max_students": self.max_students,
+            "hits": self.hits,
+            "loads": self.loads,
+            "updates": self.updates
+        }
+
+
+student_models = StudentModelCache()
+
+
+def update_student_models(responses):
+    """After-commit response writer listener: keep cached student models in step with new answers"""
+    student_models.record_responses(responses)
+
+
+# ============================ Selection ============================
+
+def adaptive_selector(question_stats, topic_totals, now=None):
+    """Selector for QuizPackCache.draw() that favours what this student needs to practise.
+
+    Every answered question in the pack is one weighted entry; the unseen
+    questions of each (subject, topic) share one entry weighted by their
+    count, so the table grows with the student's history, not the pack.
+    Picks are binary searches into the cumulative weights, repeats are
+    redrawn, and an unseen pick takes a random member of its topic.
+    """
+    now = time.time() if now is None else now
+
+    def select(pack, k, rng):
+        factors = {}
+        answered = {}
+        entries = []
+        weights = []
+        for question_id, stats in question_stats:
+            group = pack.group_of.get(question_id)
+            if group is None:
+                continue
+            if group not in factors:
+                factors[group] = topic_factor(topic_totals.get(group))
+            answered[group] = answered.get(group, 0) + 1
+            entries.append(question_id)
+            weights.append(question_weight(stats, factors[group], now))
+
+        seen = set(entries)
+        for group, members in pack.groups.items():
+            unseen = len(members) - answered.get(group, 0)
+            if unseen > 0:
+                entries.append(group)
+                weights.append(topic_factor(topic_totals.get(group)) * unseen)
+
+        want = min(k, len(pack.ids))
+        chosen = []
+        taken = set()
+        if entries:
+            cumulative = list(itertools.accumulate(weights))
+            total = cumulative[-1]
+            for _ in range(want * MAX_ATTEMPTS_PER_PICK):
+                if len(chosen) >= want:
+                    break
+                entry = entries[min(bisect.bisect_right(cumulative, rng.random() * total), len(entries) - 1)]
+                if isinstance(entry, tuple):
+                    members = pack.groups[entry]
+                    entry = members[rng.randrange(len(members))]
+                    if entry in seen:
+                        continue
+                if entry not in taken:
+                    taken.add(entry)
+                    chosen.append(entry)
+
+        if len(chosen) < want:
+            # Tiny or nearly exhausted packs: top up uniformly
+            rest = [question_id for question_id in pack.ids if question_id not in taken]
+            chosen.extend(rng.sample(rest, want - len(chosen)))
+        return chosen
+
+    return select
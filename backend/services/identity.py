@@ -0,0 +1,160 @@
+from flask import g, request, current_app, jsonify
+import logging
+import threading
+from functools import wraps
+import time
+from collections import OrderedDict
+from services.tokens import verify_access_token
+
+logger = logging.getLogger(__name__)
+
+# Returned by UserCache.get() when nothing is cached, since None is a valid
+# cached value (the id does not belong to any user)
+MISSING = object()
+
+
+class UserCache:
+    """Bounded LRU cache of user rows with a time-to-live per entry"""
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return MISSING
+            stored_at, user = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[user_id]
+                return MISSING
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+USER_BY_ID_SQL = "SELECT id, name, email, role, student_class FROM users WHERE id = %s"
+
+
+def user_from_row(user):
+    if not user:
+        return None
+    return {
+        'id': user[0],
+        'name': user[1],
+        'email': user[2],
+        'role': user[3],
+        'student_class': user[4]
+    }
+
+
+def load_user(user_id):
+    cursor = current_app.mysql.connection.cursor()
+    cursor.execute(USER_BY_ID_SQL, (user_id,))
+    user = cursor.fetchone()
+    cursor.close()
+    return user_from_row(user)
+
+
+def get_user_from_request():
+    """Resolve the calling user once per request.
+
+    A request with an Authorization header is only ever resolved from its
+    bearer token, with no database lookup; a bad or expired token gives None
+    (and a 401 from reject_invalid_bearer_token). Old clients that send only
+    X-User-ID go through the shared user cache while ALLOW_LEGACY_USER_HEADER
+    is on. Either way the result is kept on flask.g for the rest of the request.
+    """
+    if 'current_user' in g:
+        return g.current_user
+
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header:
+        user = None
+        if auth_header.startswith('Bearer '):
+            user = verify_access_token(auth_header[len('Bearer '):].strip())
+        g.current_user = user
+        return user
+
+    user = None
+    if current_app.config.get('ALLOW_LEGACY_USER_HEADER', False):
+        try:
+            user_id = int(request.headers.get('X-User-ID', ''))
+        except ValueError:
+            user_id = None
+
+        if user_id is not None:
+            user = user_cache.get(user_id)
+            if user is MISSING:
+                user = load_user(user_id)
+                user_cache.set(user_id, user)
+
+    g.current_user = user
+    return user
+
+
+def warn_on_legacy_user_header(config):
+    """Log at startup when a deployment trusts unsigned X-User-ID headers; True if it does"""
+    if not config.get('ALLOW_LEGACY_USER_HEADER', False) or config.get('ENV') == 'development':
+        return False
+    logger.warning(
+        "K12_ALLOW_LEGACY_USER_HEADER is on in %r: any client can act as any user by sending "
+        "X-User-ID without an Authorization header. Turn it off once old clients are gone.",
+        config.get('ENV')
+    )
+    return True
+
+
+def reject_invalid_bearer_token():
+    """before_request hook: answer 401 to a bad or expired token so the client refreshes it"""
+    if request.headers.get('Authorization') and get_user_from_request() is None:
+        return jsonify({'error': 'Invalid or expired token'}), 401
+    return None
+
+
+def invalidate_user(user_id):
+    """Forget a cached user after their row changes"""
+    user_cache.invalidate(int(user_id))
+
+
+def require_student_class_access(f):
+    """Decorator to ensure students can only access their own class data"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        requested_class = request.args.get('class')
+        if not requested_class:
+            # GETs carry no JSON body; request.json would answer them with a 415
+            data = request.get_json(silent=True)
+            requested_class = data.get('class_name') if isinstance(data, dict) else None
+        user = get_user_from_request()
+        
+        # Skip check for non-students or if no class specified
+        if not user or user['role'] != 'student' or not requested_class:
+            return f(*args, **kwargs)
+            
+        # For students, check if they're trying to access their own class
+        if user['student_class'] != requested_class:
+            return jsonify({"error": "Access denied: You can only access content for your enrolled class"}), 403
+            
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import re
+import threading
+import bcrypt
+
+# bcrypt work factor for new hashes; 12 is the flask-bcrypt default
+BCRYPT_LOG_ROUNDS = 12
+
+BCRYPT_COST_RE = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated and the wait timed out"""
+
+
+# ============================ Pool Workers ============================
+# These run inside the worker processes, so they must stay importable
+# module-level functions that take and return plain values.
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(hashed_password, password):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+# ============================ Hashing Pool ============================
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so request threads never burn CPU on it"""
+
+    def __init__(self, workers=0, max_pending=0, rounds=BCRYPT_LOG_ROUNDS, queue_timeout=5.0):
+        # 0 workers means one per core; 0 max_pending means 8 jobs per worker
+        self.workers = workers or os.cpu_count() or 2
+        self.rounds = rounds
+        self.max_pending = max_pending or self.workers * 8
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def configure(self, config):
+        """Take the hashing settings from the app config; the pool itself starts on first use"""
+        with self._lock:
+            self.rounds = int(config.get('BCRYPT_LOG_ROUNDS', BCRYPT_LOG_ROUNDS))
+            self.queue_timeout = float(config.get('HASH_QUEUE_TIMEOUT', 5))
+            if self._executor is not None:
+                # Already hashing: the pool size and queue stay as they were started
+                return
+            self.workers = int(config.get('HASH_WORKERS', 0)) or os.cpu_count() or 2
+            self.max_pending = int(config.get('HASH_MAX_PENDING', 0)) or self.workers * 8
+            self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _get_executor(self):
+        # Created lazily so importing this module starts no processes. By then
+        # the worker is multi-threaded, and a plain fork could copy a lock some
+        # other thread holds, so the hashing processes come from a forkserver
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('forkserver')
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._stats_lock:
+                self.rejected += 1
+            raise HashingBusy("Password hashing queue is full")
+
+        with self._stats_lock:
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            with self._stats_lock:
+                self.pending -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def hash_password(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def check_password(self, hashed_password, password):
+        return self._run(_check, hashed_password, password)
+
+    def hash_many(self, passwords):
+        """Hash a batch in parallel across the pool, keeping input order.
+
+        Every password takes one of the shared slots, like a sign-in does, and
+        a batch keeps at most one job per worker in flight, so a roster import
+        leaves the rest of the queue to sign-ins.
+        """
+        executor = self._get_executor()
+        window = threading.BoundedSemaphore(max(1, min(self.workers, self.max_pending // 2)))
+
+        def done(future):
+            with self._stats_lock:
+                self.pending -= 1
+                self.completed += 1
+            self._slots.release()
+            window.release()
+
+        futures = []
+        for password in passwords:
+            window.acquire()
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                window.release()
+                with self._stats_lock:
+                    self.rejected += 1
+                raise HashingBusy("Password hashing queue is full")
+            with self._stats_lock:
+                self.pending += 1
+                self.peak_pending = max(self.peak_pending, self.pending)
+            try:
+                future = executor.submit(_hash, password, self.rounds)
+            except Exception:
+                # e.g. a broken pool: nothing will call done(), so give the slots back here
+                with self._stats_lock:
+                    self.pending -= 1
+                self._slots.release()
+                window.release()
+                raise
+            future.add_done_callback(done)
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def needs_rehash(self, hashed_password):
+        """True when a stored hash was made with a different work factor"""
+        match = BCRYPT_COST_RE.match(hashed_password or '')
+        return match is not None and int(match.group(1)) != self.rounds
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,105 @@
+# Running per-(student, subject, topic) aggregates behind performance_summary.
+# Each scored batch of quiz responses is folded in with one multi-row upsert,
+# so an update costs O(1) per touched topic no matter how long the history is.
+import logging
+
+logger = logging.getLogger(__name__)
+
+UPSERT_AGGREGATE_SQL = """
+    INSERT INTO performance_summary
+        (student_id, class_name, subject_name, topic_name, attempts, correct_count, time_spent_seconds, accuracy)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        attempts = attempts + VALUES(attempts),
+        correct_count = correct_count + VALUES(correct_count),
+        time_spent_seconds = time_spent_seconds + VALUES(time_spent_seconds),
+        accuracy = ROUND(100 * correct_count / attempts, 2),
+        class_name = VALUES(class_name),
+        last_attempt_at = CURRENT_TIMESTAMP
+"""
+
+# Recomputes aggregates for a range of students straight from quiz_responses
+REBUILD_AGGREGATES_SQL = """
+    INSERT INTO performance_summary
+        (student_id, class_name, subject_name, topic_name, attempts, correct_count, time_spent_seconds, accuracy, last_attempt_at)
+    SELECT r.student_id, MAX(q.class_name), q.subject, q.topic,
+           COUNT(*), SUM(r.score), COALESCE(SUM(r.time_spent), 0),
+           ROUND(100 * SUM(r.score) / COUNT(*), 2), MAX(r.answered_at)
+    FROM quiz_responses r
+    JOIN questions q ON q.id = r.question_id
+    WHERE r.student_id BETWEEN %s AND %s
+      AND r.score IS NOT NULL AND q.subject IS NOT NULL AND q.topic IS NOT NULL
+    GROUP BY r.student_id, q.subject, q.topic
+    ON DUPLICATE KEY UPDATE
+        attempts = VALUES(attempts),
+        correct_count = VALUES(correct_count),
+        time_spent_seconds = VALUES(time_spent_seconds),
+        accuracy = VALUES(accuracy),
+        class_name = VALUES(class_name),
+        last_attempt_at = VALUES(last_attempt_at)
+"""
+
+# Aggregates the rebuild writes for a range of students. The upsert's rowcount
+# can't tell this: MySQL reports 2 per updated row and 0 per unchanged one
+COUNT_REBUILT_SQL = """
+    SELECT COUNT(*) FROM (
+        SELECT 1
+        FROM quiz_responses r
+        JOIN questions q ON q.id = r.question_id
+        WHERE r.student_id BETWEEN %s AND %s
+          AND r.score IS NOT NULL AND q.subject IS NOT NULL AND q.topic IS NOT NULL
+        GROUP BY r.student_id, q.subject, q.topic
+    ) rebuilt
+"""
+
+# Students per rebuild transaction
+REBUILD_CHUNK_SIZE = 1000
+
+
+def seconds(value):
+    """time_spent as whole non-negative seconds; anything unparseable counts as 0"""
+    try:
+        return max(int(float(value or 0)), 0)
+    except (TypeError, ValueError, OverflowError):
+        logger.warning("Ignoring unparseable time_spent %r", value)
+        return 0
+
+
+def fold_responses(cursor, responses):
+    """Response writer listener: add a scored batch to the running aggregates"""
+    totals = {}
+    for r in responses:
+        if r['score'] is None or not r['subject'] or not r['topic']:
+            continue
+        key = (r['student_id'], r['subject'], r['topic'])
+        entry = totals.setdefault(key, {'class_name': r['class_name'], 'attempts': 0, 'correct': 0.0, 'time_spent': 0})
+        entry['attempts'] += 1
+        entry['correct'] += r['score']
+        entry['time_spent'] += seconds(r.get('time_spent'))
+
+    rows = [
+        (student_id, entry['class_name'], subject, topic, entry['attempts'], entry['correct'],
+         entry['time_spent'], round(100 * entry['correct'] / entry['attempts'], 2))
+        for (student_id, subject, topic), entry in totals.items()
+    ]
+    if rows:
+        cursor.executemany(UPSERT_AGGREGATE_SQL, rows)
+
+
+def rebuild_performance_summary(connection, chunk_size=REBUILD_CHUNK_SIZE):
+    """Regenerate every aggregate from quiz_responses, one student range per transaction"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT MIN(student_id), MAX(student_id) FROM quiz_responses")
+    low, high = cursor.fetchone()
+    if low is None:
+        cursor.close()
+        return 0
+
+    rows = 0
+    for start in range(low, high + 1, chunk_size):
+        cursor.execute(REBUILD_AGGREGATES_SQL, (start, start + chunk_size - 1))
+        cursor.execute(COUNT_REBUILT_SQL, (start, start + chunk_size - 1))
+        rows += cursor.fetchone()[0]
+        connection.commit()
+    cursor.close()
+    return rows
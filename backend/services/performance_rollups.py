@@ -0,0 +1,157 @@
+import threading
+import time
+
+# Accuracy histogram bucket width in percentage points; percentiles are
+# interpolated inside a bucket, so they are accurate to well under this
+HISTOGRAM_BUCKET = 5
+PERCENTILES = (25, 50, 75, 90)
+WEAKEST_TOPICS_LIMIT = 5
+
+
+class RollupCache:
+    """Caches computed rollups per (class, subject, topic) scope.
+
+    Answers committed in this process make the rollups of their classes
+    stale. Under a steady stream of answers a scope is still recomputed at
+    most once per `refresh_after` seconds, and scopes spanning every class
+    rely on the TTL alone, which also covers writes from other worker
+    processes. invalidate() without classes (e.g. after a rebuild) drops
+    everything at once.
+    """
+
+    def __init__(self, ttl=60, refresh_after=5, max_entries=1024):
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.max_entries = max_entries
+        self._version = 0
+        self._class_versions = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def version(self, scope):
+        """Take this before computing a scope and pass it to set(), so a write
+        committed meanwhile leaves the result stale rather than cached as new"""
+        with self._lock:
+            return self._version, self._class_versions.get(scope[0], 0)
+
+    def get(self, scope):
+        with self._lock:
+            entry = self._entries.get(scope)
+            if entry is None:
+                return None
+            version, stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age >= self.ttl or version[0] != self._version:
+                return None
+            if version[1] == self._class_versions.get(scope[0], 0) or age < self.refresh_after:
+                return value
+        return None
+
+    def set(self, scope, value, version):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[scope] = (version, time.monotonic(), value)
+
+    def invalidate(self, class_names=None):
+        with self._lock:
+            if class_names is None:
+                self._version += 1
+                return
+            for class_name in class_names:
+                self._class_versions[class_name] = self._class_versions.get(class_name, 0) + 1
+
+
+rollup_cache = RollupCache()
+
+
+def scope_conditions(class_name=None, subject=None, topic=None):
+    conditions = []
+    params = []
+    for column, value in (('class_name', class_name), ('subject_name', subject), ('topic_name', topic)):
+        if value:
+            conditions.append(f"{column} = %s")
+            params.append(value)
+    where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+    return where, params
+
+
+def percentiles_from_histogram(buckets, total):
+    """Interpolate percentiles from [(bucket_index, count)] sorted by bucket"""
+    result = {}
+    for p in PERCENTILES:
+        target = total * p / 100
+        seen = 0
+        value = None
+        for bucket, count in buckets:
+            if seen + count >= target:
+                fraction = (target - seen) / count if count else 0
+                value = min(100.0, (bucket + fraction) * HISTOGRAM_BUCKET)
+                break
+            seen += count
+        result[f"p{p}"] = round(value, 2) if value is not None else None
+    return result
+
+
+def compute_rollups(cursor, class_name=None, subject=None, topic=None):
+    """Class-level rollups computed by MySQL over the pre-aggregated summary rows"""
+    where, params = scope_conditions(class_name, subject, topic)
+
+    cursor.execute(f"""
+        SELECT COUNT(*), COUNT(DISTINCT student_id), AVG(accuracy),
+               SUM(correct_count), SUM(attempts), SUM(time_spent_seconds)
+        FROM performance_summary{where}
+    """, tuple(params))
+    rows, students, average, correct, attempts, time_spent = cursor.fetchone()
+
+    cursor.execute(f"""
+        SELECT LEAST(FLOOR(accuracy / {HISTOGRAM_BUCKET}), {100 // HISTOGRAM_BUCKET - 1}) AS bucket, COUNT(*)
+        FROM performance_summary{where}{" AND" if where else " WHERE"} accuracy IS NOT NULL
+        GROUP BY bucket
+        ORDER BY bucket
+    """, tuple(params))
+    buckets = [(int(bucket), count) for bucket, count in cursor.fetchall()]
+
+    cursor.execute(f"""
+        SELECT subject_name, topic_name, AVG(accuracy) AS average, COUNT(*) AS students
+        FROM performance_summary{where}
+        GROUP BY subject_name, topic_name
+        ORDER BY average ASC
+        LIMIT {WEAKEST_TOPICS_LIMIT}
+    """, tuple(params))
+    weakest = [
+        {
+            "subject_name": s,
+            "topic_name": t,
+            "average_accuracy": round(float(a), 2) if a is not None else None,
+            "students": n
+        }
+        for s, t, a, n in cursor.fetchall()
+    ]
+
+    return {
+        "scope": {"class": class_name, "subject": subject, "topic": topic},
+        "rows": rows,
+        "students": students,
+        "average_accuracy": round(float(average), 2) if average is not None else None,
+        "weighted_accuracy": round(100 * float(correct) / float(attempts), 2) if attempts else None,
+        "total_attempts": int(attempts or 0),
+        "total_time_spent": int(time_spent or 0),
+        "percentiles": percentiles_from_histogram(buckets, sum(count for _, count in buckets)),
+        "weakest_topics": weakest
+    }
+
+
+def get_rollups(cursor, class_name=None, subject=None, topic=None):
+    scope = (class_name, subject, topic)
+    cached = rollup_cache.get(scope)
+    if cached is None:
+        version = rollup_cache.version(scope)
+        cached = compute_rollups(cursor, class_name, subject, topic)
+        rollup_cache.set(scope, cached, version)
+    return cached
+
+
+def invalidate_rollups(responses):
+    """After-commit response writer listener: the batch's classes have new aggregates"""
+    rollup_cache.invalidate({r['class_name'] for r in responses if r.get('class_name')})
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+
+# Legacy progress entries carry these fields (see TeacherStudentProgress.tsx)
+PROGRESS_FIELDS = ('student_id', 'student_name', 'class', 'subject', 'topic', 'accuracy', 'time_spent')
+
+IMPORT_PROGRESS_SQL = """
+    INSERT INTO performance_summary
+        (student_id, class_name, subject_name, topic_name, attempts, correct_count, time_spent_seconds, accuracy)
+    VALUES (%s, %s, %s, %s, 0, 0, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        class_name = COALESCE(class_name, VALUES(class_name)),
+        accuracy = IF(attempts = 0, VALUES(accuracy), accuracy),
+        time_spent_seconds = IF(attempts = 0, VALUES(time_spent_seconds), time_spent_seconds)
+"""
+
+# Rows per import transaction
+IMPORT_BATCH_SIZE = 1000
+
+
+def _key(value):
+    return None if value is None else str(value)
+
+
+class ProgressFileCache:
+    """Parsed copy of the legacy progress.txt, re-read only when the file changes.
+
+    Each lookup stats the file; the JSON is parsed again only when its mtime
+    or size differ from the cached copy, so dashboard polling costs one
+    stat() instead of a full json.load. Entries are indexed by student and
+    by class so filtered reads don't scan the whole list.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._signature = None
+        self._entries = []
+        self._by_student = {}
+        self._by_class = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _load(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            with self._lock:
+                self._signature = None
+                self._entries, self._by_student, self._by_class = [], {}, {}
+            return
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature == self._signature:
+                return
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+            entries = [e for e in (data if isinstance(data, list) else []) if isinstance(e, dict)]
+            by_student = {}
+            by_class = {}
+            for position, entry in enumerate(entries):
+                by_student.setdefault(_key(entry.get('student_id')), []).append(position)
+                by_class.setdefault(_key(entry.get('class')), []).append(position)
+
+            self._entries, self._by_student, self._by_class = entries, by_student, by_class
+            self._signature = signature
+            self.loads += 1
+
+    def query(self, student_id=None, class_name=None, subject=None, topic=None, after=None, limit=None):
+        """Return (entries, next_position) for the filters, starting after position `after`"""
+        self._load()
+        with self._lock:
+            entries = self._entries
+            if student_id is not None:
+                positions = self._by_student.get(_key(student_id), [])
+                if class_name is not None:
+                    positions = [p for p in positions if _key(entries[p].get('class')) == _key(class_name)]
+            elif class_name is not None:
+                positions = self._by_class.get(_key(class_name), [])
+            else:
+                positions = range(len(entries))
+
+        page = []
+        next_position = None
+        for position in positions:
+            if after is not None and position <= after:
+                continue
+            entry = entries[position]
+            if subject is not None and _key(entry.get('subject')) != _key(subject):
+                continue
+            if topic is not None and _key(entry.get('topic')) != _key(topic):
+                continue
+            if limit is not None and len(page) == limit:
+                next_position = last
+                break
+            page.append(entry)
+            last = position
+        return page, next_position
+
+    def all_entries(self):
+        self._load()
+        with self._lock:
+            return list(self._entries)
+
+
+def import_progress_entries(connection, entries):
+    """Copy legacy progress entries into performance_summary; live aggregates win"""
+    rows = []
+    for entry in entries:
+        if entry.get('student_id') is None or not entry.get('subject') or not entry.get('topic'):
+            continue
+        rows.append((
+            int(entry['student_id']),
+            _key(entry.get('class')),
+            str(entry['subject']),
+            str(entry['topic']),
+            int(float(entry.get('time_spent') or 0)),
+            float(entry.get('accuracy') or 0)
+        ))
+
+    cursor = connection.cursor()
+    try:
+        for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+            cursor.executemany(IMPORT_PROGRESS_SQL, rows[start:start + IMPORT_BATCH_SIZE])
+            connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_progress_cache(path):
+    """One shared cache per progress file path"""
+    path = os.path.abspath(path)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ProgressFileCache(path)
+        return _caches[path]
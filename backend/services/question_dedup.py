@@ -0,0 +1,315 @@
+from flask import current_app, jsonify
+import hashlib
+import random
+import re
+import zlib
+from array import array
+from db.pool import InstrumentedSSCursor
+
+# MinHash signature length, split into BANDS bands of ROWS values for LSH.
+# Two questions share a band bucket with probability s^ROWS per band, so with
+# 8 x 8 the detection curve turns up around s = (1/8)^(1/8) ~ 0.77.
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+# Character shingles work the same for English and Hindi
+SHINGLE_SIZE = 5
+# Estimated Jaccard similarity at or above which two questions count as duplicates
+DEFAULT_THRESHOLD = 0.8
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures stored in question_signatures must stay comparable
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_NON_WORD_RE = re.compile(r'[\W_]+')
+_NUMBER_RE = re.compile(r'\d+')
+
+
+# ============================ Signatures ============================
+
+def normalize_text(text):
+    """Casefold and reduce punctuation/whitespace runs to one space"""
+    return _NON_WORD_RE.sub(' ', str(text or '').casefold()).strip()
+
+
+def number_tokens(text):
+    """The numbers in a question, in order. "What is 12 x 13?" and "What is 12 x 14?"
+    are one shingle apart but different questions, so duplicates must agree on these.
+    """
+    return tuple(int(n) for n in _NUMBER_RE.findall(normalize_text(text)))
+
+
+def dedup_item(key, class_name, text):
+    """(key, class_name, signature, numbers) as find_duplicates() takes them"""
+    return (key, class_name, minhash(text), number_tokens(text))
+
+
+def shingles(text):
+    normalized = normalize_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """NUM_PERM-value MinHash signature of the question text, or None for empty text"""
+    hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text)]
+    if not hashes:
+        return None
+    return array('I', (min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in _PERMUTATIONS))
+
+
+def signature_bytes(signature):
+    return signature.tobytes()
+
+
+def signature_from_bytes(raw):
+    signature = array('I')
+    signature.frombytes(bytes(raw))
+    return signature
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the two questions' shingle sets"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def band_keys(class_name, signature):
+    """(band, bucket) pairs for LSH. Buckets include the class, so lookups stay within one class"""
+    prefix = str(class_name or '').encode('utf-8') + b'\x00'
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(prefix + chunk, digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return keys
+
+
+# ============================ Index Lookups ============================
+
+def find_duplicates(cursor, items, threshold=DEFAULT_THRESHOLD):
+    """Near-duplicates already in the bank for a batch of new questions.
+
+    `items` come from dedup_item(). Returns {key: [(question_id,
+    similarity), ...]} best first, for the keys that have any. All band
+    lookups go to the question_lsh_buckets primary key in one query.
+    """
+    wanted = {}
+    for key, class_name, signature, numbers in items:
+        if signature is None:
+            continue
+        for band_key in band_keys(class_name, signature):
+            wanted.setdefault(band_key, []).append((key, signature, numbers))
+    if not wanted:
+        return {}
+
+    placeholders = ", ".join(["(%s, %s)"] * len(wanted))
+    params = [value for band_key in wanted for value in band_key]
+    cursor.execute(f"""
+        SELECT b.band, b.bucket, b.question_id, s.signature, q.question
+        FROM question_lsh_buckets b
+        JOIN question_signatures s ON s.question_id = b.question_id
+        JOIN questions q ON q.id = b.question_id
+        WHERE (b.band, b.bucket) IN ({placeholders})
+    """, tuple(params))
+
+    matches = {}
+    for band, bucket, question_id, raw, text in cursor.fetchall():
+        candidate = signature_from_bytes(raw)
+        candidate_numbers = number_tokens(text)
+        for key, signature, numbers in wanted.get((band, bucket), ()):
+            score = similarity(signature, candidate)
+            if score >= threshold and numbers == candidate_numbers:
+                matches.setdefault(key, {})[question_id] = score
+    return {
+        key: sorted(found.items(), key=lambda item: (-item[1], item[0]))
+        for key, found in matches.items()
+    }
+
+
+def find_duplicates_within(items, threshold=DEFAULT_THRESHOLD):
+    """Keys in a batch that repeat an earlier item of the same batch: {key: earlier_key}"""
+    buckets = {}
+    repeats = {}
+    for key, class_name, signature, numbers in items:
+        if signature is None:
+            continue
+        keys = band_keys(class_name, signature)
+        for band_key in keys:
+            for earlier_key, earlier, earlier_numbers in buckets.get(band_key, ()):
+                if key not in repeats and numbers == earlier_numbers and similarity(signature, earlier) >= threshold:
+                    repeats[key] = earlier_key
+        if key not in repeats:
+            for band_key in keys:
+                buckets.setdefault(band_key, []).append((key, signature, numbers))
+    return repeats
+
+
+# ============================ Index Maintenance ============================
+
+def index_questions(cursor, rows):
+    """(Re)index (question_id, class_name, question) rows; runs inside the caller's transaction"""
+    entries = [(question_id, class_name, minhash(text)) for question_id, class_name, text in rows]
+    if not entries:
+        return 0
+    ids = [question_id for question_id, _, _ in entries]
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"DELETE FROM question_lsh_buckets WHERE question_id IN ({placeholders})", tuple(ids))
+    cursor.execute(f"DELETE FROM question_signatures WHERE question_id IN ({placeholders})", tuple(ids))
+
+    entries = [entry for entry in entries if entry[2] is not None]
+    if entries:
+        cursor.executemany(
+            "INSERT INTO question_signatures (question_id, signature) VALUES (%s, %s)",
+            [(question_id, signature_bytes(signature)) for question_id, _, signature in entries]
+        )
+        cursor.executemany(
+            "INSERT IGNORE INTO question_lsh_buckets (band, bucket, question_id) VALUES (%s, %s, %s)",
+            [(band, bucket, question_id)
+             for question_id, class_name, signature in entries
+             for band, bucket in band_keys(class_name, signature)]
+        )
+    return len(entries)
+
+
+def duplicate_summary(matches, limit=5):
+    return [{"question_id": question_id, "similarity": round(score, 3)} for question_id, score in matches[:limit]]
+
+
+def near_duplicate_response(cursor, class_name, text, allow=False):
+    """409 naming existing near-duplicates of a question about to be inserted, or None.
+
+    Clients that really mean to add a look-alike send allow_duplicate.
+    """
+    if allow:
+        return None
+    threshold = current_app.config.get('DUPLICATE_THRESHOLD', DEFAULT_THRESHOLD)
+    matches = find_duplicates(cursor, [dedup_item(0, class_name, text)], threshold).get(0)
+    if not matches:
+        return None
+    return jsonify({
+        "message": "A near-duplicate of this question already exists",
+        "duplicates": duplicate_summary(matches)
+    }), 409
+
+
+# ============================ Offline Clustering ============================
+
+INDEX_BATCH_SIZE = 1000
+
+
+def _find(parent, x):
+    while parent.get(x, x) != x:
+        parent[x] = parent.get(parent[x], parent[x])
+        x = parent[x]
+    return x
+
+
+def cluster_duplicates(read_connection, write_connection, threshold=DEFAULT_THRESHOLD, reindex=False):
+    """Index the whole bank and rebuild question_duplicates; returns counts for the CLI.
+
+    Reads stream through a server-side cursor on `read_connection` while
+    writes go through `write_connection`, so memory holds one batch plus
+    the candidates that share an LSH bucket, never the whole table.
+    """
+    writer = write_connection.cursor()
+    try:
+        if reindex:
+            writer.execute("DELETE FROM question_lsh_buckets")
+            writer.execute("DELETE FROM question_signatures")
+            write_connection.commit()
+
+        # ---- 1. signatures for every question not indexed yet
+        indexed = 0
+        reader = read_connection.cursor(InstrumentedSSCursor)
+        try:
+            reader.execute("""
+                SELECT q.id, q.class_name, q.question
+                FROM questions q
+                LEFT JOIN question_signatures s ON s.question_id = q.id
+                WHERE s.question_id IS NULL
+                ORDER BY q.id
+            """)
+            while True:
+                rows = reader.fetchmany(INDEX_BATCH_SIZE)
+                if not rows:
+                    break
+                indexed += index_questions(writer, rows)
+                write_connection.commit()
+        finally:
+            reader.close()
+
+        # ---- 2. buckets holding more than one question are the only candidates
+        groups = []
+        reader = read_connection.cursor(InstrumentedSSCursor)
+        try:
+            reader.execute("SELECT band, bucket, question_id FROM question_lsh_buckets ORDER BY band, bucket")
+            current_key, members = None, []
+            for band, bucket, question_id in iter(reader.fetchone, None):
+                if (band, bucket) != current_key:
+                    if len(members) > 1:
+                        groups.append(members)
+                    current_key, members = (band, bucket), []
+                members.append(question_id)
+            if len(members) > 1:
+                groups.append(members)
+        finally:
+            reader.close()
+
+        candidate_ids = sorted({question_id for members in groups for question_id in members})
+        signatures = {}
+        numbers = {}
+        for start in range(0, len(candidate_ids), INDEX_BATCH_SIZE):
+            chunk = candidate_ids[start:start + INDEX_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            writer.execute(f"""
+                SELECT s.question_id, s.signature, q.question
+                FROM question_signatures s
+                JOIN questions q ON q.id = s.question_id
+                WHERE s.question_id IN ({placeholders})
+            """, tuple(chunk))
+            for question_id, raw, text in writer.fetchall():
+                signatures[question_id] = signature_from_bytes(raw)
+                numbers[question_id] = number_tokens(text)
+
+        # ---- 3. verify candidates against the signatures and union the matches
+        parent = {}
+        for members in groups:
+            representatives = []
+            for question_id in members:
+                signature = signatures.get(question_id)
+                if signature is None:
+                    continue
+                for rep in representatives:
+                    if numbers[question_id] == numbers[rep] and similarity(signature, signatures[rep]) >= threshold:
+                        parent[_find(parent, question_id)] = _find(parent, rep)
+                        break
+                else:
+                    representatives.append(question_id)
+
+        clusters = {}
+        for question_id in parent:
+            clusters.setdefault(_find(parent, question_id), set()).add(question_id)
+        for root in list(clusters):
+            clusters[root].add(root)
+            if len(clusters[root]) < 2:
+                del clusters[root]
+
+        # ---- 4. replace the report table; each cluster is named after its oldest question
+        rows = []
+        for members in clusters.values():
+            cluster_id = min(members)
+            for question_id in sorted(members):
+                rows.append((question_id, cluster_id, round(similarity(signatures[question_id], signatures[cluster_id]), 3)))
+        writer.execute("DELETE FROM question_duplicates")
+        for start in range(0, len(rows), INDEX_BATCH_SIZE):
+            writer.executemany(
+                "INSERT INTO question_duplicates (question_id, cluster_id, similarity) VALUES (%s, %s, %s)",
+                rows[start:start + INDEX_BATCH_SIZE]
+            )
+        write_connection.commit()
+    finally:
+        writer.close()
+
+    return {"indexed": indexed, "clusters": len(clusters), "questions_in_clusters": len(rows)}
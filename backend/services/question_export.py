@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import zlib
+from db.pool import InstrumentedSSCursor
+from services.question_store import QUESTION_FILTERS, question_json_sql, json_text
+
+# Every column of the questions table, in export order
+EXPORT_COLUMNS = ('id', 'class_name', 'subject', 'topic', 'type', 'question', 'options',
+                  'correct_answer', 'topic_id', 'uploaded_by', 'created_at')
+OPTIONS_INDEX = EXPORT_COLUMNS.index('options')
+# Few distinct values per export: the columnar format stores them dictionary-encoded
+DICTIONARY_COLUMNS = ('class_name', 'subject', 'topic', 'type', 'uploaded_by')
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'columnar': ('application/x-ndjson', 'columns.ndjson')
+}
+EXPORT_CHUNK_SIZE = 1000
+
+
+def build_export_query(fmt, filters):
+    """SELECT for one export; `filters` uses the /questions/all argument names"""
+    if fmt == 'ndjson':
+        # One JSON document per row, built by MySQL like the other question reads
+        select = question_json_sql(*EXPORT_COLUMNS)
+    else:
+        select = ", ".join(
+            'CAST(created_at AS CHAR)' if column == 'created_at' else column
+            for column in EXPORT_COLUMNS
+        )
+
+    conditions = []
+    params = []
+    for arg, column in QUESTION_FILTERS.items():
+        if filters.get(arg):
+            conditions.append(f"{column} = %s")
+            params.append(filters[arg])
+
+    query = f"SELECT {select} FROM questions"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # Primary key order: cheap for InnoDB to walk, and stable between backups
+    return query + " ORDER BY id", tuple(params)
+
+
+def iter_chunks(connection, query, params, chunk_size=EXPORT_CHUNK_SIZE):
+    """Rows in lists of chunk_size from an unbuffered (server-side) cursor"""
+    cursor = connection.cursor(InstrumentedSSCursor)
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+# ============================ Formats ============================
+
+def _csv_text(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+
+def write_csv(chunks):
+    # options is written as its JSON array text, so commas inside choices survive
+    yield _csv_text([EXPORT_COLUMNS])
+    for rows in chunks:
+        # The driver may hand JSON columns back as bytes, which csv would write as b'...'
+        yield _csv_text(
+            row[:OPTIONS_INDEX] + (json_text(row[OPTIONS_INDEX]),) + row[OPTIONS_INDEX + 1:]
+            for row in rows
+        )
+
+
+def write_ndjson(chunks):
+    for rows in chunks:
+        yield "".join(json_text(row[0]) + "\n" for row in rows)
+
+
+def write_columnar(chunks):
+    """A header line, then one JSON object per chunk holding its values column by column.
+
+    Like a Parquet row group: repeated columns (class, subject, ...) are
+    stored as a dictionary plus integer codes, so large banks shrink a lot
+    before any compression. options is decoded back into arrays.
+    """
+    yield json.dumps({
+        "format": "k12-columnar",
+        "version": 1,
+        "columns": EXPORT_COLUMNS,
+        "dictionary_columns": DICTIONARY_COLUMNS
+    }) + "\n"
+    for rows in chunks:
+        group = {"rows": len(rows), "columns": {}}
+        for index, column in enumerate(EXPORT_COLUMNS):
+            values = [row[index] for row in rows]
+            if column == 'options':
+                values = [json.loads(json_text(v)) if v else [] for v in values]
+            if column in DICTIONARY_COLUMNS:
+                dictionary = list(dict.fromkeys(values))
+                codes = {value: code for code, value in enumerate(dictionary)}
+                values = {"dictionary": dictionary, "codes": [codes[v] for v in values]}
+            group["columns"][column] = values
+        yield json.dumps(group, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+WRITERS = {
+    'csv': write_csv,
+    'ndjson': write_ndjson,
+    'columnar': write_columnar
+}
+
+
+def gzip_stream(pieces):
+    """Compress a stream of text pieces as one gzip member, a chunk at a time"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for piece in pieces:
+        data = compressor.compress(piece.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_questions(connection, fmt, filters=None, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as bytes; memory stays at one chunk whatever the table size"""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(WRITERS)}")
+    query, params = build_export_query(fmt, filters or {})
+    pieces = WRITERS[fmt](iter_chunks(connection, query, params, chunk_size))
+    if compress:
+        return gzip_stream(pieces)
+    return (piece.encode('utf-8') for piece in pieces)
+
+
+def export_filename(fmt, compress=False):
+    return f"questions.{EXPORT_FORMATS[fmt][1]}" + (".gz" if compress else "")
@@ -0,0 +1,84 @@
+import re
+from services.question_store import QUESTION_FILTERS, question_json_sql
+
+# Matches the ngram_token_size the FULLTEXT index was built with (migration 010)
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 10
+# Ranked results are paged by offset, so stop before deep pages get expensive
+MAX_SEARCH_RESULTS = 1000
+FACET_COLUMNS = ('class_name', 'subject', 'topic')
+
+SEARCH_QUESTION_JSON = question_json_sql('id', 'class_name', 'subject', 'topic', 'type', 'question', 'options',
+                                         'correct_answer', 'uploaded_by', 'created_at')
+MATCH_SQL = "MATCH(question) AGAINST (%s IN BOOLEAN MODE)"
+
+# Characters with a meaning in boolean-mode queries; user input must not inject them
+_OPERATOR_RE = re.compile(r'[+\-<>()~*"@]+')
+
+
+def build_match_query(text):
+    """Boolean-mode query requiring every term as a phrase, or None when nothing is searchable.
+
+    Quoting each term makes the ngram parser match its 2-grams in order, so
+    "photo" does not match every row containing "ph" and "to".
+    """
+    terms = []
+    seen = set()
+    for term in _OPERATOR_RE.sub(' ', text or '').split():
+        if len(term) >= MIN_TERM_LENGTH and term.casefold() not in seen:
+            seen.add(term.casefold())
+            terms.append(term)
+    if not terms:
+        return None
+    return " ".join(f'+"{term}"' for term in terms[:MAX_TERMS])
+
+
+def _filter_sql(filters):
+    conditions = []
+    params = []
+    for arg, column in QUESTION_FILTERS.items():
+        if filters.get(arg):
+            conditions.append(f"{column} = %s")
+            params.append(filters[arg])
+    return conditions, params
+
+
+def search_questions(cursor, match_query, filters, limit, offset=0):
+    """One page of matching question documents (JSON text), best match first"""
+    conditions, params = _filter_sql(filters)
+    where = " AND ".join([MATCH_SQL] + conditions)
+    cursor.execute(f"""
+        SELECT {SEARCH_QUESTION_JSON}, {MATCH_SQL} AS relevance
+        FROM questions
+        WHERE {where}
+        ORDER BY relevance DESC, id DESC
+        LIMIT %s OFFSET %s
+    """, (match_query, match_query, *params, limit, offset))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def search_facets(cursor, match_query, filters):
+    """Total matches and per-class/subject/topic counts, from one GROUP BY"""
+    conditions, params = _filter_sql(filters)
+    where = " AND ".join([MATCH_SQL] + conditions)
+    cursor.execute(f"""
+        SELECT {", ".join(FACET_COLUMNS)}, COUNT(*)
+        FROM questions
+        WHERE {where}
+        GROUP BY {", ".join(FACET_COLUMNS)}
+    """, (match_query, *params))
+
+    total = 0
+    facets = {column: {} for column in FACET_COLUMNS}
+    for row in cursor.fetchall():
+        count = row[-1]
+        total += count
+        for column, value in zip(FACET_COLUMNS, row):
+            if value is not None:
+                facets[column][value] = facets[column].get(value, 0) + count
+
+    return total, {
+        column: [{"value": value, "count": count}
+                 for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+        for column, counts in facets.items()
+    }
@@ -0,0 +1,74 @@
+import json
+import time
+from flask import Response
+from instrumentation import record_serialization
+
+# Questions keep their choices in one JSON array column (`options`) and their
+# answer in `correct_answer` (migration 008). Reads build each row's JSON in
+# MySQL with JSON_OBJECT, so handlers only join the rows together.
+
+MAX_OPTIONS = 4
+# Stored for true/false questions uploaded without explicit choices
+TRUE_FALSE_OPTIONS = ['True', 'False']
+
+# Optional ?param=value filters for question listings and exports, mapped to their column
+QUESTION_FILTERS = {
+    'class': 'class_name',
+    'subject': 'subject',
+    'topic': 'topic',
+    'type': 'type',
+    'uploaded_by': 'uploaded_by'
+}
+
+
+def parse_options(raw):
+    """Accept a list, a JSON array string, or a comma/pipe separated string"""
+    if raw in (None, ''):
+        return []
+    if isinstance(raw, list):
+        return [str(o).strip() for o in raw if str(o).strip()]
+    raw = str(raw).strip()
+    if raw.startswith('['):
+        try:
+            return [str(o).strip() for o in json.loads(raw) if str(o).strip()]
+        except ValueError:
+            pass
+    separator = '|' if '|' in raw else ','
+    return [o.strip() for o in raw.split(separator) if o.strip()]
+
+
+def options_json(raw, q_type=None):
+    """The canonical stored form of a question's options"""
+    options = parse_options(raw)
+    if not options and q_type == 'true-false':
+        options = TRUE_FALSE_OPTIONS
+    return json.dumps(options, ensure_ascii=False)
+
+
+def question_json_sql(*fields, alias=''):
+    """JSON_OBJECT(...) over the named columns, e.g. question_json_sql('id', 'options')"""
+    prefix = f"{alias}." if alias else ''
+    pairs = []
+    for field in fields:
+        if field == 'created_at':
+            # Same "YYYY-MM-DD HH:MM:SS" text the API has always returned
+            pairs.append(f"'created_at', CAST({prefix}created_at AS CHAR)")
+        else:
+            pairs.append(f"'{field}', {prefix}{field}")
+    return "JSON_OBJECT(" + ", ".join(pairs) + ")"
+
+
+def json_text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def join_json_rows(documents):
+    """Concatenate per-row JSON documents into one JSON array string"""
+    started = time.perf_counter()
+    body = "[" + ",".join(json_text(d) for d in documents) + "]"
+    record_serialization(time.perf_counter() - started)
+    return body
+
+
+def json_rows_response(documents, status=200):
+    return Response(join_json_rows(documents), status=status, mimetype='application/json')
@@ -0,0 +1,307 @@
+import bisect
+import random
+import threading
+import time
+from collections import OrderedDict
+from services.question_store import question_json_sql, json_text
+
+# Filters the quiz endpoint can apply; together they form the pack key
+INDEXED_COLUMNS = ('class_name', 'subject', 'topic', 'type')
+# What a student sees of a question: everything except correct_answer
+PACK_QUESTION_JSON = question_json_sql('id', 'class_name', 'subject', 'topic', 'type', 'question', 'options')
+
+
+class QuizPack:
+    """Serialized quiz payloads, and their answers, for one filter combination.
+
+    Ids are also grouped by (subject, topic), which is what adaptive
+    selection weights by.
+    """
+
+    __slots__ = ('ids', 'documents', 'answers', 'groups', 'group_of', 'max_id', 'built_at', 'dirty', 'check_new')
+
+    def __init__(self):
+        self.ids = []
+        self.documents = {}
+        self.answers = {}
+        self.groups = {}
+        self.group_of = {}
+        self.max_id = 0
+        self.built_at = time.monotonic()
+        self.dirty = set()
+        self.check_new = False
+
+    def put(self, question_id, group, answer, document):
+        if question_id not in self.documents:
+            bisect.insort(self.ids, question_id)
+            self._join_group(question_id, group)
+        elif self.group_of[question_id] != group:
+            self._leave_group(question_id, self.group_of[question_id])
+            self._join_group(question_id, group)
+        self.documents[question_id] = json_text(document)
+        self.answers[question_id] = answer
+        self.max_id = max(self.max_id, question_id)
+
+    def discard(self, question_id):
+        if self.documents.pop(question_id, None) is not None:
+            del self.answers[question_id]
+            del self.ids[bisect.bisect_left(self.ids, question_id)]
+            self._leave_group(question_id, self.group_of.pop(question_id))
+
+    def _join_group(self, question_id, group):
+        bisect.insort(self.groups.setdefault(group, []), question_id)
+        self.group_of[question_id] = group
+
+    def _leave_group(self, question_id, group):
+        members = self.groups[group]
+        del members[bisect.bisect_left(members, question_id)]
+        if not members:
+            del self.groups[group]
+
+
+class QuizPackCache:
+    """Precomputed, answer-free quiz payloads per (class, subject, topic, type).
+
+    A pack holds the JSON of every matching question, as MySQL builds it,
+    plus the answers kept server-side for scoring. Serving a quiz is a random
+    pick of ids from the pack and a join of their documents, with no query.
+
+    Writes invalidate incrementally: a changed or deleted question id is
+    re-read on the next draw, and an upload without ids makes the next draw
+    pick up rows newer than the pack. Packs are still rebuilt after `ttl`
+    seconds so writes made through other worker processes show up. At most
+    `max_packs` packs and `max_questions` questions are kept, least recently
+    used first out. One pack holds at most `max_pack_questions` (and never
+    more than `max_questions`); broader filters, e.g. a whole class, get a
+    window of that size, starting at a random id, instead of every matching
+    question.
+    """
+
+    def __init__(self, max_packs=512, max_questions=200000, max_pack_questions=5000, ttl=300):
+        self.max_packs = max_packs
+        self.max_questions = max_questions
+        self.max_pack_questions = max_pack_questions
+        self.ttl = ttl
+        self._packs = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.builds = 0
+        self.samples = 0
+        self.refreshes = 0
+
+    def configure(self, config):
+        self.max_packs = int(config.get('QUIZ_PACK_MAX_PACKS', 512))
+        self.max_questions = int(config.get('QUIZ_PACK_MAX_QUESTIONS', 200000))
+        self.max_pack_questions = int(config.get('QUIZ_PACK_MAX_PACK_QUESTIONS', 5000))
+        self.ttl = int(config.get('QUIZ_PACK_TTL', 300))
+
+    @staticmethod
+    def make_key(filters):
+        return tuple(
+            None if filters.get(column) in (None, '') else str(filters.get(column))
+            for column in INDEXED_COLUMNS
+        )
+
+    @staticmethod
+    def _where(key, extra_condition=None, extra_params=()):
+        conditions = []
+        params = []
+        for column, value in zip(INDEXED_COLUMNS, key):
+            if value is not None:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if extra_condition:
+            conditions.append(extra_condition)
+            params.extend(extra_params)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    @classmethod
+    def _load(cls, cursor, key, extra_condition=None, extra_params=(), limit=None):
+        where, params = cls._where(key, extra_condition, extra_params)
+        query = f"SELECT id, subject, topic, correct_answer, {PACK_QUESTION_JSON} FROM questions{where}"
+        if limit is not None:
+            # Keyset page: walks the primary key and stops after `limit` rows
+            query += " ORDER BY id LIMIT %s"
+            params.append(limit)
+        cursor.execute(query, tuple(params))
+        return list(cursor.fetchall())
+
+    @classmethod
+    def _load_window(cls, cursor, key, first_rows, limit):
+        """`limit` matching questions from a random id onwards, wrapping round to the lowest ids.
+
+        `first_rows` are the lowest-id matches, already read. Each rebuild
+        picks a new starting id, so a broad filter serves a different slice
+        of its questions per TTL with two keyset reads, never a sort.
+        """
+        cursor.execute("SELECT MAX(id) FROM questions")
+        start = random.randint(first_rows[0][0], cursor.fetchone()[0] or first_rows[0][0])
+        window = cls._load(cursor, key, "id >= %s", (start,), limit=limit)
+        return window + [row for row in first_rows if row[0] < start][:limit - len(window)]
+
+    def pack_limit(self):
+        """Most questions one pack may hold; never more than the whole cache's budget"""
+        return max(1, min(self.max_pack_questions, self.max_questions))
+
+    def _build(self, cursor, key):
+        pack = QuizPack()
+        limit = self.pack_limit()
+        rows = self._load(cursor, key, limit=limit + 1)
+        if len(rows) > limit:
+            # Too many to keep (e.g. a class-only filter): keep a window of them
+            rows = self._load_window(cursor, key, rows[:limit], limit)
+            self.samples += 1
+        for question_id, subject, topic, answer, document in rows:
+            pack.put(question_id, (subject, topic), answer, document)
+        self.builds += 1
+
+        with self._lock:
+            old = self._packs.pop(key, None)
+            if old is not None:
+                self._size -= len(old.ids)
+            self._packs[key] = pack
+            self._size += len(pack.ids)
+            self._evict(key)
+        return pack
+
+    def _evict(self, keep):
+        """Drop least recently used packs until within budget, except `keep`, the pack being served"""
+        while len(self._packs) > 1 and (len(self._packs) > self.max_packs or self._size > self.max_questions):
+            key, evicted = self._packs.popitem(last=False)
+            if key == keep:
+                self._packs[key] = evicted
+                continue
+            self._size -= len(evicted.ids)
+
+    def _refresh(self, cursor, key, pack):
+        with self._lock:
+            dirty, pack.dirty = pack.dirty, set()
+            check_new, pack.check_new = pack.check_new, False
+            max_id = pack.max_id
+        if not dirty and not check_new:
+            # A concurrent draw refreshed the pack between our check and the lock
+            self.hits += 1
+            return
+
+        clauses = []
+        params = []
+        if check_new:
+            clauses.append("id > %s")
+            params.append(max_id)
+        if dirty:
+            clauses.append("id IN (" + ", ".join(["%s"] * len(dirty)) + ")")
+            params.extend(sorted(dirty))
+        rows = self._load(cursor, key, "(" + " OR ".join(clauses) + ")", params)
+        self.refreshes += 1
+
+        limit = self.pack_limit()
+        with self._lock:
+            before = len(pack.ids)
+            # Dirty ids that no longer match (deleted, or moved to another key) drop out
+            for question_id in dirty:
+                pack.discard(question_id)
+            for question_id, subject, topic, answer, document in rows:
+                # A full (or sampled) pack takes new questions again on its next rebuild
+                if question_id in pack.documents or len(pack.ids) < limit:
+                    pack.put(question_id, (subject, topic), answer, document)
+            if self._packs.get(key) is pack:
+                self._size += len(pack.ids) - before
+                self._evict(key)
+
+    def get(self, cursor, filters):
+        key = self.make_key(filters)
+        with self._lock:
+            pack = self._packs.get(key)
+            if pack is not None:
+                self._packs.move_to_end(key)
+
+        if pack is None or time.monotonic() - pack.built_at >= self.ttl:
+            return self._build(cursor, key)
+        # Checked again under the lock in _refresh(), which another draw may be running
+        if pack.dirty or pack.check_new:
+            self._refresh(cursor, key, pack)
+        else:
+            self.hits += 1
+        return pack
+
+    def peek(self, filters):
+        """The pack for these filters if it can be served without a query, else None"""
+        key = self.make_key(filters)
+        with self._lock:
+            pack = self._packs.get(key)
+            if pack is None or pack.dirty or pack.check_new or time.monotonic() - pack.built_at >= self.ttl:
+                return None
+            self._packs.move_to_end(key)
+            self.hits += 1
+            return pack
+
+    def draw(self, cursor, filters, k, seed=None, selector=None):
+        """Up to k question documents (JSON text); the same seed gives the same draw.
+
+        The pick is uniform unless `selector(pack, k, rng)` is given, which
+        returns the ids to serve and runs while the pack can't change.
+        """
+        return self.draw_from(self.get(cursor, filters), k, seed, selector)
+
+    def draw_from(self, pack, k, seed=None, selector=None):
+        rng = random.Random(seed) if seed is not None else random
+        with self._lock:
+            if selector is None:
+                ids = rng.sample(pack.ids, min(k, len(pack.ids)))
+            else:
+                ids = selector(pack, k, rng)
+            return [pack.documents[question_id] for question_id in ids]
+
+    def answers_for(self, question_ids):
+        """correct_answer per question id, for the ids held in a cached pack"""
+        missing = set(question_ids)
+        found = {}
+        with self._lock:
+            for pack in reversed(self._packs.values()):
+                for question_id in [q for q in missing if q in pack.answers]:
+                    found[question_id] = pack.answers[question_id]
+                    missing.discard(question_id)
+                if not missing:
+                    break
+        return found
+
+    def invalidate(self, question_id=None, **row):
+        """Mark packs whose filters match a changed question for refresh.
+
+        With question_id, only that row is re-read; without it (e.g. a bulk
+        upload) the next draw loads every matching row newer than the pack.
+        """
+        values = self.make_key(row)
+        with self._lock:
+            for key, pack in self._packs.items():
+                if all(k is None or k == v for k, v in zip(key, values)):
+                    if question_id is None:
+                        pack.check_new = True
+                    else:
+                        pack.dirty.add(int(question_id))
+
+    def clear(self):
+        with self._lock:
+            self._packs.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            packs = len(self._packs)
+            questions = self._size
+        return {
+            "packs": packs,
+            "max_packs": self.max_packs,
+            "questions": questions,
+            "max_questions": self.max_questions,
+            "max_pack_questions": self.max_pack_questions,
+            "hits": self.hits,
+            "builds": self.builds,
+            "samples": self.samples,
+            "refreshes": self.refreshes
+        }
+
+
+quiz_packs = QuizPackCache()
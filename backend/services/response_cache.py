@@ -0,0 +1,188 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import request, Response
+from werkzeug.http import quote_etag
+from instrumentation import record_serialization
+
+
+# ============================ Backends ============================
+
+class LRUBackend:
+    """In-process store: fastest, but versions are per worker process.
+
+    Entries expire after `ttl` seconds so writes made through other workers
+    show up within that window.
+    """
+
+    def __init__(self, max_entries=2048, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl if ttl else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            expires_at, value = self._data.get(key, (None, 0))
+            value = int(value) + 1
+            self._data[key] = (None, value)
+            self._data.move_to_end(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisBackend:
+    """Store shared by every worker, on Redis or anything speaking its protocol.
+
+    Needs the optional `redis` package; versions live in Redis too, so an
+    invalidation in one worker is seen by all of them at once.
+    """
+
+    def __init__(self, client, prefix='k12:cache:', ttl=3600):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_URL is set but the 'redis' package is not installed")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or self.ttl)
+
+    def incr(self, key):
+        return int(self.client.incr(self.prefix + key))
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+# ============================ Response Cache ============================
+
+class ResponseCache:
+    """Serialized JSON responses with version-based invalidation.
+
+    Every entry records the version of its scope (a class name) at the time
+    it was built. Writes call bump(scope); an entry whose version no longer
+    matches is treated as a miss, so nothing has to be deleted. The ETag is
+    a hash of the body, so a client holding a current copy gets a 304.
+    """
+
+    cache_control = "private, no-cache"
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUBackend()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def configure(self, config):
+        url = config.get('RESPONSE_CACHE_URL')
+        self.backend = RedisBackend.from_url(url) if url else LRUBackend(
+            max_entries=int(config.get('RESPONSE_CACHE_SIZE', 2048)),
+            ttl=int(config.get('RESPONSE_CACHE_TTL', 300))
+        )
+        self.cache_control = (
+            f"private, max-age={config['CATALOG_MAX_AGE']}" if config.get('CATALOG_MAX_AGE')
+            else "private, no-cache"
+        )
+
+    def version(self, scope):
+        return int(self.backend.get(f"v:{scope}") or 0)
+
+    def bump(self, scope):
+        if scope is not None:
+            self.backend.incr(f"v:{scope}")
+
+    def lookup(self, key):
+        raw = self.backend.get(f"r:{key}")
+        if raw is not None:
+            entry = json.loads(raw)
+            if entry['version'] == self.version(entry['scope']):
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, scope, version, payload):
+        started = time.perf_counter()
+        body = json.dumps(payload, separators=(',', ':'))
+        record_serialization(time.perf_counter() - started)
+        entry = {
+            'scope': scope,
+            'version': version,
+            'etag': hashlib.sha256(body.encode('utf-8')).hexdigest()[:32],
+            'body': body
+        }
+        self.backend.set(f"r:{key}", json.dumps(entry))
+        return entry
+
+    @property
+    def in_process(self):
+        """True when lookups never leave the process (so they can't block an event loop)"""
+        return isinstance(self.backend, LRUBackend)
+
+    def render(self, entry, if_none_match):
+        """(status, body, headers) for a cached entry; `if_none_match` is a werkzeug ETags"""
+        headers = {'ETag': quote_etag(entry['etag']), 'Cache-Control': self.cache_control}
+        if entry['etag'] in if_none_match:
+            self.not_modified += 1
+            return 304, '', headers
+        return 200, entry['body'], headers
+
+    def respond(self, entry):
+        """200 with the cached body, or 304 when the client already has it"""
+        status, body, headers = self.render(entry, request.if_none_match)
+        response = Response(body, status=status, mimetype='application/json')
+        response.headers.update(headers)
+        return response
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified
+        }
+
+
+catalog_cache = ResponseCache()
+
+
+def role_scope(user):
+    """Cache partition for a caller: students vs everyone else"""
+    return 'student' if user and user['role'] == 'student' else 'staff'
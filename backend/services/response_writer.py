@@ -0,0 +1,242 @@
+import queue
+import threading
+import time
+from collections import Counter
+
+INSERT_RESPONSE_SQL = """
+    INSERT INTO quiz_responses (student_id, question_id, topic_id, answer, score, time_spent)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+class WriterBusy(Exception):
+    """Raised when the write buffer is full and the submission can't be accepted"""
+
+
+def normalize_answer(value):
+    return " ".join(str(value or '').split()).casefold()
+
+
+def score_answer(answer, correct_answer):
+    if correct_answer is None:
+        return None
+    return 1.0 if normalize_answer(answer) == normalize_answer(correct_answer) else 0.0
+
+
+class ResponseWriter:
+    """Buffers quiz answers in memory and writes them to MySQL in batches.
+
+    submit() only enqueues, so the request returns at once. A background
+    thread drains the queue, scores a whole batch against the questions with
+    one SELECT, and stores it with one multi-row INSERT. The buffer holds at
+    most `max_pending` answers; when it is full, submit() raises WriterBusy
+    and the client should retry later (backpressure) instead of letting
+    memory grow.
+    """
+
+    def __init__(self, max_pending=50000, batch_size=1000, flush_interval=0.25, max_retries=3):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._pending_by_student = Counter()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._app = None
+        self._listeners = []
+        self._commit_listeners = []
+
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def add_listener(self, listener, after_commit=False):
+        """Register listener(cursor, responses), called inside each batch's transaction.
+
+        `responses` are the scored answer dicts, including the class_name,
+        subject and topic of their question. With after_commit, the listener
+        is called as listener(responses) once the batch is committed, so
+        in-memory state only ever sees answers that were stored, once.
+        Registering the same listener again (e.g. from a second create_app())
+        is a no-op.
+        """
+        listeners = self._commit_listeners if after_commit else self._listeners
+        if listener not in listeners:
+            listeners.append(listener)
+
+    def start(self, app):
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._app = app
+            self._thread = threading.Thread(target=self._run, name="response-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, app, records):
+        """Queue answer dicts (student_id, question_id, topic_id, answer, time_spent)"""
+        if not records:
+            return 0
+        with self._cond:
+            if self._pending + len(records) > self.max_pending:
+                self.rejected += len(records)
+                raise WriterBusy("Response buffer is full")
+            self._pending += len(records)
+            self._pending_by_student.update(r['student_id'] for r in records)
+        self.start(app)
+        for record in records:
+            self._queue.put(record)
+        return len(records)
+
+    def pending(self):
+        with self._cond:
+            return self._pending
+
+    def pending_for(self, student_id):
+        with self._cond:
+            return self._pending_by_student.get(student_id, 0)
+
+    def wait_for_student(self, student_id, timeout=2.0):
+        """Wait until one student's queued answers are written; False on timeout.
+
+        Returns at once when that student has nothing queued, however busy
+        the writer is with everyone else's answers.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending_by_student.get(student_id, 0) > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def flush(self, timeout=2.0):
+        """Wait until everything queued so far has been written; False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Coalesce whatever else arrived while we were waiting
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_with_retry(batch)
+            with self._cond:
+                self._pending -= len(batch)
+                self._pending_by_student.subtract(r['student_id'] for r in batch)
+                for student_id in {r['student_id'] for r in batch}:
+                    if self._pending_by_student[student_id] <= 0:
+                        del self._pending_by_student[student_id]
+                self._cond.notify_all()
+
+    def _write_with_retry(self, batch):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with self._app.app_context():
+                    with self._app.mysql.pool.connection() as connection:
+                        self._write(connection, batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                print(f"❌ Response batch write failed (attempt {attempt}): {e}")
+                time.sleep(min(0.5 * attempt, 2))
+        if len(batch) > 1:
+            self._write_rows(batch)
+        else:
+            self.dropped += len(batch)
+            print(f"❌ Dropped {len(batch)} quiz responses after {self.max_retries} attempts")
+
+    def _write_rows(self, batch):
+        """Retry a failed batch row by row so one bad answer doesn't drop the rest"""
+        done = 0
+        try:
+            with self._app.app_context():
+                with self._app.mysql.pool.connection() as connection:
+                    for record in batch:
+                        try:
+                            self._write(connection, [record])
+                            self.written += 1
+                        except Exception as e:
+                            self.dropped += 1
+                            print(f"❌ Dropped quiz response (student {record['student_id']}, "
+                                  f"question {record['question_id']}): {e}")
+                        done += 1
+            self.batches += 1
+        except Exception as e:
+            self.dropped += len(batch) - done
+            print(f"❌ Dropped {len(batch) - done} quiz responses after {self.max_retries} attempts: {e}")
+
+    def _write(self, connection, batch):
+        cursor = connection.cursor()
+        try:
+            question_ids = sorted({r['question_id'] for r in batch})
+            placeholders = ", ".join(["%s"] * len(question_ids))
+            cursor.execute(f"""
+                SELECT id, correct_answer, class_name, subject, topic
+                FROM questions
+                WHERE id IN ({placeholders})
+            """, tuple(question_ids))
+            questions = {row[0]: row[1:] for row in cursor.fetchall()}
+
+            responses = []
+            for r in batch:
+                correct_answer, class_name, subject, topic = questions.get(r['question_id'], (None, None, None, None))
+                responses.append(dict(
+                    r,
+                    score=score_answer(r.get('answer'), correct_answer),
+                    class_name=class_name,
+                    subject=subject,
+                    topic=topic
+                ))
+
+            rows = [
+                (r['student_id'], r['question_id'], r.get('topic_id'), r.get('answer'), r['score'], r.get('time_spent'))
+                for r in responses
+            ]
+            cursor.executemany(INSERT_RESPONSE_SQL, rows)
+            for listener in self._listeners:
+                listener(cursor, responses)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        # The batch is stored now; a failure here must not make it retry
+        for listener in self._commit_listeners:
+            try:
+                listener(responses)
+            except Exception as e:
+                print(f"❌ Response writer listener {listener.__name__} failed: {e}")
+
+    def stats(self):
+        return {
+            "pending": self.pending(),
+            "max_pending": self.max_pending,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "rejected": self.rejected
+        }
+
+
+response_writer = ResponseWriter()
@@ -0,0 +1,154 @@
+import csv
+import re
+from services.identity import user_cache
+from services.passwords import password_hasher
+
+# Students per transaction; also how many passwords are hashed per pool round
+ROSTER_BATCH_SIZE = 1000
+ROLES = ('student', 'teacher', 'admin')
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+# Cap the per-row error report so a completely broken file can't blow up the response
+MAX_REPORTED_ERRORS = 1000
+
+INSERT_USER_SQL = """
+    INSERT INTO users (name, email, password, role, student_class)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+class RosterReport:
+    def __init__(self):
+        self.inserted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    def to_dict(self):
+        return {
+            "inserted": self.inserted,
+            "skipped_existing": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+def _value(row, *keys):
+    for key in keys:
+        value = row.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def validate_roster_row(row, default_password=None, default_class=None):
+    """Turn one roster row into (name, email, password, role, student_class), or raise ValueError"""
+    if isinstance(row, Exception):
+        raise ValueError(str(row))
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+
+    name = _value(row, 'name')
+    email = _value(row, 'email')
+    password = _value(row, 'password') or default_password
+    role = (_value(row, 'role') or 'student').lower()
+    student_class = _value(row, 'student_class', 'className', 'class_name', 'class') or default_class
+
+    missing = [field for field, value in (('name', name), ('email', email), ('password', password)) if value is None]
+    if missing:
+        raise ValueError("Missing required fields: " + ", ".join(missing))
+    if not EMAIL_RE.match(email):
+        raise ValueError(f"Invalid email '{email}'")
+    if role not in ROLES:
+        raise ValueError(f"role must be one of: {', '.join(ROLES)}")
+    if role == 'student' and not student_class:
+        raise ValueError("Students need a class")
+
+    return (name, email, str(password), role, student_class if role == 'student' else None)
+
+
+def existing_emails(cursor, emails):
+    """The subset of `emails` already registered, casefolded, in one query"""
+    if not emails:
+        return set()
+    placeholders = ", ".join(["%s"] * len(emails))
+    cursor.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", tuple(emails))
+    return {row[0].casefold() for row in cursor.fetchall()}
+
+
+def flush_roster_batch(connection, batch, report, seen):
+    """Skip known emails, hash the rest in parallel and insert them in one transaction"""
+    cursor = connection.cursor()
+    try:
+        registered = existing_emails(cursor, [params[1] for _, params in batch])
+        fresh = []
+        for row_number, params in batch:
+            key = params[1].casefold()
+            # Email uniqueness is case-insensitive under the default collation
+            if key in registered or key in seen:
+                report.skipped += 1
+                continue
+            seen.add(key)
+            fresh.append((row_number, params))
+        if not fresh:
+            return
+
+        hashes = password_hasher.hash_many([params[2] for _, params in fresh])
+        fresh = [(row_number, params[:2] + (hashed,) + params[3:])
+                 for (row_number, params), hashed in zip(fresh, hashes)]
+        try:
+            cursor.executemany(INSERT_USER_SQL, [params for _, params in fresh])
+            connection.commit()
+            report.inserted += len(fresh)
+        except Exception:
+            connection.rollback()
+            # Retry row by row so the report points at the offending rows only
+            for row_number, params in fresh:
+                try:
+                    cursor.execute(INSERT_USER_SQL, params)
+                    connection.commit()
+                    report.inserted += 1
+                except Exception as e:
+                    connection.rollback()
+                    report.add_error(row_number, f"Database error: {e}")
+    finally:
+        cursor.close()
+
+
+def import_roster(connection, rows, default_password=None, default_class=None, batch_size=ROSTER_BATCH_SIZE):
+    """Create accounts for every valid row and return a RosterReport.
+
+    Emails already registered (or repeated in the file) are skipped, not
+    updated, so re-running an import is safe.
+    """
+    report = RosterReport()
+    batch = []
+    seen = set()
+    try:
+        for row_number, row in enumerate(rows, 1):
+            try:
+                batch.append((row_number, validate_roster_row(row, default_password, default_class)))
+            except ValueError as e:
+                report.add_error(row_number, str(e))
+                continue
+            if len(batch) >= batch_size:
+                flush_roster_batch(connection, batch, report, seen)
+                batch = []
+    except UnicodeDecodeError as e:
+        report.add_error(None, f"File is not valid UTF-8: {e}")
+    except csv.Error as e:
+        report.add_error(None, f"Malformed CSV: {e}")
+    if batch:
+        flush_roster_batch(connection, batch, report, seen)
+
+    if report.inserted:
+        # Ids that were unknown a moment ago may be cached as "no such user"
+        user_cache.clear()
+    return report
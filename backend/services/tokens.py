@@ -0,0 +1,135 @@
+from flask import current_app
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+import threading
+import time
+import uuid
+
+ACCESS_TOKEN_TTL = 15 * 60          # seconds
+REFRESH_TOKEN_TTL = 7 * 24 * 3600   # seconds
+
+# Workers reload the shared revocation list at most this often, so checking a
+# token never needs a database round trip on the request path
+REVOCATION_REFRESH_INTERVAL = 30
+
+# Expired revocations are deleted by the revoking request at most this often
+REVOCATION_PRUNE_INTERVAL = 3600
+
+
+def get_serializer(token_type):
+    # Separate salts keep a refresh token from being accepted as an access token
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=f"k12-{token_type}-token")
+
+
+# ============================ Revocation List ============================
+
+class RevocationList:
+    """Revoked token ids, kept in memory and synced from the revoked_tokens table"""
+
+    def __init__(self):
+        self._revoked = {}      # jti -> unix time after which the token is expired anyway
+        self._last_sync = None
+        self._last_prune = None
+        self._lock = threading.Lock()
+
+    def needs_sync(self):
+        return self._last_sync is None or time.monotonic() - self._last_sync >= REVOCATION_REFRESH_INTERVAL
+
+    def is_revoked(self, jti):
+        if self.needs_sync():
+            self.sync()
+        return jti in self._revoked
+
+    def revoke(self, jti, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+        connection = current_app.mysql.connection
+        cursor = connection.cursor()
+        cursor.execute(
+            "INSERT IGNORE INTO revoked_tokens (jti, expires_at) VALUES (%s, FROM_UNIXTIME(%s))",
+            (jti, int(expires_at))
+        )
+        if self.needs_prune():
+            # Revoking is already a write; token checks only ever read the table
+            self._last_prune = time.monotonic()
+            cursor.execute("DELETE FROM revoked_tokens WHERE expires_at < NOW()")
+        connection.commit()
+        cursor.close()
+
+    def needs_prune(self):
+        return self._last_prune is None or time.monotonic() - self._last_prune >= REVOCATION_PRUNE_INTERVAL
+
+    def sync(self):
+        """Reload unexpired revocations written by any worker (read-only)"""
+        self._last_sync = time.monotonic()
+        try:
+            cursor = current_app.mysql.connection.cursor()
+            cursor.execute("SELECT jti, UNIX_TIMESTAMP(expires_at) FROM revoked_tokens WHERE expires_at >= NOW()")
+            rows = cursor.fetchall()
+            cursor.close()
+        except Exception as e:
+            print("⚠️ Could not sync revoked tokens:", e)
+            return
+        with self._lock:
+            self._revoked = {jti: float(expires_at) for jti, expires_at in rows}
+
+
+revocation_list = RevocationList()
+
+
+# ============================ Issue / Verify ============================
+
+def issue_access_token(user):
+    claims = {
+        'id': user['id'],
+        'name': user['name'],
+        'email': user['email'],
+        'role': user['role'],
+        'student_class': user['student_class'],
+        'jti': uuid.uuid4().hex
+    }
+    return get_serializer('access').dumps(claims)
+
+
+def issue_refresh_token(user):
+    return get_serializer('refresh').dumps({'id': user['id'], 'jti': uuid.uuid4().hex})
+
+
+def issue_tokens(user):
+    return {
+        "access_token": issue_access_token(user),
+        "refresh_token": issue_refresh_token(user),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL
+    }
+
+
+def load_token(token, token_type, max_age):
+    """Return the verified claims of a token, or None if it is invalid, expired or revoked"""
+    try:
+        claims, issued_at = get_serializer(token_type).loads(token, max_age=max_age, return_timestamp=True)
+    except (BadSignature, SignatureExpired):
+        return None
+    if revocation_list.is_revoked(claims.get('jti')):
+        return None
+    claims['exp'] = issued_at.timestamp() + max_age
+    return claims
+
+
+def verify_access_token(token):
+    """Check an access token in-process; the claims double as the user dict"""
+    claims = load_token(token, 'access', ACCESS_TOKEN_TTL)
+    if claims is None:
+        return None
+    return {key: claims.get(key) for key in ('id', 'name', 'email', 'role', 'student_class')}
+
+
+def verify_refresh_token(token):
+    return load_token(token, 'refresh', REFRESH_TOKEN_TTL)
+
+
+def revoke_token(token, token_type):
+    max_age = ACCESS_TOKEN_TTL if token_type == 'access' else REFRESH_TOKEN_TTL
+    claims = load_token(token, token_type, max_age)
+    if claims is not None:
+        revocation_list.revoke(claims['jti'], claims['exp'])
+    return claims
@@ -0,0 +1,57 @@
+from collections import Counter
+
+UPSERT_TOPIC_COUNT_SQL = """
+    INSERT INTO topics (class_name, subject, name, question_count)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE question_count = question_count + VALUES(question_count)
+"""
+
+# Removals never create a topic: a missing row (e.g. a delete racing the
+# first insert) stays missing instead of starting at a negative count
+DECREMENT_TOPIC_COUNT_SQL = """
+    UPDATE topics SET question_count = GREATEST(question_count - %s, 0)
+    WHERE class_name = %s AND subject = %s AND name = %s
+"""
+
+
+def topic_key(class_name, subject, topic):
+    """Catalog key for a question, or None if it isn't filed under a full topic"""
+    if not (class_name and subject and topic):
+        return None
+    return (str(class_name), subject, topic)
+
+
+def adjust_topic_counts(cursor, deltas):
+    """Apply {(class_name, subject, topic): delta} in one multi-row upsert.
+
+    Call it with the same cursor, before the commit, as the write that
+    changed the questions, so the counts move in the same transaction.
+    """
+    deltas = [(key, delta) for key, delta in Counter(deltas).items() if key and delta]
+    added = [key + (delta,) for key, delta in deltas if delta > 0]
+    removed = [(-delta,) + key for key, delta in deltas if delta < 0]
+    if added:
+        cursor.executemany(UPSERT_TOPIC_COUNT_SQL, added)
+    if removed:
+        cursor.executemany(DECREMENT_TOPIC_COUNT_SQL, removed)
+
+
+RESOLVE_TOPIC_SQL = "SELECT class_name, subject, name FROM topics WHERE id = %s"
+
+LIST_TOPICS_SQL = """
+    SELECT id, name, question_count
+    FROM topics
+    WHERE class_name = %s AND subject = %s AND question_count > 0
+    ORDER BY name
+"""
+
+
+def resolve_topic(cursor, topic_id):
+    """Return (class_name, subject, topic) for a catalog id, or None"""
+    cursor.execute(RESOLVE_TOPIC_SQL, (topic_id,))
+    return cursor.fetchone()
+
+
+def list_topics(cursor, class_name, subject):
+    cursor.execute(LIST_TOPICS_SQL, (class_name, subject))
+    return cursor.fetchall()
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Tests import the backend modules the way app.py does (from services...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class SQLiteCursor:
+    """Enough of a MySQLdb cursor over sqlite3 for the plain SELECT/INSERT the services build"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection.cursor()
+        self.queries = []
+
+    def execute(self, query, params=()):
+        self.queries.append(query)
+        self._cursor.execute(query.replace('%s', '?'), tuple(params))
+        return self._cursor.rowcount
+
+    def executemany(self, query, rows):
+        self.queries.append(query)
+        self._cursor.executemany(query.replace('%s', '?'), [tuple(r) for r in rows])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return tuple(self._cursor.fetchall())
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def questions_db():
+    """In-memory questions table with the columns the quiz and upload code reads"""
+    connection = sqlite3.connect(':memory:', check_same_thread=False)
+    connection.execute("""
+        CREATE TABLE questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            class_name TEXT, subject TEXT, topic TEXT, type TEXT,
+            question TEXT, options TEXT, correct_answer TEXT
+        )
+    """)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def cursor(questions_db):
+    return SQLiteCursor(questions_db)
+
+
+def add_questions(connection, count, class_name='7', subject='Maths', topic='Fractions', type='mcq'):
+    connection.executemany(
+        "INSERT INTO questions (class_name, subject, topic, type, question, options, correct_answer) "
+        "VALUES (?, ?, ?, ?, ?, '[]', 'a')",
+        [(class_name, subject, topic, type, f"Question {i}") for i in range(count)]
+    )
+    connection.commit()
@@ -0,0 +1,79 @@
+import pytest
+from flask import Flask
+
+# The upload route pulls in the MySQL pool module
+pytest.importorskip("MySQLdb")
+
+from routes.bulk_upload import UploadReport, bulk_upload_bp, flush_batch, validate_row
+
+
+class RecordingCursor:
+    """Hands out ids like InnoDB does for one multi-row INSERT and records every statement"""
+
+    def __init__(self, next_id):
+        self.next_id = next_id
+        self.queries = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, query, params=()):
+        self.queries.append((query, params))
+        if query.lstrip().startswith("INSERT INTO questions"):
+            self.rowcount = len(params) // 9
+            self.lastrowid = self.next_id
+            self.next_id += self.rowcount
+
+    def executemany(self, query, rows):
+        self.queries.append((query, list(rows)))
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        raise AssertionError("the batch should not have fallen back to row-by-row inserts")
+
+
+def make_batch(count):
+    rows = [{"className": "7", "subject": "Maths", "topic": "Fractions", "type": "mcq",
+             "question": f"What is {i}/2?", "correctAnswer": "a"} for i in range(count)]
+    return [(n, validate_row(row, 1)) for n, row in enumerate(rows, 1)]
+
+
+def test_batch_is_one_insert_and_indexes_exactly_its_ids():
+    cursor = RecordingCursor(next_id=41)
+    connection = RecordingConnection(cursor)
+    report = UploadReport()
+
+    flush_batch(connection, make_batch(3), report, {}, allow_duplicates=True)
+
+    assert report.inserted == 3
+    assert connection.commits == 1
+    inserts = [q for q, _ in cursor.queries if q.lstrip().startswith("INSERT INTO questions")]
+    assert len(inserts) == 1
+    assert not any("MAX(id)" in q for q, _ in cursor.queries)
+    signatures = next(rows for q, rows in cursor.queries if "INTO question_signatures" in q)
+    assert [question_id for question_id, _ in signatures] == [41, 42, 43]
+
+
+def test_bulk_upload_is_for_teachers_and_admins():
+    app = Flask(__name__)
+    app.register_blueprint(bulk_upload_bp)
+
+    response = app.test_client().post("/bulk-upload", data="question\n", content_type="text/csv")
+
+    assert response.status_code == 403
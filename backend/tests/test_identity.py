@@ -0,0 +1,16 @@
+import logging
+
+from services.identity import warn_on_legacy_user_header
+
+
+def test_legacy_header_outside_development_is_logged(caplog):
+    with caplog.at_level(logging.WARNING):
+        assert warn_on_legacy_user_header({'ALLOW_LEGACY_USER_HEADER': True, 'ENV': 'production'})
+    assert "X-User-ID" in caplog.text
+
+
+def test_legacy_header_is_quiet_in_development_or_when_off(caplog):
+    with caplog.at_level(logging.WARNING):
+        assert not warn_on_legacy_user_header({'ALLOW_LEGACY_USER_HEADER': True, 'ENV': 'development'})
+        assert not warn_on_legacy_user_header({'ALLOW_LEGACY_USER_HEADER': False, 'ENV': 'production'})
+    assert caplog.text == ""
@@ -0,0 +1,59 @@
+from conftest import add_questions
+from services.quiz_packs import QuizPackCache
+
+FILTERS = {'class_name': '7', 'subject': 'Maths', 'topic': 'Fractions', 'type': 'mcq'}
+
+
+def test_refresh_picks_up_new_and_changed_questions(questions_db, cursor):
+    add_questions(questions_db, 5)
+    cache = QuizPackCache()
+    pack = cache.get(cursor, FILTERS)
+    assert pack.ids == [1, 2, 3, 4, 5]
+
+    add_questions(questions_db, 2)
+    questions_db.execute("UPDATE questions SET topic = 'Decimals' WHERE id = 3")
+    cache.invalidate(**FILTERS)
+    cache.invalidate(question_id=3, **FILTERS)
+
+    pack = cache.get(cursor, FILTERS)
+    assert pack.ids == [1, 2, 4, 5, 6, 7]
+    assert not pack.dirty and not pack.check_new
+    assert cache.stats()['questions'] == 6
+
+
+def test_refresh_already_done_by_another_draw_runs_no_query(questions_db, cursor):
+    add_questions(questions_db, 3)
+    cache = QuizPackCache()
+    pack = cache.get(cursor, FILTERS)
+    cache.invalidate(question_id=2, **FILTERS)
+
+    # Both draws saw the pack dirty; the first one refreshes it
+    cache._refresh(cursor, cache.make_key(FILTERS), pack)
+    queries = len(cursor.queries)
+    cache._refresh(cursor, cache.make_key(FILTERS), pack)
+    assert len(cursor.queries) == queries
+    assert pack.ids == [1, 2, 3]
+
+
+def test_broad_filter_keeps_a_bounded_window(questions_db, cursor):
+    add_questions(questions_db, 30)
+    cache = QuizPackCache(max_questions=100, max_pack_questions=10)
+    pack = cache.get(cursor, {'class_name': '7'})
+    assert len(pack.ids) == 10
+    assert cache.stats()['samples'] == 1
+    assert not any('RAND()' in query for query in cursor.queries)
+
+    add_questions(questions_db, 5)
+    cache.invalidate(class_name='7')
+    assert len(cache.get(cursor, {'class_name': '7'}).ids) == 10
+
+
+def test_cache_stays_within_its_question_budget(questions_db, cursor):
+    for topic in ('A', 'B', 'C'):
+        add_questions(questions_db, 8, topic=topic)
+    cache = QuizPackCache(max_questions=20, max_pack_questions=50)
+    for topic in ('A', 'B', 'C'):
+        cache.get(cursor, {'class_name': '7', 'topic': topic})
+    stats = cache.stats()
+    assert stats['questions'] <= 20
+    assert stats['packs'] == 2
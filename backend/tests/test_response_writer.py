@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+
+import pytest
+from flask import Flask
+
+from conftest import SQLiteCursor, add_questions
+from services import response_writer as writer_module
+from services.response_writer import ResponseWriter
+
+
+class SQLiteConnection:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def cursor(self):
+        return SQLiteCursor(self.connection)
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.wrapped = SQLiteConnection(connection)
+
+    @contextmanager
+    def connection(self):
+        yield self.wrapped
+
+
+@pytest.fixture
+def app(questions_db):
+    questions_db.execute("""
+        CREATE TABLE quiz_responses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL, question_id INTEGER NOT NULL, topic_id INTEGER,
+            answer TEXT CHECK (answer <> 'unstorable'), score REAL, time_spent INTEGER
+        )
+    """)
+    add_questions(questions_db, 3)
+    app = Flask(__name__)
+    app.mysql = type('Mysql', (), {'pool': FakePool(questions_db)})()
+    return app
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(writer_module.time, 'sleep', lambda seconds: None)
+
+
+def record(student_id, question_id, answer):
+    return {'student_id': student_id, 'question_id': question_id, 'topic_id': None, 'answer': answer, 'time_spent': 5}
+
+
+def test_batch_is_scored_and_written(app, questions_db):
+    writer = ResponseWriter()
+    writer._app = app
+    writer._write_with_retry([record(1, 1, 'a'), record(1, 2, 'b')])
+
+    rows = questions_db.execute("SELECT question_id, score FROM quiz_responses ORDER BY id").fetchall()
+    assert rows == [(1, 1.0), (2, 0.0)]
+    assert writer.stats()['written'] == 2
+
+
+def test_failed_batch_is_retried_row_by_row(app, questions_db):
+    seen = []
+    writer = ResponseWriter(max_retries=2)
+    writer._app = app
+    writer.add_listener(seen.extend, after_commit=True)
+    writer._write_with_retry([record(1, 1, 'a'), record(2, 2, 'unstorable'), record(3, 3, 'a')])
+
+    rows = questions_db.execute("SELECT student_id FROM quiz_responses ORDER BY id").fetchall()
+    assert rows == [(1,), (3,)]
+    stats = writer.stats()
+    assert stats['written'] == 2
+    assert stats['dropped'] == 1
+    # After-commit listeners only ever see stored answers
+    assert [r['student_id'] for r in seen] == [1, 3]
+
+
+def test_wait_for_student_ignores_other_students(monkeypatch, app):
+    writer = ResponseWriter()
+    monkeypatch.setattr(writer, 'start', lambda app: None)
+    writer.submit(app, [record(1, 1, 'a')])
+
+    assert writer.pending_for(1) == 1
+    assert writer.wait_for_student(2, timeout=0.01)
+    assert not writer.wait_for_student(1, timeout=0.01)
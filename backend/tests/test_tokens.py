@@ -0,0 +1,105 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from services import tokens
+from services.tokens import (RevocationList, issue_tokens, revoke_token, verify_access_token,
+                             verify_refresh_token)
+
+USER = {'id': 7, 'name': 'Asha', 'email': 'asha@example.com', 'role': 'student', 'student_class': '7'}
+
+
+class RevokedTokensCursor:
+    """Applies the revoked_tokens statements to a dict of jti -> expiry, with NOW() as time.time()"""
+
+    def __init__(self, table):
+        self.table = table
+        self.queries = []
+        self.rows = []
+
+    def execute(self, query, params=()):
+        self.queries.append(query)
+        if query.startswith("INSERT IGNORE INTO revoked_tokens"):
+            jti, expires_at = params
+            self.table.setdefault(jti, expires_at)
+        elif query.startswith("DELETE FROM revoked_tokens"):
+            for jti in [jti for jti, expires_at in self.table.items() if expires_at < time.time()]:
+                del self.table[jti]
+        elif query.startswith("SELECT jti"):
+            self.rows = [(jti, expires_at) for jti, expires_at in self.table.items() if expires_at >= time.time()]
+        else:
+            raise AssertionError(f"unexpected statement: {query}")
+
+    def fetchall(self):
+        return tuple(self.rows)
+
+    def close(self):
+        pass
+
+
+class RevokedTokensConnection:
+    def __init__(self):
+        self.table = {}
+        self.cursors = []
+
+    def cursor(self):
+        self.cursors.append(RevokedTokensCursor(self.table))
+        return self.cursors[-1]
+
+    def commit(self):
+        pass
+
+    def queries(self):
+        return [query for cursor in self.cursors for query in cursor.queries]
+
+
+@pytest.fixture
+def connection():
+    return RevokedTokensConnection()
+
+
+@pytest.fixture(autouse=True)
+def app(connection, monkeypatch):
+    monkeypatch.setattr(tokens, 'revocation_list', RevocationList())
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test-secret'
+    app.mysql = SimpleNamespace(connection=connection)
+    with app.app_context():
+        yield app
+
+
+def test_access_token_round_trips_the_user():
+    issued = issue_tokens(USER)
+    assert verify_access_token(issued['access_token']) == USER
+    assert verify_access_token(issued['access_token'] + 'x') is None
+
+
+def test_refresh_token_is_not_an_access_token():
+    issued = issue_tokens(USER)
+    assert verify_access_token(issued['refresh_token']) is None
+    assert verify_refresh_token(issued['refresh_token'])['id'] == USER['id']
+
+
+def test_revoked_token_is_rejected_here_and_by_other_workers(monkeypatch):
+    issued = issue_tokens(USER)
+    revoke_token(issued['refresh_token'], 'refresh')
+    assert verify_refresh_token(issued['refresh_token']) is None
+
+    # Another worker picks the revocation up from the table on its next sync
+    monkeypatch.setattr(tokens, 'revocation_list', RevocationList())
+    assert verify_refresh_token(issued['refresh_token']) is None
+    assert verify_access_token(issued['access_token']) == USER
+
+
+def test_sync_only_reads_and_revoking_prunes_expired_rows(connection):
+    connection.table['old'] = time.time() - 60
+
+    tokens.revocation_list.sync()
+    assert not any(query.startswith("DELETE") for query in connection.queries())
+    assert not tokens.revocation_list.is_revoked('old')
+
+    revoke_token(issue_tokens(USER)['access_token'], 'access')
+    assert 'old' not in connection.table
+    assert len(connection.table) == 1
@@ -0,0 +1,49 @@
+from services.topic_catalog import (DECREMENT_TOPIC_COUNT_SQL, UPSERT_TOPIC_COUNT_SQL, adjust_topic_counts,
+                                    topic_key)
+
+
+class TopicsCursor:
+    """Applies the two catalog statements to a dict, with MySQL's semantics for them"""
+
+    def __init__(self, counts=None):
+        self.counts = dict(counts or {})
+
+    def executemany(self, query, rows):
+        for row in rows:
+            if query == UPSERT_TOPIC_COUNT_SQL:
+                *key, delta = row
+                self.counts[tuple(key)] = self.counts.get(tuple(key), 0) + delta
+            elif query == DECREMENT_TOPIC_COUNT_SQL:
+                delta, *key = row
+                if tuple(key) in self.counts:
+                    self.counts[tuple(key)] = max(self.counts[tuple(key)] - delta, 0)
+            else:
+                raise AssertionError(f"unexpected statement: {query}")
+
+
+FRACTIONS = ('7', 'Maths', 'Fractions')
+DECIMALS = ('7', 'Maths', 'Decimals')
+
+
+def test_counts_move_both_ways_in_one_call():
+    cursor = TopicsCursor({FRACTIONS: 3})
+    adjust_topic_counts(cursor, {FRACTIONS: -1, DECIMALS: 2})
+    assert cursor.counts == {FRACTIONS: 2, DECIMALS: 2}
+
+
+def test_removal_never_creates_a_negative_topic():
+    cursor = TopicsCursor()
+    adjust_topic_counts(cursor, {DECIMALS: -1})
+    assert cursor.counts == {}
+
+
+def test_counts_are_clamped_at_zero():
+    cursor = TopicsCursor({FRACTIONS: 1})
+    adjust_topic_counts(cursor, {FRACTIONS: -3})
+    assert cursor.counts == {FRACTIONS: 0}
+
+
+def test_unfiled_questions_and_zero_deltas_are_skipped():
+    cursor = TopicsCursor()
+    adjust_topic_counts(cursor, {topic_key('7', 'Maths', None): 4, FRACTIONS: 0})
+    assert cursor.counts == {}
@@ -4,6 +4,7 @@ import Login from "./pages/Login";
 import Signup from "./pages/Signup";
 import Dashboard from "./pages/Dashboard";
 import Quiz from "./pages/Quiz";
+import Result from "./pages/Result";
 import Progress from "./pages/Progress";
 import ConnectionCheck from "./pages/ConnectionCheck";
 import AdminDashboard from "./pages/AdminDashboard";
@@ -111,6 +112,17 @@ function App() {
         {/* 🔒 Protected Routes */}
 
         {/* 🔐 Role-Protected Routes */}
+        <Route
+          path="/result"
+          element={
+            <RoleProtectedRoute allowedRoles={["student"]}>
+              <>
+                <Navbar />
+                <Result />
+              </>
+            </RoleProtectedRoute>
+          }
+        />
         <Route
           path="/dashboard"
           element={
@@ -1,44 +1,43 @@
 import React, { useState } from "react";
-import Papa from "papaparse";
-import type { ParseResult } from "papaparse";
 import api from "../services/api";
 
 
-interface CSVQuestion {
-  topic_id: number;
-  question: string;
-  type: string;
-  options: string;
-  correct_ans: string;
+interface BulkUploadReport {
+  inserted: number;
+  failed: number;
+  errors: { row: number | null; error: string }[];
+  errors_truncated: boolean;
 }
 
 const BulkUpload: React.FC = () => {
   const [message, setMessage] = useState("");
   const [fileName, setFileName] = useState("");
+  const [rowErrors, setRowErrors] = useState<BulkUploadReport["errors"]>([]);
 
-  const handleFile = (e: React.ChangeEvent<HTMLInputElement>) => {
+  const handleFile = async (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
     if (!file) return;
 
     setFileName(file.name);
+    setRowErrors([]);
 
-    Papa.parse<CSVQuestion>(file, {
-      header: true,
-      skipEmptyLines: true,
-      complete: async (results: ParseResult<CSVQuestion>) => {
-        try {
-          await api.post("/bulk-upload", results.data);
-          setMessage(`✅ Successfully uploaded ${results.data.length} questions.`);
-        } catch (err) {
-          console.error(err);
-          setMessage("❌ Upload failed. Check CSV format or server.");
-        }
-      },
-      error: (error) => {
-        console.error(error);
-        setMessage("❌ Error parsing the CSV file.");
-      },
-    });
+    // Send the raw file so the server can stream and validate it row by row
+    const isNdjson = /\.(ndjson|jsonl)$/i.test(file.name);
+    try {
+      const res = await api.post<BulkUploadReport>("/bulk-upload", file, {
+        headers: { "Content-Type": isNdjson ? "application/x-ndjson" : "text/csv" },
+      });
+      setRowErrors(res.data.errors);
+      setMessage(
+        res.data.failed
+          ? `⚠️ Uploaded ${res.data.inserted} questions, ${res.data.failed} rows failed.`
+          : `✅ Successfully uploaded ${res.data.inserted} questions.`
+      );
+    } catch (err: any) {
+      console.error(err);
+      setRowErrors(err.response?.data?.errors || []);
+      setMessage("❌ Upload failed. Check CSV format or server.");
+    }
   };
 
   return (
@@ -53,7 +52,7 @@ const BulkUpload: React.FC = () => {
 
       <input
         type="file"
-        accept=".csv"
+        accept=".csv,.ndjson,.jsonl"
         onChange={handleFile}
         className="block w-full text-sm text-gray-600 dark:text-gray-300 file:mr-4 file:py-2 file:px-4 file:rounded-lg file:border-0 file:text-sm file:font-semibold file:bg-blue-600 file:text-white hover:file:bg-blue-700 cursor-pointer"
       />
@@ -70,8 +69,16 @@ const BulkUpload: React.FC = () => {
         </div>
       )}
 
+      {rowErrors.length > 0 && (
+        <ul className="mt-2 max-h-40 overflow-y-auto text-xs text-red-600 dark:text-red-400">
+          {rowErrors.map((e, i) => (
+            <li key={i}>{e.row ? `Row ${e.row}: ` : ""}{e.error}</li>
+          ))}
+        </ul>
+      )}
+
       <p className="mt-3 text-xs text-gray-500 dark:text-gray-400">
-        Make sure the file contains columns: <strong>topic_id</strong>, <strong>question</strong>, <strong>type</strong>, <strong>options</strong>, <strong>correct_ans</strong>
+        Make sure the file contains columns: <strong>className</strong>, <strong>subject</strong>, <strong>topic</strong> (or <strong>topic_id</strong>), <strong>question</strong>, <strong>type</strong>, <strong>options</strong>, <strong>correct_ans</strong>
       </p>
     </div>
   );
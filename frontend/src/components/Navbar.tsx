@@ -1,5 +1,6 @@
 import React from "react";
 import { Link, useNavigate } from "react-router-dom";
+import api from "../services/api";
 import {
   FaTachometerAlt,
   FaChartLine,
@@ -13,7 +14,10 @@ const Navbar: React.FC = () => {
   const user = JSON.parse(localStorage.getItem("user") || "null");
 
   const handleLogout = () => {
+    // Revoke the tokens server-side; local logout proceeds either way
+    api.post("/logout", { refresh_token: localStorage.getItem("refreshToken") }).catch(() => {});
     localStorage.removeItem("token");
+    localStorage.removeItem("refreshToken");
     localStorage.removeItem("user");
     navigate("/");
   };
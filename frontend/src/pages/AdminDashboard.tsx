@@ -15,15 +15,16 @@ interface Question {
   topic_id: number;
   question: string;
   type: string;
-  options: string;
-  correct_ans: string;
+  options: string[];
+  correct_answer: string;
 }
 
 interface User {
   id: number;
-  username: string;
+  name: string;
   email: string;
-  // Add more fields as needed
+  role: string;
+  student_class: string | null;
 }
 
 const AdminDashboard: React.FC = () => {
@@ -31,6 +32,8 @@ const AdminDashboard: React.FC = () => {
   const [subjectName, setSubjectName] = useState("");
   const [className, setClassName] = useState("Class 1");
   const [questions, setQuestions] = useState<Question[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [usersCursor, setUsersCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [showUsers, setShowUsers] = useState(false);
@@ -56,10 +59,12 @@ const AdminDashboard: React.FC = () => {
   }, [className]);
 
   // Fetch all users
-  const fetchUsers = async () => {
+  // Users are paged by the server too; X-Next-Cursor points at the next page
+  const fetchUsers = async (cursor?: string) => {
     try {
-      const res = await api.get<User[]>("/users");
-      setUsers(res.data);
+      const res = await api.get<User[]>("/users", { params: cursor ? { cursor } : {} });
+      setUsers((prev) => (cursor ? [...prev, ...res.data] : res.data));
+      setUsersCursor(res.headers["x-next-cursor"] || null);
     } catch {
       // Optionally handle error
     }
@@ -74,10 +79,14 @@ const AdminDashboard: React.FC = () => {
       .catch(() => console.error("❌ Failed to load subjects"));
   };
 
-  const fetchQuestions = () => {
+  // Questions are paged by the server; X-Next-Cursor points at the next page
+  const fetchQuestions = (cursor?: string) => {
     return api
-      .get<Question[]>("/questions/all")
-      .then((res) => setQuestions(res.data));
+      .get<Question[]>("/questions/all", { params: cursor ? { cursor } : {} })
+      .then((res) => {
+        setQuestions((prev) => (cursor ? [...prev, ...res.data] : res.data));
+        setNextCursor(res.headers["x-next-cursor"] || null);
+      });
   };
 
   const handleAddSubject = async (e: React.FormEvent) => {
@@ -313,7 +322,7 @@ const AdminDashboard: React.FC = () => {
                       All Uploaded Questions
                     </h2>
                     <span className="text-sm text-gray-500 dark:text-gray-400 font-semibold">
-                      Total: {questions.length}
+                      Showing: {questions.length}{nextCursor ? "+" : ""}
                     </span>
                   </div>
                   <div className="overflow-x-auto w-full p-4">
@@ -347,7 +356,7 @@ const AdminDashboard: React.FC = () => {
                               <td className="p-3 border text-center">{q.id}</td>
                               <td className="p-3 border">{q.question}</td>
                               <td className="p-3 border text-center">{q.type}</td>
-                              <td className="p-3 border text-center">{q.correct_ans}</td>
+                              <td className="p-3 border text-center">{q.correct_answer}</td>
                               <td className="p-3 border text-center space-x-3">
                                 <button
                                   onClick={() => navigate(`/edit-question/${q.id}`)}
@@ -367,6 +376,16 @@ const AdminDashboard: React.FC = () => {
                         </tbody>
                       </table>
                     )}
+                    {nextCursor && (
+                      <div className="flex justify-center mt-4">
+                        <button
+                          onClick={() => fetchQuestions(nextCursor)}
+                          className="px-4 py-2 bg-pink-600 hover:bg-pink-700 transition text-white font-semibold rounded-xl shadow-md"
+                        >
+                          Load more
+                        </button>
+                      </div>
+                    )}
                   </div>
                 </div>
               )}
@@ -377,7 +396,7 @@ const AdminDashboard: React.FC = () => {
                       <span>👥</span> Registered Users
                     </h2>
                     <span className="text-sm text-pink-600 dark:text-pink-300 font-semibold">
-                      Total: {users.length}
+                      Showing: {users.length}{usersCursor ? "+" : ""}
                     </span>
                   </div>
                   <div className="overflow-x-auto w-full p-4">
@@ -385,25 +404,39 @@ const AdminDashboard: React.FC = () => {
                       <thead>
                         <tr className="bg-gradient-to-r from-indigo-100 via-pink-100 to-yellow-100 dark:from-gray-700 dark:via-gray-800 dark:to-gray-900 text-gray-900 dark:text-white">
                           <th className="px-2 py-1 text-left border">ID</th>
-                          <th className="px-2 py-1 text-left border">Username</th>
+                          <th className="px-2 py-1 text-left border">Name</th>
                           <th className="px-2 py-1 text-left border">Email</th>
+                          <th className="px-2 py-1 text-left border">Role</th>
+                          <th className="px-2 py-1 text-left border">Class</th>
                         </tr>
                       </thead>
                       <tbody>
                         {users.map(u => (
                           <tr key={u.id} className="border-b border-gray-200 dark:border-gray-700">
                             <td className="px-2 py-1 border">{u.id}</td>
-                            <td className="px-2 py-1 border">{u.username}</td>
+                            <td className="px-2 py-1 border">{u.name}</td>
                             <td className="px-2 py-1 border">{u.email}</td>
+                            <td className="px-2 py-1 border">{u.role}</td>
+                            <td className="px-2 py-1 border">{u.student_class || "-"}</td>
                           </tr>
                         ))}
                         {users.length === 0 && (
                           <tr>
-                            <td colSpan={3} className="text-center text-gray-500 py-2">No users found.</td>
+                            <td colSpan={5} className="text-center text-gray-500 py-2">No users found.</td>
                           </tr>
                         )}
                       </tbody>
                     </table>
+                    {usersCursor && (
+                      <div className="flex justify-center mt-4">
+                        <button
+                          onClick={() => fetchUsers(usersCursor)}
+                          className="px-4 py-2 bg-pink-600 hover:bg-pink-700 transition text-white font-semibold rounded-xl shadow-md"
+                        >
+                          Load more
+                        </button>
+                      </div>
+                    )}
                   </div>
                 </div>
               )}
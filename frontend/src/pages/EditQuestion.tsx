@@ -17,8 +17,8 @@ const EditQuestion: React.FC = () => {
   id: number;
   question: string;
   type: string;
-  options: string;
-  correct_ans: string;
+  options: string[];
+  correct_answer: string;
   topic_id: number;
 }
 
@@ -35,8 +35,8 @@ useEffect(() => {
 
       setQuestion(q.question);
       setType(q.type);
-      setOptions(q.options);
-      setCorrectAns(q.correct_ans);
+      setOptions(q.options.join(", "));
+      setCorrectAns(q.correct_answer);
       setTopicId(q.topic_id);
     })
     .catch(() => setMessage("❌ Failed to load question."));
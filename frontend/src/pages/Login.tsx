@@ -5,6 +5,7 @@ import { FaEnvelope, FaLock, FaUser } from "react-icons/fa";
 
 interface LoginResponse {
   access_token: string;
+  refresh_token: string;
   token_type: string;
   user: {
     id: number;
@@ -49,6 +50,7 @@ const Login: React.FC = () => {
 
       // ✅ Save to localStorage
       localStorage.setItem("token", token);
+      localStorage.setItem("refreshToken", res.data.refresh_token);
       localStorage.setItem("user", JSON.stringify(user));
       console.log("Saved to localStorage:", { token, user });
 
@@ -1,11 +1,12 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
+import api from "../services/api";
 
 interface Question {
   id: number;
   question: string;
   type: string;
-  options?: string;
+  options?: string[];
 }
 
 interface SubmitResponseItem {
@@ -52,46 +53,60 @@ const Quiz: React.FC = () => {
     setAnswers((prev) => ({ ...prev, [qid]: value }));
   };
 
-  const handleSubmit = () => {
-    // For practice quiz, calculate score locally without API call
-    const mockResponses: SubmitResponseItem[] = questions.map((q) => {
-      const userAnswer = answers[q.id] || "";
-      let score = 0;
-      
-      // Simple scoring logic for practice quiz
-      if (userAnswer.trim() !== "") {
-        // If user answered, give partial credit
-        score = Math.random() * 0.5 + 0.5; // Random score between 0.5 and 1 for demo
-        if (q.type === 'mcq' && userAnswer.includes('A')) score = 1; // Demo: Option A is always correct
-        if (q.type === 'true-false' && userAnswer === 'True') score = 1; // Demo: True is always correct
-      }
-      
-      return {
-        question_id: q.id,
-        answer: userAnswer,
-        score: score
-      };
-    });
-
-    setResponses(mockResponses);
-    const total = mockResponses.length;
-    const sum = mockResponses.reduce((acc, r) => acc + r.score, 0);
-    setAccuracy((sum / total) * 100);
+  const finishQuiz = (scored: SubmitResponseItem[]) => {
+    setResponses(scored);
+    const total = scored.length;
+    const sum = scored.reduce((acc, r) => acc + r.score, 0);
+    const percent = total ? (sum / total) * 100 : 0;
+    setAccuracy(percent);
     setSubmitted(true);
-    
+
     // Save practice quiz result to localStorage
     const practiceResult = {
       chapterInfo,
       questions: questions.length,
-      score: (sum / total) * 100,
+      score: percent,
       completedAt: new Date().toISOString()
     };
-    
+
     const practiceHistory = JSON.parse(localStorage.getItem("practiceHistory") || "[]");
     practiceHistory.push(practiceResult);
     localStorage.setItem("practiceHistory", JSON.stringify(practiceHistory));
   };
 
+  const handleSubmit = () => {
+    const unscored: SubmitResponseItem[] = questions.map((q) => ({
+      question_id: q.id,
+      answer: answers[q.id] || "",
+      score: 0
+    }));
+
+    // Answers never reach the browser: the backend scores the submission and
+    // records it in the background
+    const topicId = localStorage.getItem("quizTopicId");
+    if (!topicId) {
+      finishQuiz(unscored);
+      return;
+    }
+    api
+      .post<{ results: { question_id: number; answer: string; score: number | null }[] }>("/responses", {
+        topic_id: Number(topicId),
+        responses: unscored.map(({ question_id, answer }) => ({ question_id, answer })),
+      })
+      .then((res) => finishQuiz(res.data.results.map((r) => ({ ...r, score: r.score ?? 0 }))))
+      .catch(() => {
+        console.warn("Failed to record quiz responses");
+        finishQuiz(unscored);
+      });
+  };
+
+  const handleViewResults = () => {
+    const user = JSON.parse(localStorage.getItem("user") || "{}");
+    navigate("/result", {
+      state: { topicId: Number(localStorage.getItem("quizTopicId")), studentId: user.id },
+    });
+  };
+
   return (
     <div className="min-h-screen bg-gradient-to-r from-sky-300 to-indigo-300 dark:from-gray-900 dark:to-gray-800 p-6">
       <div className="max-w-3xl mx-auto bg-white dark:bg-gray-900 rounded-xl shadow-lg p-6">
@@ -138,7 +153,7 @@ const Quiz: React.FC = () => {
 
                 {/* Objective (MCQ or True/False) */}
                 {(q.type === "mcq" || q.type === "true-false") &&
-                  q.options?.split(",").map((opt, i) => (
+                  q.options?.map((opt, i) => (
                     <div key={i} className="mb-1">
                       <label className="inline-flex items-center">
                         <input
@@ -211,6 +226,14 @@ const Quiz: React.FC = () => {
                   </p>
                 </div>
                 <div className="flex gap-4 justify-center mt-4">
+                  {localStorage.getItem("quizTopicId") && (
+                    <button
+                      onClick={handleViewResults}
+                      className="px-6 py-2 bg-green-500 hover:bg-green-600 text-white rounded-md transition"
+                    >
+                      📊 View Results
+                    </button>
+                  )}
                   <button
                     onClick={() => navigate("/syllabus")}
                     className="px-6 py-2 bg-indigo-500 hover:bg-indigo-600 text-white rounded-md transition"
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { useLocation, useNavigate } from "react-router-dom";
-import axios from "axios";
+import api from "../services/api";
 
 interface ResponseItem {
     question_id: number;
@@ -11,9 +11,9 @@ interface ResponseItem {
 interface Question {
     id: number;
     question: string;
-    correct_ans: string;
+    correct_answer: string;
     type: string;
-    options?: string;
+    options?: string[];
 }
 
 const Result: React.FC = () => {
@@ -35,10 +35,8 @@ const Result: React.FC = () => {
         const fetchResults = async () => {
             try {
                 const [respRes, quesRes] = await Promise.all([
-                    axios.get<ResponseItem[]>(
-                        `http://localhost:8000/responses/${studentId}/${topicId}`
-                    ),
-                    axios.get<Question[]>(`http://localhost:8000/quiz/${topicId}`)
+                    api.get<ResponseItem[]>(`/responses/${studentId}/${topicId}`),
+                    api.get<Question[]>(`/quiz/${topicId}`, { params: { student_id: studentId } })
                 ]);
 
                 setResponses(respRes.data);
@@ -88,7 +86,7 @@ const Result: React.FC = () => {
                             </p>
 
                             <p className="text-sm text-gray-600 dark:text-gray-300">
-                                <strong>Correct Answer:</strong> {q.correct_ans}
+                                <strong>Correct Answer:</strong> {q.correct_answer}
                             </p>
 
                             <p
@@ -22,6 +22,7 @@ const StudentDashboard: React.FC = () => {
   const [selectedSubjectId, setSelectedSubjectId] = useState<number | null>(null);
   const [selectedTopicId, setSelectedTopicId] = useState<number | null>(null);
   const [questionType, setQuestionType] = useState<string>("");
+  const [quizMode, setQuizMode] = useState<string>("uniform");
 
   useEffect(() => {
     const user = JSON.parse(localStorage.getItem("user") || "{}");
@@ -63,6 +64,7 @@ const StudentDashboard: React.FC = () => {
           subject_id: selectedSubjectId,
           topic_id: selectedTopicId,
           type: questionType,
+          mode: quizMode,
         },
       })
       .then((res) => {
@@ -71,6 +73,7 @@ const StudentDashboard: React.FC = () => {
           alert("No questions found for this selection.");
         } else {
           localStorage.setItem("quizQuestions", JSON.stringify(questions));
+          localStorage.setItem("quizTopicId", String(selectedTopicId));
           navigate("/quiz");
         }
       })
@@ -159,6 +162,21 @@ const StudentDashboard: React.FC = () => {
           </select>
         </div>
 
+        {/* Quiz Mode Selection */}
+        <div className="mb-8">
+          <label className="block font-bold bg-gradient-to-r from-indigo-600 via-pink-500 to-yellow-500 bg-clip-text text-transparent mb-2">
+            Select Quiz Mode
+          </label>
+          <select
+            value={quizMode}
+            onChange={(e) => setQuizMode(e.target.value)}
+            className="w-full p-3 rounded-lg border-2 border-indigo-300 dark:border-indigo-600 bg-white/80 dark:bg-gray-800 dark:text-white focus:ring-2 focus:ring-indigo-400 transition shadow-inner"
+          >
+            <option value="uniform">Random Mix</option>
+            <option value="adaptive">Adaptive (focus on my weak spots)</option>
+          </select>
+        </div>
+
         <button
           onClick={handleStartQuiz}
           className="w-full bg-gradient-to-r from-indigo-500 via-pink-500 to-yellow-400 hover:from-yellow-400 hover:to-indigo-500 text-white font-bold py-3 rounded-xl shadow-lg transition-all duration-300 text-lg hover:scale-105"
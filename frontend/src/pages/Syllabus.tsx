@@ -220,7 +220,7 @@ export default function Syllabus() {
             id: i + 1,
             question: `${chapter.name}: MCQ Question ${i + 1} - ${chapter.description}`,
             type: 'mcq',
-            options: 'Option A, Option B, Option C, Option D'
+            options: ['Option A', 'Option B', 'Option C', 'Option D']
           };
           break;
         case 'true-false':
@@ -228,7 +228,7 @@ export default function Syllabus() {
             id: i + 1,
             question: `${chapter.name}: True/False Question ${i + 1} - ${chapter.description}`,
             type: 'true-false',
-            options: 'True, False'
+            options: ['True', 'False']
           };
           break;
         case 'fill':
@@ -258,6 +258,8 @@ export default function Syllabus() {
     
     // Store questions in localStorage for Quiz component
     localStorage.setItem("quizQuestions", JSON.stringify(questions));
+    // Generated practice questions aren't in the bank, so there is nothing to record
+    localStorage.removeItem("quizTopicId");
     localStorage.setItem("currentChapter", JSON.stringify({
       chapterName: chapter.name,
       subjectName: selectedSubject?.name,
@@ -9,8 +9,8 @@ interface Question {
   id: number;
   question: string;
   type: string;
-  options: string;
-  correct_ans: string;
+  options: string[];
+  correct_answer: string;
   topic_id: number;
 }
 
@@ -27,6 +27,7 @@ const TeacherDashboard: React.FC = () => {
 
   const [questions, setQuestions] = useState<Question[]>([]);
   const [performance, setPerformance] = useState<StudentPerformance[]>([]);
+  const [performanceCursor, setPerformanceCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [message, setMessage] = useState("");
 
@@ -47,6 +48,7 @@ const TeacherDashboard: React.FC = () => {
       .then(([qRes, pRes]) => {
         setQuestions(qRes.data);
         setPerformance(pRes.data);
+        setPerformanceCursor(pRes.headers["x-next-cursor"] || null);
         setLoading(false);
       })
       .catch(() => {
@@ -55,6 +57,18 @@ const TeacherDashboard: React.FC = () => {
       });
   }, [user]);
 
+  // Performance rows are paged by the server; X-Next-Cursor points at the next page
+  const loadMorePerformance = () => {
+    if (!performanceCursor) return;
+    api
+      .get<StudentPerformance[]>(`/performance/summary`, { params: { cursor: performanceCursor } })
+      .then((res) => {
+        setPerformance((prev) => [...prev, ...res.data]);
+        setPerformanceCursor(res.headers["x-next-cursor"] || null);
+      })
+      .catch(() => console.error("❌ Failed to load more performance data"));
+  };
+
   // Only render Navbar if NOT teacher
   const showNavbar = user?.role !== "teacher";
 
@@ -128,8 +142,8 @@ const TeacherDashboard: React.FC = () => {
                       <td className="p-2 border">{q.id}</td>
                       <td className="p-2 border">{q.question}</td>
                       <td className="p-2 border">{q.type}</td>
-                      <td className="p-2 border">{q.options || "-"}</td>
-                      <td className="p-2 border">{q.correct_ans}</td>
+                      <td className="p-2 border">{q.options?.length ? q.options.join(", ") : "-"}</td>
+                      <td className="p-2 border">{q.correct_answer}</td>
                     </tr>
                   ))}
                 </tbody>
@@ -172,6 +186,14 @@ const TeacherDashboard: React.FC = () => {
                     ))}
                   </tbody>
                 </table>
+                {performanceCursor && (
+                  <button
+                    onClick={loadMorePerformance}
+                    className="mt-4 px-4 py-2 rounded-lg bg-indigo-600 text-white hover:bg-indigo-700"
+                  >
+                    Load more
+                  </button>
+                )}
               </div>
             )}
           </div>
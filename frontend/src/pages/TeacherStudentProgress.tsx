@@ -16,14 +16,21 @@ const TeacherStudentProgress: React.FC = () => {
   const [progressData, setProgressData] = useState<StudentProgress[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
-  useEffect(() => {
-    api
-      .get<StudentProgress[]>("/performance/all-progress")
+  // Progress is paged by the server; X-Next-Cursor points at the next page
+  const fetchProgress = (cursor?: string) => {
+    return api
+      .get<StudentProgress[]>("/performance/all-progress", { params: cursor ? { cursor } : {} })
       .then((res) => {
-        setProgressData(res.data);
-        setLoading(false);
-      })
+        setProgressData((prev) => (cursor ? [...prev, ...res.data] : res.data));
+        setNextCursor(res.headers["x-next-cursor"] || null);
+      });
+  };
+
+  useEffect(() => {
+    fetchProgress()
+      .then(() => setLoading(false))
       .catch(() => {
         setError("❌ Failed to load student progress data.");
         setLoading(false);
@@ -99,6 +106,17 @@ const TeacherStudentProgress: React.FC = () => {
           </div>
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="text-center mt-8">
+          <button
+            onClick={() => fetchProgress(nextCursor)}
+            className="px-6 py-2 rounded-xl bg-indigo-600 text-white font-semibold hover:bg-indigo-700"
+          >
+            Load more
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -16,6 +16,9 @@ const UploadQuestion: React.FC = () => {
   const [type, setType] = useState("mcq");
   const [topic, setTopic] = useState("");
   const [loading, setLoading] = useState(false);
+  // Set after a 409 so the teacher can confirm a look-alike (e.g. same wording, other numbers)
+  const [duplicateOf, setDuplicateOf] = useState<number[]>([]);
+  const [allowDuplicate, setAllowDuplicate] = useState(false);
 
   useEffect(() => {
     setSubjectsList([]);
@@ -84,6 +87,7 @@ const UploadQuestion: React.FC = () => {
         subject,
         type,
         topic: trimmedTopic,
+        allow_duplicate: allowDuplicate,
       });
 
       // Additional POST request as per user instruction
@@ -96,6 +100,7 @@ const UploadQuestion: React.FC = () => {
         options: type === "mcq" ? trimmedOptions : [],
         correctAnswer: trimmedCorrectAnswer,
         uploaded_by: 1, // If you track which teacher uploads
+        allow_duplicate: allowDuplicate,
       });
 
       setMessage("✅ Question uploaded successfully!");
@@ -106,8 +111,19 @@ const UploadQuestion: React.FC = () => {
       setSubject("");
       setType("mcq");
       setTopic("");
+      setDuplicateOf([]);
+      setAllowDuplicate(false);
     } catch (error) {
-      setMessage("❌ Failed to upload question. Try again.");
+      // 409: the backend found a near-duplicate already in the bank
+      const duplicates = axios.isAxiosError(error) && error.response?.status === 409
+        ? error.response.data?.duplicates || []
+        : null;
+      setDuplicateOf(duplicates ? duplicates.map((d: { question_id: number }) => d.question_id) : []);
+      setMessage(
+        duplicates
+          ? `❌ A very similar question already exists (#${duplicates.map((d: { question_id: number }) => d.question_id).join(", #")}).`
+          : "❌ Failed to upload question. Try again."
+      );
     }
 
     setLoading(false);
@@ -276,6 +292,17 @@ const UploadQuestion: React.FC = () => {
               )}
             </div>
 
+            {duplicateOf.length > 0 && (
+              <label className="flex items-center gap-2 text-indigo-700 font-semibold">
+                <input
+                  type="checkbox"
+                  checked={allowDuplicate}
+                  onChange={(e) => setAllowDuplicate(e.target.checked)}
+                />
+                This is a different question, upload it anyway
+              </label>
+            )}
+
             <button
               type="submit"
               disabled={loading}
@@ -4,34 +4,39 @@ const api = axios.create({
   baseURL: "http://localhost:8000",
 });
 
-// ✅ Attach token and user ID with every request
+// ✅ Attach the access token to every request; the backend reads the user from it
 api.interceptors.request.use((config) => {
   const token = localStorage.getItem("token");
-  const user = localStorage.getItem("user");
-  
+
   if (token && config.headers) {
     config.headers.Authorization = `Bearer ${token}`;
   }
-  
-  // Add user ID to headers for backend validation
-  if (user && config.headers) {
-    try {
-      const userData = JSON.parse(user);
-      if (userData.id) {
-        config.headers['X-User-ID'] = userData.id.toString();
-      }
-    } catch (e) {
-      console.warn("Failed to parse user data from localStorage");
-    }
-  }
-  
+
   return config;
 });
 
-// ✅ Add response interceptor to handle class access errors
+// ✅ Add response interceptor to refresh expired tokens and handle class access errors
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    const refreshToken = localStorage.getItem("refreshToken");
+    if (error.response?.status === 401 && refreshToken && original && !original._retried) {
+      original._retried = true;
+      try {
+        const res = await axios.post<{ access_token: string; refresh_token: string }>(
+          `${api.defaults.baseURL}/token/refresh`,
+          { refresh_token: refreshToken }
+        );
+        localStorage.setItem("token", res.data.access_token);
+        localStorage.setItem("refreshToken", res.data.refresh_token);
+        original.headers.Authorization = `Bearer ${res.data.access_token}`;
+        return api(original);
+      } catch {
+        localStorage.removeItem("refreshToken");
+      }
+    }
+
     if (error.response?.status === 403) {
       const errorMessage = error.response.data?.error;
       if (errorMessage && errorMessage.includes("class")) {